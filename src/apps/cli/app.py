@@ -27,3 +27,8 @@ class CliApp:
         testrun = testrun_driver.execute_testrun(testrun_def)
 
         return testrun
+
+    def run_shard_worker(self, idle_timeout_s: float | None = None) -> int:
+        # execute shards of sharded testruns from the configured shard queue
+        testrun_driver = self.di.testrun_driver()
+        return testrun_driver.run_shard_worker(idle_timeout_s=idle_timeout_s)
@@ -23,11 +23,18 @@ from src.drivers import (
     TestRunDriver,
     TestSetDriver,
 )
-from src.dtos import LocationDTO, StorageType
+from src.dtos import LocationDTO, StorageType, TestRunExecutor, TestRunStorageMode
 from src.infrastructure.backend import DemoBackendFactory, DummyBackendFactory
 from src.infrastructure.notifier import InMemoryNotifier, LogNotifier
+from src.infrastructure.shard_queue import FileShardQueue
 from src.infrastructure.storage import DtoStorageFactory, UserStorageFactory
-from src.infrastructure_ports import IBackendFactory, IDtoStorage, INotifier, IUserStorage
+from src.infrastructure_ports import (
+    IBackendFactory,
+    IDtoStorage,
+    INotifier,
+    IShardQueue,
+    IUserStorage,
+)
 
 
 def get_backend_factory(config: Config) -> IBackendFactory:
@@ -36,6 +43,9 @@ def get_backend_factory(config: Config) -> IBackendFactory:
         return DemoBackendFactory(
             files_path=config.DATATESTER_DEMO_RAW_PATH,
             db_path=config.DATATESTER_DEMO_DB_PATH,
+            rowcount_cache_path=config.DATATESTER_DEMO_ROWCOUNT_CACHE_PATH,
+            rowcount_cache_size=config.DATATESTER_DEMO_ROWCOUNT_CACHE_SIZE,
+            shared_database=config.DATATESTER_DEMO_SHARED_DATABASE,
         )
     elif platform_type == "DUMMY":
         return DummyBackendFactory()
@@ -75,6 +85,13 @@ def get_user_storage(config: Config) -> IUserStorage:
     return storage
 
 
+def get_shard_queue(config: Config) -> IShardQueue | None:
+    location = config.DATATESTER_SHARD_QUEUE_LOCATION
+    if location is None:
+        return None
+    return FileShardQueue(path=location, lease_s=config.DATATESTER_SHARD_LEASE_S)
+
+
 class CliDependencyInjector:
     def __init__(self, config: Config):
         self.config = config
@@ -90,6 +107,7 @@ class CliDependencyInjector:
         ]
         self.notifiers = get_notifiers(config)
         self.backend_factory = get_backend_factory(config)
+        self.shard_queue = get_shard_queue(config)
         self.spec_naming_conventions_factory = NamingConventionsFactory()
         self.spec_formatter_factory = SpecParserFactory()
 
@@ -116,6 +134,22 @@ class CliDependencyInjector:
             notifiers=self.notifiers,
             dto_storage=self.dto_storage,
             max_testrun_threads=self.config.DATATESTER_MAX_TESTRUN_THREADS,
+            persist_every_n=self.config.DATATESTER_TESTRUN_PERSIST_EVERY_N,
+            persist_interval_s=self.config.DATATESTER_TESTRUN_PERSIST_INTERVAL_S,
+            storage_mode=TestRunStorageMode(self.config.DATATESTER_TESTRUN_STORAGE_MODE),
+            executor=TestRunExecutor(self.config.DATATESTER_TESTRUN_EXECUTOR),
+            max_concurrency_per_platform=self.config.DATATESTER_MAX_CONCURRENCY_PER_PLATFORM,
+            max_concurrency_per_testobject=(
+                self.config.DATATESTER_MAX_CONCURRENCY_PER_TESTOBJECT
+            ),
+            shard_queue=self.shard_queue,
+            shard_count=self.config.DATATESTER_TESTRUN_SHARDS,
+            shard_timeout_s=self.config.DATATESTER_SHARD_TIMEOUT_S,
+            retry_max_attempts=self.config.DATATESTER_RETRY_MAX_ATTEMPTS,
+            retry_budget_per_testrun=self.config.DATATESTER_RETRY_BUDGET_PER_TESTRUN,
+            retry_budget_global_per_minute=(
+                self.config.DATATESTER_RETRY_BUDGET_GLOBAL_PER_MINUTE
+            ),
         )
         return TestRunDriver(testrun_adapter=handler)
 
@@ -0,0 +1,32 @@
+"""Shard worker entry point for Data Tester.
+
+Executes shards of sharded testruns (see DATATESTER_TESTRUN_SHARDS) from the shard
+queue at DATATESTER_SHARD_QUEUE_LOCATION. Start any number of workers, on one or
+several hosts sharing the queue and internal storage location.
+
+Usage:
+    uv run python -m src.apps.cli.main_worker [--idle-timeout SECONDS]
+"""
+
+import argparse
+
+from src.apps.cli.app import CliApp
+from src.config import Config
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run Data Tester shard worker")
+    parser.add_argument(
+        "--idle-timeout",
+        type=float,
+        default=None,
+        help="Stop after no shard arrived for this many seconds (default: run forever)",
+    )
+    args = parser.parse_args()
+    config = Config()
+    app = CliApp(config)
+    app.run_shard_worker(idle_timeout_s=args.idle_timeout)
+
+
+if __name__ == "__main__":
+    main()
@@ -21,6 +21,7 @@ def create_app(config: Config, di: HttpDependencyInjector | None = None) -> Fast
     async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         app.state.di = di if di is not None else HttpDependencyInjector(config)
         yield
+        app.state.di.close()
 
     app = FastAPI(title="Data Tester API", lifespan=lifespan)
     app.include_router(domain_config.router)
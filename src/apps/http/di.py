@@ -1,3 +1,4 @@
+from concurrent.futures import ThreadPoolExecutor
 from typing import Annotated
 
 from fastapi import Depends, Request
@@ -6,6 +7,7 @@ from src.apps.cli.di import (
     get_backend_factory,
     get_dto_storage,
     get_notifiers,
+    get_shard_queue,
     get_user_storage,
 )
 from src.config import Config
@@ -33,6 +35,7 @@ from src.drivers import (
     TestRunDriver,
     TestSetDriver,
 )
+from src.dtos import TestRunExecutor, TestRunStorageMode
 from src.infrastructure_ports import IDtoStorage, INotifier, IUserStorage
 
 
@@ -50,8 +53,18 @@ class HttpDependencyInjector:
         ]
         self.notifiers: list[INotifier] = get_notifiers(config)
         self.backend_factory = get_backend_factory(config)
+        self.shard_queue = get_shard_queue(config)
         self.spec_naming_conventions_factory = NamingConventionsFactory()
         self.spec_formatter_factory = SpecParserFactory()
+        # all testruns of the app share one bounded pool of worker threads
+        self.testrun_worker_pool = ThreadPoolExecutor(
+            max_workers=config.DATATESTER_TESTRUN_WORKER_POOL_SIZE,
+            thread_name_prefix="testrun-worker",
+        )
+
+    def close(self) -> None:
+        """Releases resources shared across requests."""
+        self.testrun_worker_pool.shutdown(wait=True)
 
     def domain_config_driver(self) -> DomainConfigDriver:
         handler = DomainConfigAdapter(dto_storage=self.dto_storage)
@@ -80,6 +93,23 @@ class HttpDependencyInjector:
             notifiers=self.notifiers,
             dto_storage=self.dto_storage,
             max_testrun_threads=self.config.DATATESTER_MAX_TESTRUN_THREADS,
+            persist_every_n=self.config.DATATESTER_TESTRUN_PERSIST_EVERY_N,
+            persist_interval_s=self.config.DATATESTER_TESTRUN_PERSIST_INTERVAL_S,
+            storage_mode=TestRunStorageMode(self.config.DATATESTER_TESTRUN_STORAGE_MODE),
+            executor=TestRunExecutor(self.config.DATATESTER_TESTRUN_EXECUTOR),
+            max_concurrency_per_platform=self.config.DATATESTER_MAX_CONCURRENCY_PER_PLATFORM,
+            max_concurrency_per_testobject=(
+                self.config.DATATESTER_MAX_CONCURRENCY_PER_TESTOBJECT
+            ),
+            shard_queue=self.shard_queue,
+            shard_count=self.config.DATATESTER_TESTRUN_SHARDS,
+            shard_timeout_s=self.config.DATATESTER_SHARD_TIMEOUT_S,
+            retry_max_attempts=self.config.DATATESTER_RETRY_MAX_ATTEMPTS,
+            retry_budget_per_testrun=self.config.DATATESTER_RETRY_BUDGET_PER_TESTRUN,
+            retry_budget_global_per_minute=(
+                self.config.DATATESTER_RETRY_BUDGET_GLOBAL_PER_MINUTE
+            ),
+            worker_pool=self.testrun_worker_pool,
         )
         return TestRunDriver(testrun_adapter=handler)
 
@@ -37,6 +37,7 @@ def _setup_demo(config: Config) -> None:
     config.DATATESTER_INTERNAL_STORAGE_LOCATION = f"local://{demo_base}/internal/"
     config.DATATESTER_DEMO_RAW_PATH = str(demo_base / "raw")
     config.DATATESTER_DEMO_DB_PATH = str(demo_base / "dbs")
+    config.DATATESTER_DEMO_ROWCOUNT_CACHE_PATH = str(demo_base / "rowcounts.sqlite")
 
     print("Cleaning up demo data...")
     clean_up_demo_artifacts(demo_base)
@@ -1,11 +1,12 @@
 from typing import List
 from uuid import uuid4
 
-from fastapi import APIRouter, BackgroundTasks
+from fastapi import APIRouter, BackgroundTasks, HTTPException
 from fastapi.responses import JSONResponse
 
 from src.apps.http.di import TestRunDriverDep
-from src.dtos import TestRunDTO
+from src.dtos import Result, Status, TestRunDTO
+from src.infrastructure_ports import ObjectNotFoundError
 from src.dtos.testrun_dtos import TestRunDefDTO
 
 router = APIRouter(tags=["testruns"])
@@ -13,9 +14,12 @@ router = APIRouter(tags=["testruns"])
 
 @router.get("/{domain}/testrun/", response_model=List[TestRunDTO])
 def list_testruns(
-    domain: str, driver: TestRunDriverDep, date: str | None = None
+    domain: str,
+    driver: TestRunDriverDep,
+    date: str | None = None,
+    hydrate: bool = False,
 ) -> List[TestRunDTO]:
-    return driver.list_testruns(domain=domain, date=date)
+    return driver.list_testruns(domain=domain, date=date, hydrate=hydrate)
 
 
 @router.post("/{domain}/testrun/", status_code=202)
@@ -29,13 +33,80 @@ def execute_testrun(
     # before the background task starts.
     testrun_id = uuid4()
 
-    def _run(trd: TestRunDefDTO) -> None:
-        testrun_driver.execute_testrun(testrun_def=trd, testrun_id=testrun_id)
+    # async task: testcases run in the app's shared worker pool, not a pool per run
+    async def _run(trd: TestRunDefDTO) -> None:
+        await testrun_driver.execute_testrun_async(testrun_def=trd, testrun_id=testrun_id)
 
     background_tasks.add_task(_run, body)
     return JSONResponse({"testrun_id": str(testrun_id)}, status_code=202)
 
 
 @router.get("/{domain}/testrun/{testrun_id}", response_model=TestRunDTO)
-def load_testrun(domain: str, testrun_id: str, driver: TestRunDriverDep) -> TestRunDTO:
-    return driver.load_testrun(testrun_id=testrun_id)
+def load_testrun(
+    domain: str, testrun_id: str, driver: TestRunDriverDep, hydrate: bool = False
+) -> TestRunDTO:
+    return driver.load_testrun(testrun_id=testrun_id, hydrate=hydrate)
+
+
+@router.post("/{domain}/testrun/{testrun_id}/resume", status_code=202)
+def resume_testrun(
+    domain: str,
+    testrun_id: str,
+    background_tasks: BackgroundTasks,
+    testrun_driver: TestRunDriverDep,
+) -> JSONResponse:
+    """Resumes an interrupted testrun: only testcases without results are executed."""
+    try:
+        testrun = testrun_driver.load_testrun(testrun_id=testrun_id)
+    except ObjectNotFoundError as err:
+        raise HTTPException(status_code=404, detail=str(err)) from err
+    if testrun.status == Status.FINISHED:
+        raise HTTPException(status_code=409, detail="Testrun is already finished")
+    if testrun_driver.is_testrun_running(testrun_id=testrun_id):
+        raise HTTPException(status_code=409, detail="Testrun is still executing")
+
+    async def _run() -> None:
+        await testrun_driver.resume_testrun_async(testrun_id=testrun_id)
+
+    background_tasks.add_task(_run)
+    return JSONResponse({"testrun_id": testrun_id}, status_code=202)
+
+
+@router.post("/{domain}/testrun/{testrun_id}/cancel", status_code=202)
+def cancel_testrun(
+    domain: str, testrun_id: str, testrun_driver: TestRunDriverDep
+) -> JSONResponse:
+    """Cancels a running testrun: running testcases are stopped, no more started."""
+    if not testrun_driver.cancel_testrun(testrun_id=testrun_id):
+        try:
+            testrun_driver.load_testrun(testrun_id=testrun_id)
+        except ObjectNotFoundError as err:
+            raise HTTPException(status_code=404, detail=str(err)) from err
+        raise HTTPException(status_code=409, detail="Testrun is not running")
+    return JSONResponse({"testrun_id": testrun_id}, status_code=202)
+
+
+@router.post("/{domain}/testrun/{testrun_id}/rerun-failures", status_code=202)
+def rerun_failures(
+    domain: str,
+    testrun_id: str,
+    background_tasks: BackgroundTasks,
+    testrun_driver: TestRunDriverDep,
+) -> JSONResponse:
+    """Starts a new testrun of the NOK and NA testcases of the given testrun."""
+    try:
+        testrun = testrun_driver.load_testrun(testrun_id=testrun_id, hydrate=True)
+    except ObjectNotFoundError as err:
+        raise HTTPException(status_code=404, detail=str(err)) from err
+    if all(testcase.result == Result.OK for testcase in testrun.results):
+        raise HTTPException(status_code=409, detail="Testrun has no failed testcases")
+
+    new_testrun_id = uuid4()
+
+    async def _run() -> None:
+        await testrun_driver.rerun_failures_async(
+            testrun_id=testrun_id, new_testrun_id=new_testrun_id
+        )
+
+    background_tasks.add_task(_run)
+    return JSONResponse({"testrun_id": str(new_testrun_id)}, status_code=202)
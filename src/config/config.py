@@ -36,9 +36,48 @@ class Config(BaseSettings):
     # DEMO BACKEND DATA PATHS - no need to change this
     DATATESTER_DEMO_RAW_PATH: str = Field(default="tests/fixtures/demo/data/raw")
     DATATESTER_DEMO_DB_PATH: str = Field(default="tests/fixtures/demo/data/dbs")
+    # optional persistent cache of file rowcounts (SQLite file), max cached files
+    DATATESTER_DEMO_ROWCOUNT_CACHE_PATH: str | None = Field(default=None)
+    DATATESTER_DEMO_ROWCOUNT_CACHE_SIZE: int = Field(default=10_000)
+    # demo backends share one DuckDB database (files attached once), one cursor each
+    DATATESTER_DEMO_SHARED_DATABASE: bool = Field(default=False)
 
     # EXECUTION CONFIGURATION
     DATATESTER_MAX_TESTRUN_THREADS: int = Field(default=4)
+    # HTTP app: worker threads shared by all concurrently running testruns
+    DATATESTER_TESTRUN_WORKER_POOL_SIZE: int = Field(default=16)
+    # optional caps on concurrently running testcases per data platform (in addition
+    # to the backend's preferred concurrency) and per testobject, across testruns
+    DATATESTER_MAX_CONCURRENCY_PER_PLATFORM: int | None = Field(default=None)
+    DATATESTER_MAX_CONCURRENCY_PER_TESTOBJECT: int | None = Field(default=None)
+    # testrun progress is persisted every N completed testcases or every T seconds,
+    # whichever comes first; final states are always persisted
+    DATATESTER_TESTRUN_PERSIST_EVERY_N: int = Field(default=10)
+    DATATESTER_TESTRUN_PERSIST_INTERVAL_S: float = Field(default=5.0)
+    # FULL: testruns embed full testcase results; DELTA: testruns only reference
+    # separately persisted testcases by ID and a compact summary
+    DATATESTER_TESTRUN_STORAGE_MODE: str = Field(default="FULL")
+    # THREADS: testcases run in worker threads of the API process; PROCESSES: testcases
+    # run in worker processes, which avoids GIL contention of CPU-heavy compares
+    DATATESTER_TESTRUN_EXECUTOR: str = Field(default="THREADS")
+    # with more than one shard, testcases of a testrun are split into shards which
+    # are executed by shard workers (see main_worker) consuming the shard queue;
+    # workers need the same internal storage location as the API
+    DATATESTER_TESTRUN_SHARDS: int = Field(default=1)
+    DATATESTER_SHARD_QUEUE_LOCATION: str | None = Field(default=None)
+    # coordinators fail testruns whose shards are not completed within the timeout;
+    # shards whose worker stopped renewing its lease (e.g. it died) are requeued
+    DATATESTER_SHARD_TIMEOUT_S: float | None = Field(default=3600.0)
+    DATATESTER_SHARD_LEASE_S: float = Field(default=300.0)
+    # steps failing with transient backend errors are retried with backoff, limited
+    # by a retry budget per testrun and a global one per minute for all testruns.
+    # With executor PROCESSES, each of the DATATESTER_MAX_TESTRUN_THREADS worker
+    # processes gets an equal share of both budgets (rounded down); with shards, each
+    # shard does. Together they stay within the budgets, but a share of 0 disables
+    # retries: budgets should be at least the number of worker processes or shards
+    DATATESTER_RETRY_MAX_ATTEMPTS: int = Field(default=3)
+    DATATESTER_RETRY_BUDGET_PER_TESTRUN: int = Field(default=20)
+    DATATESTER_RETRY_BUDGET_GLOBAL_PER_MINUTE: int = Field(default=100)
 
     # GCP DEPLOYMENT CONFIGURATIONS
     DATATESTER_GCP_PROJECT: str | None = Field(default=None)
@@ -77,4 +77,13 @@ class Report:
             TestRunDTO,
             self.dto_storage.read_dto(ObjectType.TESTRUN, testrun_id),
         )
+        if not testrun.results and testrun.testcase_summaries:
+            # testrun was stored in DELTA mode: load referenced testcases
+            results = [
+                cast(
+                    TestCaseDTO, self.dto_storage.read_dto(ObjectType.TESTCASE, str(s.id))
+                )
+                for s in testrun.testcase_summaries
+            ]
+            testrun = testrun.model_copy(update={"results": results})
         return formatter.create_artifact(testrun)
@@ -0,0 +1,87 @@
+import threading
+from typing import List
+
+from src.dtos import DomainConfigDTO
+from src.infrastructure_ports import IBackend, IBackendFactory
+
+
+class BackendPoolError(Exception):
+    """
+    Exception raised when a backend pool operation fails.
+    """
+
+
+class BackendPool:
+    """
+    Pool of backends which is scoped to a single testrun and sized to its maximum
+    number of concurrently running testcases. A testcase leases a backend with
+    acquire() and hands it back with recycle(); idle backends are reused by the next
+    testcase, all backends are closed with close().
+
+    A backend is only ever leased to one testcase at a time, so isolation between
+    concurrently running testcases is as strong as with one backend per testcase.
+    Leases are not bound to threads, so the pool also works with worker threads
+    shared by several testruns. Between two testcases, recycle() resets the backend
+    (e.g. drops temp tables) and checks its health — backends which fail either are
+    closed and replaced.
+    """
+
+    def __init__(
+        self,
+        backend_factory: IBackendFactory,
+        domain_config: DomainConfigDTO,
+        size: int,
+    ):
+        self.backend_factory = backend_factory
+        self.domain_config = domain_config
+        self.size = size
+        self._lock = threading.Lock()
+        self._backends: List[IBackend] = []
+        self._idle: List[IBackend] = []
+        self._closed: bool = False
+
+    def acquire(self) -> IBackend:
+        """Leases an idle backend or creates a new one if the pool is not full."""
+        with self._lock:
+            if self._closed:
+                raise BackendPoolError("Backend pool is closed")
+            if self._idle:
+                return self._idle.pop()
+            if len(self._backends) >= self.size:
+                raise BackendPoolError(f"All {self.size} backends are leased")
+            backend = self.backend_factory.create(domain_config=self.domain_config)
+            self._backends.append(backend)
+            return backend
+
+    def recycle(self, backend: IBackend) -> None:
+        """
+        Returns a leased backend to the pool for the next testcase. If reset or
+        health check fail, the backend is closed and replaced by a fresh one.
+        """
+        try:
+            backend.reset()
+            healthy = backend.is_healthy()
+        except Exception:
+            healthy = False
+
+        with self._lock:
+            if healthy and not self._closed:
+                self._idle.append(backend)
+                return
+            if backend in self._backends:
+                self._backends.remove(backend)
+        backend.close()
+
+    def close(self) -> None:
+        """Closes all backends. Must be called once all testcases are done."""
+        with self._lock:
+            self._closed = True
+            backends, self._backends, self._idle = self._backends, [], []
+        for backend in backends:
+            backend.close()
+
+    @property
+    def leased(self) -> int:
+        """Number of backends created by the pool and not closed yet."""
+        with self._lock:
+            return len(self._backends)
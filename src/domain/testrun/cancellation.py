@@ -0,0 +1,67 @@
+import threading
+from typing import Callable, List
+
+
+class CancelledError(Exception):
+    """
+    Exception raised when work is stopped because its cancellation token was cancelled.
+    """
+
+
+class CancellationToken:
+    """
+    Thread-safe flag for cooperative cancellation. Work checks the token between
+    steps via raise_if_cancelled(); blocking calls which can't check it — e.g. a
+    running query — are aborted by callbacks which fire once the token is cancelled
+    (e.g. IBackend.interrupt). The first cancel wins, later ones are ignored.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._reason: str | None = None
+        self._callbacks: List[Callable[[], None]] = []
+
+    @property
+    def cancelled(self) -> bool:
+        return self._reason is not None
+
+    @property
+    def reason(self) -> str | None:
+        return self._reason
+
+    def cancel(self, reason: str) -> None:
+        with self._lock:
+            if self._reason is not None:
+                return
+            self._reason = reason
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            self._call(callback)
+
+    def register(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """
+        Registers a callback to run on cancellation — immediately if the token is
+        already cancelled. Returns a function which unregisters the callback.
+        """
+        with self._lock:
+            if self._reason is None:
+                self._callbacks.append(callback)
+                return lambda: self._unregister(callback)
+        self._call(callback)
+        return lambda: None
+
+    def raise_if_cancelled(self) -> None:
+        if self._reason is not None:
+            raise CancelledError(self._reason)
+
+    def _unregister(self, callback: Callable[[], None]) -> None:
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    @staticmethod
+    def _call(callback: Callable[[], None]) -> None:
+        try:
+            callback()
+        except Exception:
+            pass  # a failing callback must not prevent other callbacks
@@ -0,0 +1,176 @@
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Callable, ClassVar, Dict, List, Tuple
+
+from src.dtos import TestCaseDTO
+from src.dtos.testrun_dtos import TestCaseDefDTO
+from src.infrastructure_ports import IBackendFactory
+
+SlotKey = Tuple[str, ...]
+
+
+class ConcurrencyLimiter:
+    """
+    Layered concurrency limits for dispatching testcases of a testrun:
+
+    - global: max running testcases of this testrun
+    - platform: max running testcases on the data platform, shared by all testruns
+      of this process (e.g. a warehouse which throttles queries per service account)
+    - testobject: max running testcases per testobject, shared by all testruns of
+      this process (e.g. large tables which don't tolerate concurrent scans)
+
+    Slots are taken with the non-blocking try_acquire, so that the dispatcher can skip
+    a limited testcase and start the next one instead of blocking a worker. A limit of
+    None means unlimited.
+    """
+
+    # running testcases per platform and per testobject across testruns
+    _running: ClassVar[Dict[SlotKey, int]] = {}
+    # released slots across testruns, notified so that blocked dispatchers wake up
+    _releases: ClassVar[int] = 0
+    _lock: ClassVar[threading.Condition] = threading.Condition()
+    # how often a dispatcher with blocked testcases looks for slots freed elsewhere
+    poll_interval_s: float = 0.1
+
+    def __init__(
+        self,
+        global_limit: int,
+        platform: str,
+        platform_limit: int | None = None,
+        testobject_limit: int | None = None,
+    ):
+        for limit in (global_limit, platform_limit, testobject_limit):
+            if limit is not None and limit < 1:
+                raise ValueError(f"Concurrency limits must be positive, got {limit}")
+        self.global_limit = global_limit
+        self.platform = platform
+        self.platform_limit = platform_limit
+        self.testobject_limit = testobject_limit
+        self.running: int = 0
+
+    @classmethod
+    def for_backend(
+        cls,
+        global_limit: int,
+        backend_factory: IBackendFactory,
+        platform_limit: int | None = None,
+        testobject_limit: int | None = None,
+    ) -> "ConcurrencyLimiter":
+        """Limiter whose platform limit also respects the backend's preference."""
+        platform_limits = [
+            limit
+            for limit in (platform_limit, backend_factory.preferred_concurrency())
+            if limit is not None
+        ]
+        return cls(
+            global_limit=global_limit,
+            platform=type(backend_factory).__name__,
+            platform_limit=min(platform_limits) if platform_limits else None,
+            testobject_limit=testobject_limit,
+        )
+
+    def try_acquire(self, definition: TestCaseDefDTO) -> bool:
+        """Takes a slot on all layers for the testcase if all layers have capacity."""
+        if self.running >= self.global_limit:
+            return False
+
+        limits = self._limits(definition)
+        with self._lock:
+            if any(
+                self._running.get(key, 0) >= limit
+                for key, limit in limits.items()
+                if limit is not None
+            ):
+                return False
+            for key in limits:
+                self._running[key] = self._running.get(key, 0) + 1
+        self.running += 1
+        return True
+
+    def release(self, definition: TestCaseDefDTO) -> None:
+        """Frees the slots taken by try_acquire for the testcase."""
+        with self._lock:
+            for key in self._limits(definition):
+                remaining = self._running.get(key, 0) - 1
+                if remaining > 0:
+                    self._running[key] = remaining
+                else:
+                    self._running.pop(key, None)
+            ConcurrencyLimiter._releases += 1
+            self._lock.notify_all()
+        self.running -= 1
+
+    def dispatch(
+        self,
+        definitions: List[TestCaseDefDTO],
+        submit: Callable[[TestCaseDefDTO], Future[TestCaseDTO]],
+        on_result: Callable[[TestCaseDTO], None],
+        stopped: Callable[[], bool] = lambda: False,
+    ) -> None:
+        """
+        Submits testcases in the given order whenever all limits have a free slot.
+        A testcase which is limited (e.g. its testobject is busy) is skipped in favor
+        of the next one, so that workers don't idle. Results are handed to on_result
+        as they complete. Once stopped() is True, no more testcases are started and
+        only running ones are waited for.
+
+        If all remaining testcases are blocked by slots of other testruns, the
+        dispatcher sleeps until any slot of this process is released.
+        """
+        pending = list(definitions)
+        running: Dict[Future[TestCaseDTO], TestCaseDefDTO] = {}
+        try:
+            while pending or running:
+                if stopped():
+                    pending = []  # start no more testcases, wait for running ones
+                releases = self._releases
+                pending = self.submit_available(pending, running, submit)
+                if not running:
+                    if pending:
+                        self._wait_for_release(releases, self.poll_interval_s)
+                    continue
+                # blocked testcases may get slots freed by other testruns meanwhile
+                timeout = self.poll_interval_s if pending else None
+                done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    self.release(running.pop(future))
+                    on_result(future.result())
+        finally:
+            for definition in running.values():
+                self.release(definition)
+
+    def submit_available(
+        self,
+        pending: List[TestCaseDefDTO],
+        running: Dict,
+        submit: Callable,
+    ) -> List[TestCaseDefDTO]:
+        """Submits pending testcases which get a slot; returns the remaining ones."""
+        still_pending: List[TestCaseDefDTO] = []
+        for definition in pending:
+            if self.try_acquire(definition):
+                running[submit(definition)] = definition
+            else:
+                still_pending.append(definition)
+        return still_pending
+
+    def _wait_for_release(self, releases: int, timeout: float) -> None:
+        """Blocks until a slot was released after `releases` releases, or timeout."""
+        with self._lock:
+            self._lock.wait_for(
+                lambda: ConcurrencyLimiter._releases != releases, timeout=timeout
+            )
+
+    def _limits(self, definition: TestCaseDefDTO) -> Dict[SlotKey, int | None]:
+        testobject = definition.testobject
+        testobject_key = (
+            self.platform,
+            testobject.domain,
+            testobject.stage,
+            testobject.instance,
+            testobject.name,
+        )
+        return {
+            (self.platform,): self.platform_limit,
+            testobject_key: self.testobject_limit,
+        }
@@ -1,5 +1,6 @@
 # flake8: noqa
 # abstract_check contents must be imported first, since later modules import them
+from .check_result_cache import CheckResultCache
 from .abstract_check import AbstractCheck, known_checks, Checkable
 from .precondition_checker import PreConditionChecker, IPreconditionChecker
 from .check_always_ok import CheckAlwaysOk
@@ -1,9 +1,11 @@
 from abc import ABC, abstractmethod
-from typing import Callable, Dict, List, Optional
+from typing import Callable, Dict, Hashable, List, Optional
 
 from src.dtos import AnySpec, Importance, TestObjectDTO
 from src.infrastructure_ports import IBackend
 
+from .check_result_cache import CheckOutcome, CheckResultCache
+
 # registry of all known checks -- populated via AbstractCheck.__init_cubclasses__
 known_checks: Dict[str, Callable] = {}
 
@@ -57,9 +59,48 @@ class AbstractCheck(ABC):
         else:
             known_checks[check_name] = cls
 
-    def check(self, checkable: Checkable) -> bool:
+    def cache_key(self, checkable: Checkable) -> Hashable | None:
+        """
+        Key under which check results are cached within a testrun. By default, results
+        are not cached; checks which only depend on the testobject return its key.
+        """
+        return None
+
+    def testobject_key(self, checkable: Checkable) -> Hashable:
+        testobject = checkable.testobject
+        return (
+            self.name,
+            testobject.domain,
+            testobject.stage,
+            testobject.instance,
+            testobject.name,
+        )
+
+    def check_many(self, checkables: List[Checkable]) -> Dict[Hashable, CheckOutcome]:
+        """
+        Bulk counterpart of check, used by the testrun pre-pass: checks many checkables
+        in few backend round-trips and returns outcomes by cache key, to be cached.
+        By default, checks have no bulk implementation and return no outcomes.
+        """
+        return {}
+
+    def check(self, checkable: Checkable, cache: CheckResultCache | None = None) -> bool:
         """
         Implement the actual checking logic in _check. Logic re-used accross checks should
         be implemented here -- e.g. caching of check results.
         """
-        return self._check(checkable=checkable)
+        key = self.cache_key(checkable)
+        if cache is None or key is None:
+            return self._check(checkable=checkable)
+
+        computed: List[bool] = []
+
+        def compute() -> CheckOutcome:
+            computed.append(True)
+            result = self._check(checkable=checkable)
+            return result, "" if result else checkable.summary
+
+        result, summary = cache.get_or_compute(key, compute)
+        if not computed and summary:
+            checkable.update_summary(summary)  # replay summary of the cached check
+        return result
@@ -0,0 +1,65 @@
+import threading
+from typing import Callable, Dict, Hashable, Tuple
+
+# check result and the summary which a failed check left on its checkable
+CheckOutcome = Tuple[bool, str]
+
+
+class CheckResultCache:
+    """
+    Thread-safe cache of precondition check results, scoped to a single testrun.
+    Checks which only depend on the testobject (e.g. 'testobject_exists') are run
+    once per testobject instead of once per testcase.
+
+    Lookups are single-flight: if several testcases request the same uncached
+    result concurrently, one of them runs the check while the others wait for its
+    result. Failed lookups (exceptions) are not cached — the next waiter runs the
+    check itself. Outcomes may also be stored upfront, e.g. by the testrun pre-pass.
+    """
+
+    def __init__(self, outcomes: Dict[Hashable, CheckOutcome] | None = None) -> None:
+        self._lock = threading.Lock()
+        self._outcomes: Dict[Hashable, CheckOutcome] = dict(outcomes or {})
+        self._in_flight: Dict[Hashable, threading.Event] = {}
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def __reduce__(self):
+        # worker processes get a copy of the outcomes known so far
+        with self._lock:
+            return (CheckResultCache, (dict(self._outcomes),))
+
+    def put(self, key: Hashable, outcome: CheckOutcome) -> None:
+        with self._lock:
+            self._outcomes[key] = outcome
+
+    def peek(self, key: Hashable) -> CheckOutcome | None:
+        """Returns the cached outcome for key without computing or counting it."""
+        with self._lock:
+            return self._outcomes.get(key)
+
+    def get_or_compute(
+        self, key: Hashable, compute: Callable[[], CheckOutcome]
+    ) -> CheckOutcome:
+        """Returns the cached outcome for key, computing it once if not cached."""
+        while True:
+            with self._lock:
+                if key in self._outcomes:
+                    self.hits += 1
+                    return self._outcomes[key]
+                in_flight = self._in_flight.get(key)
+                if in_flight is None:
+                    in_flight = self._in_flight[key] = threading.Event()
+                    break
+            in_flight.wait()  # then re-check: the lookup may have failed
+
+        try:
+            outcome = compute()
+            with self._lock:
+                self._outcomes[key] = outcome
+                self.misses += 1
+            return outcome
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+            in_flight.set()
@@ -1,6 +1,9 @@
+from typing import Dict, Hashable, List, Tuple
+
 from src.dtos import DBInstanceDTO
 
 from . import AbstractCheck, Checkable
+from .check_result_cache import CheckOutcome
 
 
 class CheckTestObjectExists(AbstractCheck):
@@ -11,6 +14,31 @@ class CheckTestObjectExists(AbstractCheck):
 
     name = "testobject_exists"
 
+    def cache_key(self, checkable: Checkable) -> Hashable | None:
+        return self.testobject_key(checkable)
+
+    def check_many(self, checkables: List[Checkable]) -> Dict[Hashable, CheckOutcome]:
+        """Lists testobjects once per domain, stage and instance."""
+        by_db: Dict[Tuple[str, str, str], List[Checkable]] = {}
+        for checkable in checkables:
+            testobject = checkable.testobject
+            db_key = (testobject.domain, testobject.stage, testobject.instance)
+            by_db.setdefault(db_key, []).append(checkable)
+
+        outcomes: Dict[Hashable, CheckOutcome] = {}
+        for db_checkables in by_db.values():
+            first = db_checkables[0]
+            db = DBInstanceDTO.from_testobject(first.testobject)
+            existing_names = {t.name for t in first.backend.list_testobjects(db)}
+            for checkable in db_checkables:
+                name = checkable.testobject.name
+                outcomes[self.testobject_key(checkable)] = (
+                    (True, "")
+                    if name in existing_names
+                    else (False, f"Testobject {name} not found!")
+                )
+        return outcomes
+
     def _check(self, checkable: Checkable) -> bool:
         db = DBInstanceDTO.from_testobject(checkable.testobject)
         existing = checkable.backend.list_testobjects(db)
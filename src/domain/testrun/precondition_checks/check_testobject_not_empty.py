@@ -1,20 +1,44 @@
+from typing import Dict, Hashable, List
+
 from . import AbstractCheck, Checkable
+from .check_result_cache import CheckOutcome
 
 
 class CheckTestObjectNotEmpty(AbstractCheck):
     """
-    Check if a testobject (e.g. table) exists in given domain, stage and instance.
-    Uses backend from checkable (e.g. TestCase instance) to fetch database information.
+    Check if a testobject (e.g. table) contains at least one row. Uses backend from
+    checkable (e.g. TestCase instance) to probe the testobject.
     """
 
     name = "testobject_not_empty"
 
-    def _check(self, checkable: Checkable) -> bool:
-        rowcount: int = checkable.backend.get_testobject_rowcount(
-            testobject=checkable.testobject
+    def cache_key(self, checkable: Checkable) -> Hashable | None:
+        return self.testobject_key(checkable)
+
+    def check_many(self, checkables: List[Checkable]) -> Dict[Hashable, CheckOutcome]:
+        """Probes all distinct testobjects for rows in one batch."""
+        distinct: Dict[Hashable, Checkable] = {}
+        for checkable in checkables:
+            distinct.setdefault(self.testobject_key(checkable), checkable)
+        if not distinct:
+            return {}
+
+        backend = checkables[0].backend
+        have_rows = backend.testobjects_have_rows(
+            [checkable.testobject for checkable in distinct.values()]
         )
+        return {
+            key: (True, "")
+            if has_rows
+            else (False, f"Testobject {checkable.testobject.name} is empty!")
+            for (key, checkable), has_rows in zip(
+                distinct.items(), have_rows, strict=True
+            )
+        }
 
-        if rowcount > 0:
+    def _check(self, checkable: Checkable) -> bool:
+        # only needs a first row, which backends find without a full count
+        if checkable.backend.testobject_has_rows(testobject=checkable.testobject):
             return True
         else:
             checkable.update_summary(f"Testobject {checkable.testobject.name} is empty!")
@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
 
-from . import Checkable, known_checks
+from . import Checkable, CheckResultCache, known_checks
 
 
 class IPreconditionChecker(ABC):
@@ -35,14 +35,18 @@ class IPreconditionChecker(ABC):
 class PreConditionChecker(IPreconditionChecker):
     """
     Factory Class which fetches a specific checker (subclass of AbstractChecker)
-    based on the required check ('name') and then executes the check.
+    based on the required check ('name') and then executes the check. If given a
+    cache, results of cacheable checks are shared by all testcases using the checker.
     """
 
+    def __init__(self, cache: CheckResultCache | None = None):
+        self.cache = cache
+
     def check(self, check: str, checkable: Checkable) -> bool:
         if check not in known_checks:
             raise NotImplementedError(f"Unknown checker name: {check}")
         else:
             checker = known_checks[check]()
 
-        check_result: bool = checker.check(checkable=checkable)
+        check_result: bool = checker.check(checkable=checkable, cache=self.cache)
         return check_result
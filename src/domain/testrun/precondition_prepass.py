@@ -0,0 +1,98 @@
+from typing import Callable, Dict, List, Tuple
+from uuid import UUID
+
+from src.dtos import Importance, TestCaseDTO
+from src.dtos.testrun_dtos import TestCaseDefDTO
+from src.infrastructure_ports import IBackend
+
+from .precondition_checks import CheckResultCache, PreConditionChecker, known_checks
+from .testcases import AbstractTestCase, TestCaseCreator
+
+
+class PreconditionPrePass:
+    """
+    Checks preconditions of all testcases of a testrun before they are dispatched,
+    so that testcases which would abort anyway don't take a worker slot or backend.
+
+    Checks with a bulk implementation (see AbstractCheck.check_many) run once for
+    all testcases — e.g. testobjects are listed once per domain, stage and instance
+    and rowcounts are fetched in one batch — and their outcomes are stored in the
+    testrun's check result cache. Each testcase's preconditions are then checked
+    against the cache; checks without bulk implementation (e.g. spec checks) are
+    cheap and run per testcase. Testcases which pass are executed as usual and hit
+    the warm cache.
+    """
+
+    def __init__(
+        self,
+        backend: IBackend,
+        checker: PreConditionChecker,
+        notify: Callable[[str, Importance], None],
+    ):
+        self.backend = backend
+        self.checker = checker
+        self.cache = checker.cache or CheckResultCache()
+        self.notify = notify
+
+    def run(
+        self, definitions: List[TestCaseDefDTO], testrun_id: UUID
+    ) -> Tuple[List[TestCaseDefDTO], List[TestCaseDTO]]:
+        """Returns definitions which passed and final testcases which were aborted."""
+        # probes are never executed: they don't notify and aren't persisted
+        probes = [
+            TestCaseCreator.create(definition, testrun_id, self.backend, [], None)
+            for definition in definitions
+        ]
+        self._check_in_bulk(probes)
+
+        passed: List[TestCaseDefDTO] = []
+        aborted: List[TestCaseDTO] = []
+        for definition, probe in zip(definitions, probes, strict=True):
+            try:
+                result = probe.precheck(self.checker)
+            except Exception:
+                result = None  # the testcase reports the error when it runs
+            if result is None:
+                passed.append(definition)
+            else:
+                aborted.append(result)
+        return passed, aborted
+
+    def _check_in_bulk(self, probes: List[AbstractTestCase]) -> None:
+        """
+        Runs bulk checks in the order in which testcases declare them. A testcase
+        is skipped by later checks once one of its earlier checks failed, e.g. empty
+        checks don't count rows of testobjects which don't exist.
+        """
+        check_names: Dict[str, None] = {}
+        for probe in probes:
+            check_names.update(dict.fromkeys(probe.preconditions or []))
+
+        for check_name in check_names:
+            if check_name not in known_checks:
+                continue  # the testcase reports unknown checks when it runs
+            candidates = [
+                probe
+                for probe in probes
+                if check_name in (probe.preconditions or [])
+                and not self._failed_before(probe, check_name)
+            ]
+            try:
+                outcomes = known_checks[check_name]().check_many(candidates)
+            except Exception as err:
+                msg = f"Pre-pass check {check_name} failed, testcases check it: {err}"
+                self.notify(msg, Importance.WARNING)
+                continue
+            for key, outcome in outcomes.items():
+                self.cache.put(key, outcome)
+
+    def _failed_before(self, probe: AbstractTestCase, check_name: str) -> bool:
+        preconditions = probe.preconditions or []
+        for earlier in preconditions[: preconditions.index(check_name)]:
+            if earlier not in known_checks:
+                continue
+            key = known_checks[earlier]().cache_key(probe)
+            outcome = self.cache.peek(key) if key is not None else None
+            if outcome is not None and not outcome[0]:
+                return True
+        return False
@@ -0,0 +1,118 @@
+"""
+Worker side of process-pool testrun execution. Functions in this module run in
+worker processes of a ProcessPoolExecutor and must therefore be importable and
+receive only picklable arguments (DTOs, backend factory, multiprocessing queue).
+"""
+
+import threading
+from multiprocessing.queues import Queue
+from typing import List
+from uuid import UUID
+
+from src.dtos import DomainConfigDTO, NotificationDTO, TestCaseDTO
+from src.dtos.testrun_dtos import TestCaseDefDTO
+from src.infrastructure_ports import IBackend, IBackendFactory, INotifier
+
+from .precondition_checks import IPreconditionChecker
+from .retry_policy import RetryPolicy
+from .testcases import TestCaseCreator
+
+
+class QueueNotifier(INotifier):
+    """Forwards notifications of a worker process to the parent via a queue."""
+
+    def __init__(self, queue: Queue):
+        self.queue = queue
+
+    def notify(self, notification: NotificationDTO) -> None:
+        self.queue.put(notification)
+
+
+class NotificationForwarder:
+    """
+    Runs in the parent process: drains the notification queue of worker processes
+    in a background thread and hands each notification to the testrun's notifiers.
+    """
+
+    _sentinel = None
+
+    def __init__(self, queue: Queue, notifiers: List[INotifier]):
+        self.queue = queue
+        self.notifiers = notifiers
+        self._thread = threading.Thread(
+            target=self._run, name="testrun-notification-forwarder", daemon=True
+        )
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Forwards all queued notifications, then stops. Call after workers exited."""
+        self.queue.put(self._sentinel)
+        self._thread.join()
+
+    def _run(self) -> None:
+        while (notification := self.queue.get()) is not self._sentinel:
+            for notifier in self.notifiers:
+                try:
+                    notifier.notify(notification)
+                except Exception:
+                    pass  # a failing notifier must not stop forwarding
+
+
+class _WorkerState:
+    """Per-process state, set up once by init_worker."""
+
+    backend_factory: IBackendFactory
+    domain_config: DomainConfigDTO
+    notifier: QueueNotifier
+    retry_policy: RetryPolicy
+    checker: IPreconditionChecker
+    backend: IBackend | None = None
+
+
+def init_worker(
+    backend_factory: IBackendFactory,
+    domain_config: DomainConfigDTO,
+    notification_queue: Queue,
+    retry_policy: RetryPolicy,
+    checker: IPreconditionChecker,
+) -> None:
+    """Initializer of worker processes: remembers how to build this process's backend."""
+    _WorkerState.backend_factory = backend_factory
+    _WorkerState.domain_config = domain_config
+    _WorkerState.notifier = QueueNotifier(notification_queue)
+    _WorkerState.retry_policy = retry_policy
+    _WorkerState.checker = checker
+    _WorkerState.backend = None
+
+
+def execute_testcase(definition: TestCaseDefDTO, testrun_id: UUID) -> TestCaseDTO:
+    """
+    Executes a single testcase in a worker process. The backend is created on first
+    use and reused for all testcases of the process; it is reset after each testcase
+    and replaced if it turns unhealthy. Intermediate testcase states are not persisted
+    by workers — the parent persists the returned final TestCaseDTO.
+    """
+    if _WorkerState.backend is None:
+        _WorkerState.backend = _WorkerState.backend_factory.create(
+            domain_config=_WorkerState.domain_config
+        )
+    backend = _WorkerState.backend
+
+    try:
+        testcase = TestCaseCreator.create(
+            definition, testrun_id, backend, [_WorkerState.notifier], None
+        )
+        return testcase.execute(
+            checker=_WorkerState.checker, retry_policy=_WorkerState.retry_policy
+        )
+    finally:
+        try:
+            backend.reset()
+            healthy = backend.is_healthy()
+        except Exception:
+            healthy = False
+        if not healthy:
+            backend.close()
+            _WorkerState.backend = None
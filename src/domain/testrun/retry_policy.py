@@ -0,0 +1,125 @@
+import random
+import threading
+import time
+from collections import deque
+from typing import ClassVar, Deque, Dict, Tuple
+
+from src.infrastructure_ports import TransientBackendError
+
+
+class RetryBudget:
+    """
+    Thread-safe number of retries which may be spent. With a window, the budget
+    refills: at most `retries` retries are allowed within any `window_s` seconds.
+    Without a window, the budget is spent once (e.g. per testrun).
+    """
+
+    def __init__(self, retries: int, window_s: float | None = None):
+        self.retries = retries
+        self.window_s = window_s
+        self._lock = threading.Lock()
+        self._spent: Deque[float] = deque()
+
+    def try_spend(self) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            if self.window_s is not None:
+                while self._spent and now - self._spent[0] >= self.window_s:
+                    self._spent.popleft()
+            if len(self._spent) >= self.retries:
+                return False
+            self._spent.append(now)
+            return True
+
+    @property
+    def spent(self) -> int:
+        with self._lock:
+            return len(self._spent)
+
+
+class RetryPolicy:
+    """
+    Retry policy for testcase steps which fail with a TransientBackendError, e.g.
+    a connection reset. A step is attempted up to `max_attempts` times, waiting
+    with exponential backoff and full jitter between attempts, so that testcases
+    which failed together don't retry in lockstep.
+
+    Retries are limited by two budgets, so that a broken warehouse is not hammered:
+    a per-testrun budget (one policy is shared by all testcases of a testrun) and
+    a global budget per minute, shared by all testruns of this process. Worker
+    processes and shard workers can't spend budgets of this process: they get a
+    share() of both budgets instead, so that together they stay within them.
+    """
+
+    base_delay_s: float = 0.5
+    max_delay_s: float = 10.0
+
+    # global budgets per limit, shared by all testruns of this process
+    _global_budgets: ClassVar[Dict[Tuple[int, float], RetryBudget]] = {}
+    _global_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        budget_per_testrun: int = 20,
+        budget_global_per_minute: int = 100,
+    ):
+        if max_attempts < 1:
+            raise ValueError(f"Max attempts must be positive, got {max_attempts}")
+        self.max_attempts = max_attempts
+        self.testrun_budget = RetryBudget(budget_per_testrun)
+        self.global_budget = self._global_budget(budget_global_per_minute, 60.0)
+
+    def share(self, parts: int) -> "RetryPolicy":
+        """
+        Policy with an equal part of both budgets (rounded down), for one of `parts`
+        workers which execute testcases of the testrun outside this process.
+        """
+        if parts < 1:
+            raise ValueError(f"Parts must be positive, got {parts}")
+        return RetryPolicy(
+            max_attempts=self.max_attempts,
+            budget_per_testrun=self.testrun_budget.retries // parts,
+            budget_global_per_minute=self.global_budget.retries // parts,
+        )
+
+    def __reduce__(self):
+        # unspent copy with the same budgets: pickle a share() for worker processes
+        args = (
+            self.max_attempts,
+            self.testrun_budget.retries,
+            self.global_budget.retries,
+        )
+        return (RetryPolicy, args)
+
+    @classmethod
+    def _global_budget(cls, retries: int, window_s: float) -> RetryBudget:
+        with cls._global_lock:
+            key = (retries, window_s)
+            if key not in cls._global_budgets:
+                cls._global_budgets[key] = RetryBudget(retries, window_s)
+            return cls._global_budgets[key]
+
+    @staticmethod
+    def is_transient(err: BaseException) -> bool:
+        """True if the error or any error it was raised from is transient."""
+        cause: BaseException | None = err
+        while cause is not None:
+            if isinstance(cause, TransientBackendError):
+                return True
+            cause = cause.__cause__ or cause.__context__
+        return False
+
+    def should_retry(self, err: BaseException, attempt: int) -> bool:
+        """
+        Decides whether a step which failed in the given attempt (starting at 1) is
+        retried. Spends budget if so.
+        """
+        if attempt >= self.max_attempts or not self.is_transient(err):
+            return False
+        return self.global_budget.try_spend() and self.testrun_budget.try_spend()
+
+    def delay_s(self, attempt: int) -> float:
+        """Backoff before the next attempt: full jitter on an exponential cap."""
+        cap = min(self.max_delay_s, self.base_delay_s * 2 ** (attempt - 1))
+        return random.uniform(0, cap)
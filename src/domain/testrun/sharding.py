@@ -0,0 +1,384 @@
+"""
+Sharded testrun execution across worker nodes. The coordinating ShardedTestRun
+splits its testcases into shards and hands them to workers via a shard queue;
+ShardWorkers on any number of processes or hosts claim shards, execute them and
+persist testcase results to the shared DTO storage; the coordinator then collects
+the results into the final testrun.
+"""
+
+import asyncio
+import os
+import platform
+import threading
+import time
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import Callable, List, cast
+from uuid import UUID
+
+from src.dtos import (
+    Importance,
+    ObjectType,
+    ShardResultDTO,
+    TestCaseDTO,
+    TestRunDTO,
+    TestRunShardDTO,
+)
+from src.dtos.testrun_dtos import TestCaseDefDTO, TestRunDefDTO
+from src.infrastructure_ports import (
+    IBackendFactory,
+    IDtoStorage,
+    INotifier,
+    IShardQueue,
+)
+
+from .backend_pool import BackendPool
+from .concurrency_limiter import ConcurrencyLimiter
+from .precondition_checks import CheckResultCache, PreConditionChecker
+from .retry_policy import RetryPolicy
+from .testcases import TestCaseCreator
+from .testrun import TestRun, TestRunError
+
+
+class ShardTimeoutError(TestRunError):
+    """
+    Exception raised when workers don't complete all shards of a testrun in time.
+    """
+
+
+class ShardFailedError(TestRunError):
+    """
+    Exception raised when a worker failed to execute a shard of a testrun.
+    """
+
+
+class ShardedTestRun(TestRun):
+    """
+    Testrun whose testcases are executed by ShardWorkers instead of this process.
+
+    Testcases are scheduled longest-expected-first as for local testruns and then
+    distributed greedily to the currently least loaded shard, so that shards have
+    similar expected durations. Workers persist testcases to the shared DTO storage;
+    this process only polls the shard queue for completed shards and collects their
+    testcases. If a shard fails or times out, the testrun ends in ERROR and can be
+    resumed — testcases of completed shards are kept. Shards which are not completed
+    when the testrun ends (e.g. on cancellation or timeout) are withdrawn from the
+    queue, so that workers don't execute them after a resume enqueued new ones.
+    """
+
+    def __init__(
+        self,
+        testrun_def: TestRunDefDTO,
+        backend_factory: IBackendFactory,
+        notifiers: List[INotifier],
+        dto_storage: IDtoStorage,
+        shard_queue: IShardQueue,
+        shard_count: int = 2,
+        shard_poll_interval_s: float = 1.0,
+        shard_timeout_s: float | None = 3600.0,
+        **kwargs,
+    ):
+        if shard_count < 1:
+            raise ValueError(f"Shard count must be positive, got {shard_count}")
+        super().__init__(testrun_def, backend_factory, notifiers, dto_storage, **kwargs)
+        self.shard_queue = shard_queue
+        self.shard_count = shard_count
+        self.shard_poll_interval_s = shard_poll_interval_s
+        self.shard_timeout_s = shard_timeout_s
+
+    def execute(self) -> TestRunDTO:
+        """Hands shards to workers, waits for all of them and collects results."""
+        scheduled = self._start()
+        try:
+            shards = self._split(scheduled)
+            for shard in shards:
+                self.shard_queue.put(shard)
+            self.notify(f"Handed {len(shards)} shard(s) to workers")
+            self._await_shards(shards)
+        except Exception as err:
+            self._withdraw_shards()
+            self._fail(err)
+            raise
+        self._withdraw_shards()
+        return self._finish()
+
+    async def execute_async(self, worker_pool: Executor) -> TestRunDTO:
+        # testcases don't run here: waiting for workers only needs one thread
+        return await asyncio.to_thread(self.execute)
+
+    def _split(self, scheduled: List[TestCaseDefDTO]) -> List[TestRunShardDTO]:
+        """
+        Distributes testcases in scheduled (longest-first) order to the shard with
+        the lowest expected duration so far. Estimates are taken from the schedule
+        recorded in testrun details.
+        """
+        estimates = [float(detail["estimated_duration_s"]) for detail in self.details]
+        shard_count = min(self.shard_count, len(scheduled))
+        loads = [0.0] * shard_count
+        definitions: List[List[TestCaseDefDTO]] = [[] for _ in range(shard_count)]
+        for definition, estimate in zip(scheduled, estimates, strict=True):
+            index = loads.index(min(loads))
+            loads[index] += estimate
+            definitions[index].append(definition)
+        return [
+            TestRunShardDTO(
+                testrun_id=self.id,
+                index=index,
+                shard_count=shard_count,
+                testcase_defs=shard_defs,
+            )
+            for index, shard_defs in enumerate(definitions)
+        ]
+
+    def _await_shards(self, shards: List[TestRunShardDTO]) -> None:
+        """Polls the shard queue until all shards are completed or time is up."""
+        pending = {shard.id for shard in shards}
+        failed: List[ShardResultDTO] = []
+        deadline = (
+            None
+            if self.shard_timeout_s is None
+            else time.monotonic() + self.shard_timeout_s
+        )
+        while pending:
+            for result in self.shard_queue.list_results(str(self.id)):
+                if result.shard_id not in pending:
+                    continue
+                pending.discard(result.shard_id)
+                self._collect_shard(result)
+                if result.error is not None:
+                    failed.append(result)
+            if not pending or self._cancellation.cancelled:
+                break  # on cancellation, results of running shards are dropped
+            if deadline is not None and time.monotonic() >= deadline:
+                raise ShardTimeoutError(
+                    f"{len(pending)} shard(s) not completed after {self.shard_timeout_s}s"
+                )
+            time.sleep(self.shard_poll_interval_s)
+
+        if failed:
+            indices = ", ".join(str(result.index) for result in failed)
+            raise ShardFailedError(f"Shard(s) {indices} failed: {failed[0].error}")
+
+    def _withdraw_shards(self) -> None:
+        """Removes shards of this testrun which workers did not complete."""
+        withdrawn = self.shard_queue.withdraw(str(self.id))
+        if withdrawn > 0:
+            msg = f"Withdrew {withdrawn} shard(s) which were not completed by workers"
+            self.notify(msg, importance=Importance.WARNING)
+
+    def _collect_shard(self, result: ShardResultDTO) -> None:
+        """Loads the testcases which a worker persisted for a completed shard."""
+        for testcase_id in result.testcase_ids:
+            dto = self.dto_storage.read_dto(ObjectType.TESTCASE, str(testcase_id))
+            self._collect_result(cast(TestCaseDTO, dto), persist_testcase=False)
+        if result.error is None:
+            self.notify(
+                f"Shard {result.index} completed by worker {result.worker} "
+                f"with {len(result.testcase_ids)} testcase(s)"
+            )
+        else:
+            msg = f"Shard {result.index} failed on worker {result.worker}: {result.error}"
+            self.notify(msg, importance=Importance.ERROR)
+
+
+class ShardLease:
+    """
+    Renews the lease on a claimed shard in a background thread while the shard is
+    executed. If the lease can't be renewed — it expired and the shard was handed
+    to another worker, or it was withdrawn — lost is set.
+    """
+
+    def __init__(self, shard_queue: IShardQueue, shard: TestRunShardDTO):
+        self.shard_queue = shard_queue
+        self.shard = shard
+        self.lost = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._renew, daemon=True)
+
+    def __enter__(self) -> "ShardLease":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stopped.set()
+        self._thread.join()
+
+    def _renew(self) -> None:
+        interval_s = self.shard_queue.lease_s / 3
+        while not self._stopped.wait(interval_s):
+            if not self.shard_queue.renew(self.shard):
+                self.lost.set()
+                return
+
+
+class ShardWorker:
+    """
+    Claims shards from a shard queue and executes their testcases in worker threads
+    which lease backends from a pool. Testcases are persisted to the shared DTO
+    storage; the completion record only references them by ID. Any number of
+    workers may consume the same queue.
+
+    Testcases of a shard share a retry policy and respect the same concurrency
+    limits as testcases of local testruns. Retry budgets apply per shard.
+    """
+
+    def __init__(
+        self,
+        shard_queue: IShardQueue,
+        backend_factory: IBackendFactory,
+        notifiers: List[INotifier],
+        dto_storage: IDtoStorage,
+        max_threads: int = 4,
+        name: str | None = None,
+        max_concurrency_per_platform: int | None = None,
+        max_concurrency_per_testobject: int | None = None,
+        retry_max_attempts: int = 3,
+        retry_budget_per_testrun: int = 20,
+        retry_budget_global_per_minute: int = 100,
+    ):
+        self.shard_queue = shard_queue
+        self.backend_factory = backend_factory
+        self.notifiers = notifiers
+        self.dto_storage = dto_storage
+        self.max_threads = max_threads
+        self.name = name or f"{platform.node()}:{os.getpid()}"
+        self.max_concurrency_per_platform = max_concurrency_per_platform
+        self.max_concurrency_per_testobject = max_concurrency_per_testobject
+        self.retry_max_attempts = retry_max_attempts
+        self.retry_budget_per_testrun = retry_budget_per_testrun
+        self.retry_budget_global_per_minute = retry_budget_global_per_minute
+
+    def run(
+        self, idle_timeout_s: float | None = None, poll_interval_s: float = 1.0
+    ) -> int:
+        """
+        Executes shards until the queue stayed empty for idle_timeout_s seconds
+        (forever if None). Returns the number of executed shards.
+        """
+        executed = 0
+        idle_since = time.monotonic()
+        while True:
+            shard = self.shard_queue.claim()
+            if shard is not None:
+                result = self.execute_shard(shard)
+                if result is not None:
+                    self.shard_queue.complete(result)
+                executed += 1
+                idle_since = time.monotonic()
+                continue
+            if idle_timeout_s is not None:
+                if time.monotonic() - idle_since >= idle_timeout_s:
+                    return executed
+            time.sleep(poll_interval_s)
+
+    def execute_shard(self, shard: TestRunShardDTO) -> ShardResultDTO | None:
+        """
+        Executes all testcases of a shard and returns its completion record. Returns
+        None if the lease on the shard was lost: the shard was handed to another
+        worker or withdrawn, and no record must be written.
+        """
+        result = ShardResultDTO(
+            shard_id=shard.id,
+            testrun_id=shard.testrun_id,
+            index=shard.index,
+            worker=self.name,
+        )
+        if not shard.testcase_defs:
+            return result
+
+        backend_pool = BackendPool(
+            backend_factory=self.backend_factory,
+            domain_config=shard.testcase_defs[0].domain_config,
+            size=self.max_threads,
+        )
+        # testcases of a shard share precondition check results and the shard's
+        # share of the retry budgets, so that all shards together stay within them
+        retry_policy = RetryPolicy(
+            max_attempts=self.retry_max_attempts,
+            budget_per_testrun=self.retry_budget_per_testrun,
+            budget_global_per_minute=self.retry_budget_global_per_minute,
+        ).share(shard.shard_count)
+        checker = PreConditionChecker(cache=CheckResultCache())
+        try:
+            with (
+                ShardLease(self.shard_queue, shard) as lease,
+                ThreadPoolExecutor(max_workers=self.max_threads) as executor,
+            ):
+                testcases = self._dispatch(
+                    shard.testcase_defs,
+                    submit=lambda definition: executor.submit(
+                        self._execute_testcase,
+                        definition,
+                        shard.testrun_id,
+                        backend_pool,
+                        retry_policy,
+                        checker,
+                    ),
+                    lease=lease,
+                )
+            if lease.lost.is_set():
+                return None
+            result.testcase_ids = [testcase.id for testcase in testcases]
+        except Exception as err:
+            result.error = str(err)
+        finally:
+            backend_pool.close()
+        return result
+
+    def _dispatch(
+        self,
+        definitions: List[TestCaseDefDTO],
+        submit: Callable[[TestCaseDefDTO], Future[TestCaseDTO]],
+        lease: ShardLease,
+    ) -> List[TestCaseDTO]:
+        """
+        Submits testcases whenever all concurrency limits have a free slot, see
+        ConcurrencyLimiter.dispatch. Stops starting testcases once the lease is lost.
+        """
+        limiter = ConcurrencyLimiter.for_backend(
+            global_limit=self.max_threads,
+            backend_factory=self.backend_factory,
+            platform_limit=self.max_concurrency_per_platform,
+            testobject_limit=self.max_concurrency_per_testobject,
+        )
+        testcases: List[TestCaseDTO] = []
+        limiter.dispatch(
+            definitions, submit, on_result=testcases.append, stopped=lease.lost.is_set
+        )
+        return testcases
+
+    def _execute_testcase(
+        self,
+        definition: TestCaseDefDTO,
+        testrun_id: UUID,
+        backend_pool: BackendPool,
+        retry_policy: RetryPolicy,
+        checker: PreConditionChecker,
+    ) -> TestCaseDTO:
+        backend = backend_pool.acquire()
+        try:
+            testcase = TestCaseCreator.create(
+                definition, testrun_id, backend, self.notifiers, self.dto_storage
+            )
+            return testcase.execute(checker=checker, retry_policy=retry_policy)
+        finally:
+            backend_pool.recycle(backend)
+
+
+def run_shard_worker(
+    shard_queue: IShardQueue,
+    backend_factory: IBackendFactory,
+    dto_storage: IDtoStorage,
+    max_threads: int = 4,
+    idle_timeout_s: float | None = None,
+    poll_interval_s: float = 1.0,
+    **worker_options,
+) -> int:
+    """
+    Entry point of a worker process: runs a ShardWorker without notifiers. All
+    arguments must be picklable, e.g. a file-based queue and storage. Further
+    options, e.g. concurrency limits and retry budgets, are passed to ShardWorker.
+    """
+    worker = ShardWorker(
+        shard_queue, backend_factory, [], dto_storage, max_threads, **worker_options
+    )
+    return worker.run(idle_timeout_s=idle_timeout_s, poll_interval_s=poll_interval_s)
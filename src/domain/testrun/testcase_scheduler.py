@@ -0,0 +1,124 @@
+from statistics import median
+from typing import Dict, List, Tuple, cast
+
+from src.dtos import ObjectType, Status, TestCaseSummaryDTO, TestRunDTO, TestType
+from src.dtos.testrun_dtos import TestCaseDefDTO
+from src.infrastructure_ports import IDtoStorage
+
+HistoryKey = Tuple[str, TestType]
+
+
+class ScheduledTestCase:
+    """A testcase definition together with its expected duration."""
+
+    __test__ = False  # prevents pytest collection
+
+    def __init__(self, definition: TestCaseDefDTO, estimate_s: float, source: str):
+        self.definition = definition
+        self.estimate_s = estimate_s
+        self.source = source  # "history" or "prior"
+
+    def to_detail(self, position: int) -> Dict[str, str | int | float]:
+        return {
+            "position": position,
+            "testobject": self.definition.testobject.name,
+            "testtype": self.definition.testtype.value,
+            "scenario": self.definition.scenario or "",
+            "estimated_duration_s": round(self.estimate_s, 2),
+            "estimate_source": self.source,
+        }
+
+
+class TestCaseScheduler:
+    """
+    Orders testcases longest-expected-first (LPT scheduling) to minimize the makespan
+    of a testrun: long testcases start early, short ones fill up idle workers at the
+    end instead of one long testcase running alone.
+
+    Expected durations are taken from the history of earlier testcases of the same
+    testobject and testtype (median wall-clock duration of the most recent finished
+    runs within the last history_testruns testruns). Step durations recorded by time_it
+    are not used since timed steps nest. Without history, a prior per testtype is used
+    which, for compares, grows with sample size.
+    """
+
+    __test__ = False  # prevents pytest collection
+
+    # prior duration estimates in seconds if no history is available
+    prior_duration_s: Dict[TestType, float] = {
+        TestType.SCHEMA: 1.0,
+        TestType.ROWCOUNT: 2.0,
+        TestType.STAGECOUNT: 2.0,
+        TestType.COMPARE: 5.0,
+    }
+    default_prior_duration_s: float = 1.0
+    compare_duration_per_sampled_row_s: float = 0.001
+    history_size: int = 5  # number of most recent durations considered per testcase
+    history_testruns: int = 20  # number of most recent testruns read for history
+
+    def __init__(self, dto_storage: IDtoStorage):
+        self.dto_storage = dto_storage
+
+    def schedule(self, definitions: List[TestCaseDefDTO]) -> List[ScheduledTestCase]:
+        """Returns testcases with their estimates, ordered longest-expected-first."""
+        if not definitions:
+            return []
+
+        history = self._load_history(domain=definitions[0].testobject.domain)
+        scheduled: List[ScheduledTestCase] = []
+        for definition in definitions:
+            durations = history.get((definition.testobject.name, definition.testtype))
+            if durations:
+                recent = durations[-self.history_size :]
+                scheduled.append(ScheduledTestCase(definition, median(recent), "history"))
+            else:
+                prior = self._prior(definition)
+                scheduled.append(ScheduledTestCase(definition, prior, "prior"))
+
+        # sorting is stable: testcases with equal estimates keep their testset order
+        return sorted(scheduled, key=lambda testcase: testcase.estimate_s, reverse=True)
+
+    def _prior(self, definition: TestCaseDefDTO) -> float:
+        prior = self.prior_duration_s.get(
+            definition.testtype, self.default_prior_duration_s
+        )
+        if definition.testtype == TestType.COMPARE:
+            config = definition.domain_config
+            sample_size = config.sample_size_per_object.get(definition.testobject.name)
+            if sample_size is None:
+                sample_size = config.sample_size_default
+            prior += sample_size * self.compare_duration_per_sampled_row_s
+        return prior
+
+    def _load_history(self, domain: str) -> Dict[HistoryKey, List[float]]:
+        """
+        Durations of finished testcases per testobject and testtype, oldest first.
+        History is read from testcase summaries of the most recent testruns of the
+        domain, since testruns are stored per domain while testcases are not. The read
+        is bounded, so that scheduling doesn't slow down as testruns accumulate.
+        """
+        try:
+            dtos = self.dto_storage.list_dtos(
+                object_type=ObjectType.TESTRUN,
+                filters={"domain": domain},
+                order_by="date",
+                limit=self.history_testruns,
+            )
+        except Exception:
+            return {}  # scheduling is best-effort: fall back to priors
+
+        testcases: List[TestCaseSummaryDTO] = []
+        for testrun in [cast(TestRunDTO, dto) for dto in dtos]:
+            testcases.extend(
+                testrun.testcase_summaries
+                or [TestCaseSummaryDTO.from_testcase(tc) for tc in testrun.results]
+            )
+
+        history: Dict[HistoryKey, List[float]] = {}
+        for testcase in sorted(testcases, key=lambda tc: tc.start_ts):
+            if testcase.status != Status.FINISHED or testcase.end_ts is None:
+                continue
+            duration = (testcase.end_ts - testcase.start_ts).total_seconds()
+            key = (testcase.testobject.name, testcase.testtype)
+            history.setdefault(key, []).append(duration)
+        return history
@@ -1,12 +1,15 @@
 from __future__ import annotations
 
+import threading
 import time
 from abc import abstractmethod
 from datetime import datetime
 from functools import wraps
-from typing import Any, ClassVar, Dict, List, Optional
+from typing import Any, Callable, ClassVar, Dict, List, Optional, TypeVar
 from uuid import UUID, uuid4
 
+from src.domain.testrun.cancellation import CancellationToken
+from src.domain.testrun.retry_policy import RetryPolicy
 from src.domain.testrun.precondition_checks import (
     Checkable,
     IPreconditionChecker,
@@ -27,6 +30,8 @@ from src.dtos import (
 from src.dtos.testrun_dtos import TestCaseDefDTO
 from src.infrastructure_ports import IBackend, IDtoStorage, INotifier
 
+T = TypeVar("T")
+
 
 class TestCaseError(Exception):
     """
@@ -99,6 +104,13 @@ class AbstractTestCase(Checkable):
         self.facts: List[Dict[str, str | int]] = []
         self.details: List[Dict[str, str | int | float]] = []  # list of execution details
         self.diff: Dict[str, List | Dict] = dict()  # list of diffs
+        # cancelled when the testcase exceeds its deadline or its testrun is cancelled
+        self.cancellation: CancellationToken = CancellationToken()
+        self._timed_out: bool = False
+        # steps failing with transient backend errors are retried, see _run_step
+        self.retry_policy: RetryPolicy = RetryPolicy()
+        self.retries: Dict[str, int] = {}  # number of retries per step
+        self._exhausted_errors: List[BaseException] = []
         self.status = Status.INITIATED
         self.notify(f"Initiating testcase {self.ttype} for {definition.testobject.name}")
         self.persist()
@@ -152,6 +164,16 @@ class AbstractTestCase(Checkable):
 
         return True
 
+    def precheck(self, checker: IPreconditionChecker) -> TestCaseDTO | None:
+        """
+        Checks preconditions without executing the testcase, e.g. in the testrun
+        pre-pass. Returns the final (ABORTED) testcase if a precondition failed.
+        """
+        if self._check_preconditions(checker=checker):
+            return None
+        self.end_ts = datetime.now()
+        return self.to_dto()
+
     def to_dto(self) -> TestCaseDTO:
         dto = TestCaseDTO(
             id=self.id,
@@ -181,34 +203,177 @@ class AbstractTestCase(Checkable):
     def _execute(self):
         raise NotImplementedError(f"Implement _execute for {self.__class__}")
 
-    def execute(self, checker: Optional[IPreconditionChecker] = None) -> TestCaseDTO:
+    @property
+    def timeout_s(self) -> float | None:
+        """Deadline of the testcase as configured in the domain config."""
+        return self.domain_config.testcase_timeout_s(
+            self.testobject.name, self.ttype.value
+        )
+
+    def execute(
+        self,
+        checker: Optional[IPreconditionChecker] = None,
+        cancellation: CancellationToken | None = None,
+        retry_policy: RetryPolicy | None = None,
+    ) -> TestCaseDTO:
+        """
+        Executes the testcase. If the testcase exceeds its deadline or the given
+        (testrun) cancellation token is cancelled, the running backend call is
+        interrupted and the testcase stops at its next step: timed out testcases
+        end in ERROR, cancelled ones in ABORTED. Steps which fail with transient
+        backend errors are retried according to the (testrun's) retry policy.
+        """
         self.notify(f"Starting execution of {self.ttype} for {self.testobject}")
         checker = checker or PreConditionChecker()
-        if not self._check_preconditions(checker=checker):
-            self.end_ts = datetime.now()
-            self.persist()
-            return self.to_dto()
+        self.retry_policy = retry_policy or self.retry_policy
+        stop_watching = self._watch(cancellation)
+        try:
+            if self._check_preconditions(checker=checker):
+                self._execute_core_logic()
+        except Exception:
+            if not self.cancellation.cancelled:
+                raise
+            self._stop_on_cancellation()
+        finally:
+            stop_watching()
+
+        for step_name, retries in self.retries.items():
+            self.add_detail({f"Retries of {step_name}": retries})
+        self.end_ts = datetime.now()
+        self.persist()
+        result = self.to_dto()
+
+        return result
 
+    def _execute_core_logic(self) -> None:
+        self.cancellation.raise_if_cancelled()
         self.status = Status.EXECUTING
         self.notify("Starting execution of core testlogic ...")
         self.persist()
 
         try:
-            self._execute()
+            # testcases without timed steps are retried as a whole
+            self._run_step("test execution", self._execute, self._reset_outcome)
+            # results of interrupted backend calls can't be trusted
+            self.cancellation.raise_if_cancelled()
             self.status = Status.FINISHED
             self.notify(f"Finished test execution with result: {self.result.name}")
         except Exception as err:
+            if self.cancellation.cancelled:
+                raise
             self.result = Result.NA
             self.status = Status.ERROR
             msg = f"Technical error during test execution: {str(err)}"
             self.notify(msg, importance=Importance.ERROR)
             self.summary = msg
 
-        self.end_ts = datetime.now()
-        self.persist()
-        result = self.to_dto()
-
-        return result
+    def _run_step(
+        self,
+        step_name: str,
+        step: Callable[[], T],
+        before_retry: Callable[[], None] | None = None,
+    ) -> T:
+        """
+        Runs a step, retrying it with backoff while it fails with a transient
+        backend error and the retry policy allows. Steps may nest (timed steps run
+        within the test execution step): an error is only retried by the innermost
+        step, outer steps don't retry it again.
+        """
+        attempt = 1
+        while True:
+            try:
+                return step()
+            except Exception as err:
+                if (
+                    self.cancellation.cancelled
+                    or self._retries_exhausted(err)
+                    or not self.retry_policy.should_retry(err, attempt)
+                ):
+                    self._exhausted_errors.append(err)
+                    raise
+                delay_s = self.retry_policy.delay_s(attempt)
+                self.retries[step_name] = self.retries.get(step_name, 0) + 1
+                msg = (
+                    f"Transient error during {step_name}: {str(err)}. Retrying in "
+                    f"{delay_s:.1f} s (attempt {attempt + 1} of "
+                    f"{self.retry_policy.max_attempts})"
+                )
+                self.notify(msg, importance=Importance.WARNING)
+                self._backoff(delay_s)
+                if before_retry is not None:
+                    before_retry()
+                attempt += 1
+
+    def _retries_exhausted(self, err: BaseException) -> bool:
+        """True if a step already gave up on the error or one it was raised from."""
+        cause: BaseException | None = err
+        while cause is not None:
+            if any(cause is exhausted for exhausted in self._exhausted_errors):
+                return True
+            cause = cause.__cause__ or cause.__context__
+        return False
+
+    def _backoff(self, delay_s: float) -> None:
+        """Waits before a retry; a cancellation ends the wait immediately."""
+        wakeup = threading.Event()
+        unregister = self.cancellation.register(wakeup.set)
+        try:
+            wakeup.wait(delay_s)
+        finally:
+            unregister()
+        self.cancellation.raise_if_cancelled()
+
+    def _reset_outcome(self) -> None:
+        """Discards facts and diff of a failed attempt of the test execution."""
+        self.result = Result.NA
+        self.facts = []
+        self.diff = dict()
+
+    def _watch(self, cancellation: CancellationToken | None) -> Callable[[], None]:
+        """
+        Arms the deadline of the testcase and links it to the testrun cancellation.
+        On either, the running backend call is interrupted. Returns a function
+        which disarms both.
+        """
+        self.cancellation = CancellationToken()
+        self._timed_out = False
+        unregister_interrupt = self.cancellation.register(self.backend.interrupt)
+        unregister_testrun: Callable[[], None] | None = None
+        if cancellation is not None:
+            unregister_testrun = cancellation.register(
+                lambda: self.cancellation.cancel(cancellation.reason or "Cancelled")
+            )
+
+        timer: threading.Timer | None = None
+        timeout_s = self.timeout_s
+        if timeout_s is not None:
+            timer = threading.Timer(timeout_s, self._on_deadline, args=(timeout_s,))
+            timer.daemon = True
+            timer.start()
+
+        def stop_watching() -> None:
+            if timer is not None:
+                timer.cancel()
+            if unregister_testrun is not None:
+                unregister_testrun()
+            unregister_interrupt()
+
+        return stop_watching
+
+    def _on_deadline(self, timeout_s: float) -> None:
+        self._timed_out = True
+        self.cancellation.cancel(f"Testcase timed out after {timeout_s} s")
+
+    def _stop_on_cancellation(self) -> None:
+        self.result = Result.NA
+        msg = f"Stopped test execution: {self.cancellation.reason}"
+        if self._timed_out:
+            self.status = Status.ERROR
+            self.notify(msg, importance=Importance.ERROR)
+        else:
+            self.status = Status.ABORTED
+            self.notify(msg, importance=Importance.WARNING)
+        self.summary = msg
 
 
 class _UnknownTestCase(AbstractTestCase):
@@ -253,8 +418,10 @@ def time_it(step_name: str):
         @wraps(function)
         def wrapper(*args, **kwargs):
             self = args[0]  # args[0] is 'self' of function
+            # steps are the checkpoints of cooperative cancellation
+            self.cancellation.raise_if_cancelled()
             start = time.time()
-            result = function(*args, **kwargs)
+            result = self._run_step(step_name, lambda: function(*args, **kwargs))
             end = time.time()
             duration = round_(end - start)
             detail = {f"Duration of {step_name} (s)": duration}
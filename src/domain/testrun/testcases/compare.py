@@ -1,12 +1,16 @@
-from typing import List, Tuple
+import random
+from typing import Dict, List, Tuple
 
 import polars as pl
 from polars.exceptions import PolarsError
 
 from src.dtos import (
+    CompareMode,
     CompareSpecDTO,
+    Importance,
     DBInstanceDTO,
     Result,
+    SampleStrategy,
     SchemaSpecDTO,
     TestType,
 )
@@ -47,10 +51,27 @@ class CompareTestCase(AbstractTestCase):
     """
     Testcase compares a sample of data from provided test sql vs the data in the test-
     object. All rows and columns which are defined in the test sql are compared.
-    If provided backend supports execution pushdown, comparison is pushed to backend.
+    In PUSHDOWN and RECONCILE compare modes, all rows are compared instead, if the
+    provided backend supports comparison in the database: in PUSHDOWN mode, only
+    differing rows are loaded; in RECONCILE mode, bucket digests and rows of
+    differing buckets.
     """
 
     ttype = TestType.COMPARE
+    max_diff_rows: int = 500  # diff examples kept in testcase results
+    # reconciliation: buckets per level are derived from the testobject rowcount,
+    # targeting rows_per_bucket rows per bucket at the first level
+    rows_per_bucket: int = 1_000
+    min_bucket_count: int = 16
+    max_bucket_count: int = 4096
+    # max levels to drill down, and max rows of differing buckets which are loaded
+    # to compute the diff instead of drilling down. If more buckets differ than
+    # max_differing_bucket_share, or the last level still has too many rows of
+    # differing buckets, the diff is computed in the backend instead (capped at
+    # max_diff_rows like in PUSHDOWN mode)
+    max_bucket_levels: int = 3
+    max_bucket_rows: int = 10_000
+    max_differing_bucket_share: float = 0.5
     required_specs = ["compare", "schema"]
     preconditions = [
         "specs_are_unique",
@@ -75,34 +96,211 @@ class CompareTestCase(AbstractTestCase):
         # get schema defined by testquery
         schema_of_testquery = self._get_schema_from_query()
 
+        compare_mode = self.compare_mode
+        if compare_mode == CompareMode.RECONCILE:
+            # only bucket digests and rows of differing buckets are transferred
+            self.add_fact({"Compare mode": "reconciliation"})
+            diff, diff_count = self._reconcile(schema=schema_of_testquery)
+            equal_summary = "Testobject equals test sql."
+        elif compare_mode == CompareMode.PUSHDOWN:
+            # only differing rows are transferred from the backend
+            self.add_fact({"Compare mode": "pushdown"})
+            diff, diff_count = self._compare_in_backend(schema=schema_of_testquery)
+            equal_summary = "Testobject equals test sql."
+        else:
+            diff, diff_count = self._compare_samples(schema=schema_of_testquery)
+            equal_summary = "Sample from testobject equals sample from test sql."
+
+        if diff_count == 0:
+            self.result = Result.OK
+            self.summary = equal_summary
+        else:
+            self.result = Result.NOK
+            self.summary = f"Testobject differs from SQL in {diff_count} row(s)."
+            # trimm diff to ca. 500 examples to not blow up Excel memory
+            examples = diff.head(self.max_diff_rows)
+            column_diff, row_diff = self._attribute_diff(examples)
+            # values are only attributed within the kept examples: say so if trimmed
+            scope = ""
+            if diff_count > examples.height:
+                scope = f" (among {examples.height} of {diff_count} differing rows)"
+            counts = column_diff.group_by("__column__", maintain_order=True).len()
+            for column, count in counts.iter_rows():
+                self.add_fact({f"Differing values in column {column}{scope}": count})
+            if not column_diff.is_empty():
+                self.diff.update({"column_diff": column_diff.to_dict(as_series=False)})
+            if not row_diff.is_empty():
+                self.diff.update({"compare_diff": row_diff.to_dict(as_series=False)})
+
+        return None
+
+    @time_it(step_name="attributing diff to columns")
+    def _attribute_diff(self, diff: pl.DataFrame) -> Tuple[pl.DataFrame, pl.DataFrame]:
+        """
+        Pairs differing rows of test sql and testobject by primary keys and returns
+        the differing values of paired rows in long format — primary keys,
+        '__column__', '__expected__' and '__actual__' — as well as all differing rows
+        which could not be attributed to columns, e.g. rows missing on one side.
+        """
+        keys = [key for key in self.schema.primary_keys or [] if key in diff.columns]
+        internal = ["__rowhash__", "__source__"]
+        columns = [col for col in diff.columns if col not in keys + internal]
+        long_schema = {key: diff.schema[key] for key in keys} | {
+            "__column__": pl.String,
+            "__expected__": pl.String,
+            "__actual__": pl.String,
+        }
+        if len(keys) == 0 or len(columns) == 0:
+            return pl.DataFrame(schema=long_schema), diff
+
+        expected = diff.filter(pl.col("__source__") == "testobject")
+        actual = diff.filter(pl.col("__source__") == "testquery")
+        paired = expected.select(keys + columns).join(
+            actual.select(keys + columns), on=keys, suffix="__actual__", nulls_equal=True
+        )
+
+        def as_string(col: str) -> pl.Expr:
+            if paired.schema[col].is_nested():
+                return pl.col(col).map_elements(str, return_dtype=pl.String)
+            return pl.col(col).cast(pl.String)
+
+        column_diffs = [
+            paired.filter(pl.col(col).ne_missing(pl.col(f"{col}__actual__"))).select(
+                *keys,
+                pl.lit(col, dtype=pl.String).alias("__column__"),
+                as_string(col).alias("__expected__"),
+                as_string(f"{col}__actual__").alias("__actual__"),
+            )
+            for col in columns
+        ]
+        column_diff = pl.concat(column_diffs).sort(keys, maintain_order=True)
+        attributed = column_diff.select(keys).unique()
+        row_diff = diff.join(attributed, on=keys, how="anti", nulls_equal=True)
+        return column_diff, row_diff
+
+    def _compare_samples(self, schema: SchemaSpecDTO) -> Tuple[pl.DataFrame, int]:
+        """Compares samples of query and testobject which are loaded from backend."""
         # sample primary keys from query
-        sample_keys = self._sample_keys_from_query(schema=schema_of_testquery)
+        sample_keys = self._sample_keys_from_query(schema=schema)
 
         # sample fixtures which matches the pk sample from query
-        expected = self._sample_data_from_query(
-            sample_keys=sample_keys, schema=schema_of_testquery
-        )
+        expected = self._sample_data_from_query(sample_keys=sample_keys, schema=schema)
         self.add_fact({"Actual sample size": expected.shape[0]})
 
         # sample fixtures which matches the pk sample from testobject
         actual = self._sample_data_from_testobject(
-            sample_keys=sample_keys, columns=expected.columns, schema=schema_of_testquery
+            sample_keys=sample_keys, columns=expected.columns, schema=schema
         )
 
         # compare both samples
-        diff = self._compare(expected, actual)
+        return self._compare(expected, actual)
+
+    def _reconcile(self, schema: SchemaSpecDTO) -> Tuple[pl.DataFrame, int]:
+        """
+        Compares all rows of query and testobject Merkle-style: both sides are
+        partitioned into buckets by primary key hash and only buckets whose digests
+        differ are split further, until the rows of differing buckets are few enough
+        to be loaded and compared. Drilling down doesn't pay off if differences are
+        widespread: then, and if the rows of differing buckets are still too many at
+        the last level, the diff is computed in the backend instead.
+        """
+        bucket_count = self._bucket_count()
+        self.add_detail({"Buckets per level": bucket_count})
+        level = 0
+        parent_buckets: List[int] | None = None
+        while True:
+            expected, actual = self._get_bucket_digests(
+                schema, bucket_count, level, parent_buckets
+            )
+            buckets, rows, bucket_total = self._differing_buckets(expected, actual)
+            self.add_detail({f"Differing buckets at level {level}": len(buckets)})
+            if len(buckets) == 0:
+                return pl.DataFrame(), 0
+            if rows <= self.max_bucket_rows:
+                break
+            if (
+                len(buckets) > self.max_differing_bucket_share * bucket_total
+                or level + 1 >= self.max_bucket_levels
+            ):
+                self.add_fact(
+                    {"Reconciliation": "too many differences, diff computed in backend"}
+                )
+                return self._compare_in_backend(schema=schema)
+            level, parent_buckets = level + 1, buckets
+
+        expected, actual = self._get_rows_from_buckets(
+            schema, bucket_count, level, buckets
+        )
+        self.add_fact({"Rows loaded from differing buckets": expected.shape[0]})
+        return self._compare(expected, actual)
 
-        if diff.shape[0] == 0:
-            self.result = Result.OK
-            self.summary = "Sample from testobject equals sample from test sql."
-        else:
-            self.result = Result.NOK
-            self.summary = f"Testobject differs from SQL in {diff.shape[0]} row(s)."
-            # trimm diff to ca. 500 examples to not blow up Excel memory
-            diff_example = diff.head(500).to_dict(as_series=False)
-            self.diff.update({"compare_diff": diff_example})
+    def _bucket_count(self) -> int:
+        """Buckets per level, so that buckets hold about rows_per_bucket rows."""
+        try:
+            rowcount = self.backend.get_testobject_rowcount(self.testobject)
+        except Exception as err:
+            raise QueryExecutionError("Error while counting testobject rows") from err
+        bucket_count = -(-rowcount // self.rows_per_bucket)  # ceiling division
+        return min(max(bucket_count, self.min_bucket_count), self.max_bucket_count)
+
+    @staticmethod
+    def _differing_buckets(
+        expected: pl.DataFrame, actual: pl.DataFrame
+    ) -> Tuple[List[int], int, int]:
+        """
+        Buckets whose digests differ, the max number of rows they contain and the
+        number of buckets on either side.
+        """
+        joined = expected.join(
+            actual, on="__bucket__", how="full", coalesce=True, suffix="_actual"
+        )
+        differing = joined.filter(
+            pl.col("__rows__").ne_missing(pl.col("__rows___actual"))
+            | pl.col("__digest__").ne_missing(pl.col("__digest___actual"))
+        )
+        rows = differing.select(
+            pl.max_horizontal(
+                pl.col("__rows__").fill_null(0), pl.col("__rows___actual").fill_null(0)
+            ).sum()
+        ).item()
+        return differing["__bucket__"].sort().to_list(), rows or 0, joined.height
 
-        return None
+    @property
+    def compare_mode(self) -> CompareMode:
+        compare_mode = self.domain_config.compare_mode(self.testobject.name)
+        if compare_mode != CompareMode.SAMPLE and not (
+            self.backend.supports_db_comparison
+        ):
+            name = (
+                "reconciliation" if compare_mode == CompareMode.RECONCILE else "pushdown"
+            )
+            msg = f"Backend doesn't support {name}, comparing samples instead"
+            self.notify(msg, importance=Importance.WARNING)
+            self.add_fact({"Warning": msg})
+            return CompareMode.SAMPLE
+        return compare_mode
+
+    @property
+    def sample_strategy(self) -> Tuple[SampleStrategy, str | None]:
+        """Key sampling strategy and, for stratified sampling, the column to use."""
+        name = self.testobject.name
+        strategy = self.domain_config.sample_strategy(name)
+        if strategy != SampleStrategy.STRATIFIED:
+            return strategy, None
+        stratify_by = self.domain_config.sample_stratify_by_per_object.get(name)
+        if stratify_by is None:
+            msg = "No column to stratify by configured, sampling reservoir instead"
+            self.notify(msg, importance=Importance.WARNING)
+            self.add_fact({"Warning": msg})
+            return SampleStrategy.RESERVOIR, None
+        return strategy, stratify_by
+
+    @property
+    def sample_seed(self) -> int:
+        seed = self.domain_config.sample_seed
+        if seed is None:
+            seed = random.randrange(2**31)
+        return seed
 
     @property
     def sample_size(self) -> int:
@@ -152,7 +350,14 @@ class CompareTestCase(AbstractTestCase):
         return schema
 
     @time_it(step_name="sampling primary keys from query")
-    def _sample_keys_from_query(self, schema: SchemaSpecDTO) -> List[str]:
+    def _sample_keys_from_query(self, schema: SchemaSpecDTO) -> List[Tuple]:
+        strategy, stratify_by = self.sample_strategy
+        seed = self.sample_seed
+        # sampling with the same strategy and seed reproduces the sample
+        self.add_detail({"Sample strategy": strategy.value})
+        if stratify_by is not None:
+            self.add_detail({"Sample stratified by": stratify_by})
+        self.add_detail({"Sample seed": seed})
         try:
             sample_keys = self.backend.get_sample_keys(
                 query=self.translated_query,
@@ -160,6 +365,9 @@ class CompareTestCase(AbstractTestCase):
                 sample_size=self.sample_size,
                 db=self.db,
                 cast_to=schema,
+                strategy=strategy,
+                seed=seed,
+                stratify_by=stratify_by,
             )
         except Exception as err:
             raise QueryExecutionError(
@@ -170,7 +378,7 @@ class CompareTestCase(AbstractTestCase):
 
     @time_it(step_name="sampling fixtures from query")
     def _sample_data_from_query(
-        self, sample_keys: List[str], schema: SchemaSpecDTO
+        self, sample_keys: List[Tuple], schema: SchemaSpecDTO
     ) -> pl.DataFrame:
         try:
             expected = self.backend.get_sample_from_query(
@@ -185,9 +393,69 @@ class CompareTestCase(AbstractTestCase):
 
         return expected
 
+    @time_it(step_name="comparing query vs testobject in backend")
+    def _compare_in_backend(self, schema: SchemaSpecDTO) -> Tuple[pl.DataFrame, int]:
+        try:
+            diff, diff_count = self.backend.get_diff_from_query(
+                query=self.translated_query,
+                testobject=self.testobject,
+                primary_keys=self.schema.primary_keys,  # type: ignore
+                db=self.db,
+                cast_to=schema,
+                max_rows=self.max_diff_rows,
+            )
+        except Exception as err:
+            raise QueryExecutionError(
+                "Error while comparing test query with testobject in backend"
+            ) from err
+
+        return diff, diff_count
+
+    @time_it(step_name="computing bucket digests")
+    def _get_bucket_digests(
+        self,
+        schema: SchemaSpecDTO,
+        bucket_count: int,
+        level: int,
+        parent_buckets: List[int] | None,
+    ) -> Tuple[pl.DataFrame, pl.DataFrame]:
+        try:
+            return self.backend.get_bucket_digests(
+                query=self.translated_query,
+                testobject=self.testobject,
+                primary_keys=self.schema.primary_keys,  # type: ignore
+                db=self.db,
+                cast_to=schema,
+                bucket_count=bucket_count,
+                level=level,
+                parent_buckets=parent_buckets,
+            )
+        except Exception as err:
+            raise QueryExecutionError("Error while computing bucket digests") from err
+
+    @time_it(step_name="loading rows of differing buckets")
+    def _get_rows_from_buckets(
+        self, schema: SchemaSpecDTO, bucket_count: int, level: int, buckets: List[int]
+    ) -> Tuple[pl.DataFrame, pl.DataFrame]:
+        try:
+            return self.backend.get_rows_from_buckets(
+                query=self.translated_query,
+                testobject=self.testobject,
+                primary_keys=self.schema.primary_keys,  # type: ignore
+                db=self.db,
+                cast_to=schema,
+                bucket_count=bucket_count,
+                level=level,
+                buckets=buckets,
+            )
+        except Exception as err:
+            raise QueryExecutionError(
+                "Error while loading rows of differing buckets"
+            ) from err
+
     @time_it(step_name="sampling fixtures from testobject")
     def _sample_data_from_testobject(
-        self, sample_keys: List[str], columns: List[str], schema: SchemaSpecDTO
+        self, sample_keys: List[Tuple], columns: List[str], schema: SchemaSpecDTO
     ) -> pl.DataFrame:
         try:
             actual = self.backend.get_sample_from_testobject(
@@ -202,49 +470,35 @@ class CompareTestCase(AbstractTestCase):
 
         return actual
 
-    # noinspection PyMethodMayBeStatic
-    @time_it(step_name="harmonizing schemas")
     def _harmonize_schemas(
-        self, expected: pl.DataFrame, actual: pl.DataFrame
-    ) -> Tuple[pl.DataFrame, pl.DataFrame]:
-        # try to same-cast to expected schema or to string - this is slow!
-        if not all([col in actual.schema for col in expected.schema]):
+        self, expected: pl.LazyFrame, actual: pl.LazyFrame
+    ) -> Dict[str, pl.DataType]:
+        """Returns the dtypes to which columns of actual must be cast."""
+        expected_schema = expected.collect_schema()
+        actual_schema = actual.collect_schema()
+        if not all([col in actual_schema for col in expected_schema]):
             self.add_fact(
                 {"Schema Error": "Expected schema has other columns than testobject"}
             )
             raise SchemaMismatchError("Expected schema has cols not in actual schema")
-        if expected.schema != actual.schema:
+        if expected_schema != actual_schema:
             self.notify("Schemas of query sample and testobject are different.")
             self.add_fact({"Warning": "Schema differs between query and testobject"})
-            for col, dtype in expected.schema.items():
-                if expected.schema[col] != actual.schema[col]:
-                    try:
-                        actual = actual.cast({col: dtype})
-                    except PolarsError:
-                        actual = actual.cast({col: pl.String})
-                        expected = expected.cast({col: pl.String})
         else:
             self.notify("Testobject and query have same schema.")
             self.add_fact({"Schema info": "Testobject and query have same schema!"})
 
-        return expected, actual
-
-    @time_it(step_name="calculating rowhashes")
-    def _calculate_rowhash(
-        self, expected: pl.DataFrame, actual: pl.DataFrame
-    ) -> Tuple[pl.DataFrame, pl.DataFrame]:
-        def add_rowhash(df_: pl.DataFrame) -> pl.DataFrame:
-            return df_.with_columns((df_.hash_rows()).alias("__rowhash__"))
+        return {
+            col: dtype
+            for col, dtype in expected_schema.items()
+            if actual_schema[col] != dtype
+        }
 
-        actual = add_rowhash(actual)
-        expected = add_rowhash(expected)
+    def _diff_plan(self, expected: pl.LazyFrame, actual: pl.LazyFrame) -> pl.LazyFrame:
+        def add_rowhash(lf: pl.LazyFrame) -> pl.LazyFrame:
+            return lf.with_columns(pl.struct(pl.all()).hash().alias("__rowhash__"))
 
-        return expected, actual
-
-    @time_it(step_name="calculating diff")
-    def _calculate_diff(
-        self, expected: pl.DataFrame, actual: pl.DataFrame
-    ) -> pl.DataFrame:
+        expected, actual = add_rowhash(expected), add_rowhash(actual)
         # Evaluate diff using an anti-join
         exp_not_act = expected.join(actual, on="__rowhash__", how="anti").with_columns(
             pl.lit("testobject").alias("__source__")
@@ -252,20 +506,44 @@ class CompareTestCase(AbstractTestCase):
         act_not_exp = actual.join(expected, on="__rowhash__", how="anti").with_columns(
             pl.lit("testquery").alias("__source__")
         )
-        diff = exp_not_act.extend(act_not_exp)  # extend appends to dataframe
-
-        return diff
+        return pl.concat([exp_not_act, act_not_exp])
+
+    def _collect_diff(
+        self, expected: pl.LazyFrame, actual: pl.LazyFrame
+    ) -> Tuple[pl.DataFrame, int]:
+        diff = self._diff_plan(expected, actual)
+        columns = diff.collect_schema().names()
+        keys = [key for key in self.schema.primary_keys or [] if key in columns]
+        sort_by = keys + ["__source__"] if keys else columns[:1]
+        # both plans share the hashed inputs, which are computed only once
+        count, examples = pl.collect_all(
+            [diff.select(pl.len()), diff.sort(sort_by).head(self.max_diff_rows)],
+            engine="streaming",
+        )
+        return examples, count.item()
 
     @time_it(step_name="comparing expected vs actual sample")
-    def _compare(self, expected: pl.DataFrame, actual: pl.DataFrame) -> pl.DataFrame:
-        expected, actual = self._harmonize_schemas(expected, actual)
-        expected, actual = self._calculate_rowhash(expected, actual)
-        diff = self._calculate_diff(expected, actual)
-
-        sort_by = None
-        if "__concat_key__" in diff.columns:
-            sort_by = ["__concat_key__", "__source__"]
-
-        diff = diff.sort(by=sort_by or diff.columns[0])
-
-        return diff
+    def _compare(
+        self,
+        expected: pl.DataFrame | pl.LazyFrame,
+        actual: pl.DataFrame | pl.LazyFrame,
+    ) -> Tuple[pl.DataFrame, int]:
+        """
+        Compares expected with actual rows in a single lazy plan, which is executed
+        by the streaming engine: columns of actual are cast to the dtypes of expected,
+        rows are hashed and anti-joined on their hashes, and only the first
+        max_diff_rows differing rows are sorted (top-k). Returns these rows and the
+        total number of differing rows. Inputs may be lazy, e.g. a scan over Arrow
+        record batches, so that they are never fully materialized.
+        """
+        expected, actual = expected.lazy(), actual.lazy()
+        dtypes = self._harmonize_schemas(expected, actual)
+        casts = [pl.col(col).cast(dtype) for col, dtype in dtypes.items()]
+        try:
+            return self._collect_diff(expected, actual.with_columns(casts))
+        except PolarsError:
+            # casting to expected dtypes failed - compare these columns as strings
+            as_string = [pl.col(col).cast(pl.String) for col in dtypes]
+            return self._collect_diff(
+                expected.with_columns(as_string), actual.with_columns(as_string)
+            )
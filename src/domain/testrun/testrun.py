@@ -1,14 +1,27 @@
 # flake8: noqa
+import asyncio
+import multiprocessing
 import threading
-from typing import List, Dict, cast
+from collections import Counter
+from typing import Awaitable, Callable, ClassVar, List, Dict, Tuple, cast
 from datetime import datetime
 from uuid import uuid4, UUID
-from concurrent.futures import ThreadPoolExecutor, as_completed, Future
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    Future,
+    wait,
+)
 
 from src.dtos import (
     TestRunDTO,
     Result,
     TestCaseDTO,
+    TestCaseSummaryDTO,
+    TestRunExecutor,
+    TestRunStorageMode,
     Status,
     ObjectType,
     Importance,
@@ -28,6 +41,45 @@ from .testcases import (  # noqa: F401 — imported to trigger auto-registration
     DummyNokTestCase,
     DummyOkTestCase,
 )
+from .backend_pool import BackendPool
+from .cancellation import CancellationToken
+from .retry_policy import RetryPolicy
+from .precondition_checks import CheckResultCache, PreConditionChecker
+from .precondition_prepass import PreconditionPrePass
+from .concurrency_limiter import ConcurrencyLimiter
+from .testcase_scheduler import TestCaseScheduler
+from .process_workers import NotificationForwarder, execute_testcase, init_worker
+from .testrun_persister import TestRunPersister
+
+
+class TestRunError(Exception):
+    """
+    Exception raised when a testrun operation fails.
+    """
+
+
+class TestRunNotResumableError(TestRunError):
+    """
+    Exception raised when a testrun can't be resumed, e.g. because it is finished.
+    """
+
+
+class NoFailedTestCasesError(TestRunError):
+    """
+    Exception raised when failures of a testrun are rerun, but there are none.
+    """
+
+
+def _testcase_key(testcase: TestCaseDefDTO | TestCaseDTO) -> Tuple[str, ...]:
+    """Identifies a testcase within a testrun across definitions and results."""
+    testobject = testcase.testobject
+    return (
+        testobject.stage,
+        testobject.instance,
+        testobject.name,
+        testcase.testtype.value,
+        testcase.scenario or "",
+    )
 
 
 class TestRunLoader:
@@ -36,21 +88,46 @@ class TestRunLoader:
     def __init__(self, dto_storage: IDtoStorage):
         self.dto_storage = dto_storage
 
-    def load_testrun(self, testrun_id: str) -> TestRunDTO:
-        """Load a testrun by ID."""
+    def load_testrun(self, testrun_id: str, hydrate: bool = False) -> TestRunDTO:
+        """
+        Load a testrun by ID. Testruns stored in DELTA mode only reference their
+        testcases — if hydrate is True, full testcase results are loaded as well.
+        """
         dto = self.dto_storage.read_dto(object_type=ObjectType.TESTRUN, id=testrun_id)
-        return cast(TestRunDTO, dto)
+        testrun = cast(TestRunDTO, dto)
+        return self.hydrate(testrun) if hydrate else testrun
 
-    def list_testruns(self, domain: str, date: str | None = None) -> List[TestRunDTO]:
+    def list_testruns(
+        self, domain: str, date: str | None = None, hydrate: bool = False
+    ) -> List[TestRunDTO]:
         """List testruns by domain and optionally by date."""
         filters: Dict[str, str] = {"domain": domain}
         if date is not None:
             filters["date"] = date
         dtos = self.dto_storage.list_dtos(object_type=ObjectType.TESTRUN, filters=filters)
-        return [cast(TestRunDTO, dto) for dto in dtos]
+        testruns = [cast(TestRunDTO, dto) for dto in dtos]
+        return [self.hydrate(tr) for tr in testruns] if hydrate else testruns
+
+    def hydrate(self, testrun: TestRunDTO) -> TestRunDTO:
+        """Loads full TestCaseDTOs for all testcase summaries of a DELTA testrun."""
+        if testrun.results or not testrun.testcase_summaries:
+            return testrun  # FULL testrun or nothing to hydrate
+
+        results: List[TestCaseDTO] = []
+        for testcase_summary in testrun.testcase_summaries:
+            dto = self.dto_storage.read_dto(
+                object_type=ObjectType.TESTCASE, id=str(testcase_summary.id)
+            )
+            results.append(cast(TestCaseDTO, dto))
+
+        return testrun.model_copy(update={"results": results})
 
 
 class TestRun:
+    # testruns currently executing in this process, to be found by cancel_running
+    _running: ClassVar[Dict[UUID, "TestRun"]] = {}
+    _running_lock: ClassVar[threading.Lock] = threading.Lock()
+
     def __init__(
         self,
         testrun_def: TestRunDefDTO,
@@ -59,6 +136,15 @@ class TestRun:
         dto_storage: IDtoStorage,
         max_testrun_threads: int = 4,
         testrun_id: UUID | None = None,
+        persist_every_n: int = 10,
+        persist_interval_s: float = 5.0,
+        storage_mode: TestRunStorageMode = TestRunStorageMode.FULL,
+        executor: TestRunExecutor = TestRunExecutor.THREADS,
+        max_concurrency_per_platform: int | None = None,
+        max_concurrency_per_testobject: int | None = None,
+        retry_max_attempts: int = 3,
+        retry_budget_per_testrun: int = 20,
+        retry_budget_global_per_minute: int = 100,
     ):
         # flatten definition fields
         self.testcase_defs: List[TestCaseDefDTO] = testrun_def.testcase_defs
@@ -69,12 +155,30 @@ class TestRun:
         self.testset_id: UUID = testrun_def.testset_id or uuid4()
         self.testset_name: str = testrun_def.testset_name or "Testset name not set"
         self.labels: List[str] = testrun_def.labels
+        self.rerun_of: UUID | None = testrun_def.rerun_of
         # infra
         self.backend_factory = backend_factory
         self.notifiers = notifiers
         self.dto_storage = dto_storage
         self.max_testrun_threads = max_testrun_threads
+        self.storage_mode = storage_mode
+        self.executor = executor
+        self.max_concurrency_per_platform = max_concurrency_per_platform
+        self.max_concurrency_per_testobject = max_concurrency_per_testobject
+        # shared by all testcases of the testrun, so that they share its budget
+        self.retry_policy = RetryPolicy(
+            max_attempts=retry_max_attempts,
+            budget_per_testrun=retry_budget_per_testrun,
+            budget_global_per_minute=retry_budget_global_per_minute,
+        )
+        # testcases of the same testobject share results of testobject checks
+        self.checker = PreConditionChecker(cache=CheckResultCache())
         self._lock = threading.Lock()
+        self._persister = TestRunPersister(
+            dto_storage=dto_storage,
+            persist_every_n=persist_every_n,
+            persist_interval_s=persist_interval_s,
+        )
         # execution state
         self.id: UUID = testrun_id or uuid4()
         self.start_ts: datetime = datetime.now()
@@ -82,6 +186,117 @@ class TestRun:
         self.result: Result = Result.NA
         self.status: Status = Status.INITIATED
         self.results: List[TestCaseDTO] = []
+        self.testcase_summaries: List[TestCaseSummaryDTO] = []
+        self.details: List[Dict[str, str | int | float]] = []
+        self._backend_pool: BackendPool | None = None
+        self._cancellation = CancellationToken()
+
+    @classmethod
+    def resume(
+        cls,
+        testrun: TestRunDTO,
+        backend_factory: IBackendFactory,
+        notifiers: List[INotifier],
+        dto_storage: IDtoStorage,
+        **kwargs,
+    ) -> "TestRun":
+        """
+        Restores an interrupted testrun from its persisted (hydrated) state, e.g. after
+        a server restart left it in EXECUTING. On execute, only testcases without a
+        completed result are run; results are merged into the existing testrun.
+        Testcases which completed after the last progress snapshot are run again.
+        """
+        if testrun.status == Status.FINISHED:
+            raise TestRunNotResumableError(f"Testrun {testrun.id} is already finished")
+        if cls.is_running(testrun.id):
+            raise TestRunNotResumableError(f"Testrun {testrun.id} is still executing")
+        if testrun.testcase_summaries and not testrun.results:
+            raise TestRunNotResumableError(f"Testrun {testrun.id} must be hydrated")
+
+        resumed = cls(
+            TestRunDefDTO.from_testrun(testrun),
+            backend_factory,
+            notifiers,
+            dto_storage,
+            testrun_id=testrun.id,
+            **kwargs,
+        )
+        resumed.start_ts = testrun.start_ts
+        resumed.results = list(testrun.results)
+        resumed.testcase_summaries = [
+            TestCaseSummaryDTO.from_testcase(result) for result in testrun.results
+        ]
+        return resumed
+
+    @classmethod
+    def rerun_failures(
+        cls,
+        testrun: TestRunDTO,
+        backend_factory: IBackendFactory,
+        notifiers: List[INotifier],
+        dto_storage: IDtoStorage,
+        testrun_id: UUID | None = None,
+        **kwargs,
+    ) -> "TestRun":
+        """
+        Creates a new testrun from the testcases of a (hydrated) testrun which did
+        not finish OK. Testcase definitions — including their specs — are reused
+        as persisted, so no spec discovery is needed. The new testrun links to the
+        original one via rerun_of.
+        """
+        failed = Counter(
+            _testcase_key(result)
+            for result in testrun.results
+            if result.result != Result.OK
+        )
+        definitions: List[TestCaseDefDTO] = []
+        for definition in testrun.testdefinitions:
+            key = _testcase_key(definition)
+            if failed[key] > 0:
+                failed[key] -= 1
+                definitions.append(definition)
+        if not definitions:
+            raise NoFailedTestCasesError(f"Testrun {testrun.id} has no failed testcases")
+
+        testrun_def = TestRunDefDTO.from_testrun(testrun).model_copy(
+            update={"testcase_defs": definitions, "rerun_of": testrun.id}
+        )
+        return cls(
+            testrun_def,
+            backend_factory,
+            notifiers,
+            dto_storage,
+            testrun_id=testrun_id,
+            **kwargs,
+        )
+
+    @classmethod
+    def is_running(cls, testrun_id: UUID) -> bool:
+        """True if a testrun with this ID is executing in this process."""
+        with cls._running_lock:
+            return testrun_id in cls._running
+
+    @classmethod
+    def cancel_running(cls, testrun_id: UUID, reason: str = "Testrun cancelled") -> bool:
+        """
+        Cancels a testrun executing in this process. Returns False if there is none.
+        """
+        with cls._running_lock:
+            testrun = cls._running.get(testrun_id)
+        if testrun is None:
+            return False
+        testrun.cancel(reason)
+        return True
+
+    def cancel(self, reason: str = "Testrun cancelled") -> None:
+        """
+        Cancels the testrun: no further testcases are started and running testcases
+        are stopped — their backend calls are interrupted, they end in ABORTED.
+        Testcases running in worker processes are not interrupted but finish.
+        The testrun ends in ABORTED and can be resumed.
+        """
+        self.notify(f"Cancelling testrun: {reason}", importance=Importance.WARNING)
+        self._cancellation.cancel(reason)
 
     def notify(self, message: str, importance: Importance = Importance.INFO):
         notification = NotificationDTO(
@@ -96,31 +311,119 @@ class TestRun:
 
     def execute(self) -> TestRunDTO:
         """
-        Executes all testcases in the testrun in parallel using a thread pool.
-        Each testcase gets its own backend instance for thread safety.
-        Results are persisted after each testcase completes.
+        Executes all testcases in the testrun in parallel, either in a thread pool
+        or — for CPU-heavy testruns — in a process pool, see TestRunExecutor.
+        Backends are pooled per testrun: testcases lease a backend and hand it back
+        for reuse by the next testcase; backends are reset between testcases.
+        Progress is persisted in the background according to the persistence policy
+        (every N completions or every T seconds); the final state is always persisted.
+        """
+        scheduled = self._start()
+        try:
+            if self.executor == TestRunExecutor.PROCESSES:
+                self._execute_in_processes(scheduled)
+            else:
+                self._execute_in_threads(scheduled)
+        except Exception as err:
+            self._fail(err)
+            raise
+        return self._finish()
+
+    async def execute_async(self, worker_pool: Executor) -> TestRunDTO:
+        """
+        Asyncio counterpart of execute: testcases are dispatched from the event loop
+        to a worker pool which is shared by all testruns of the application, so the
+        number of threads stays bounded regardless of the number of testruns.
+        Testcases themselves are synchronous and occupy one worker each; blocking
+        bookkeeping (scheduling, persistence) is moved off the event loop as well.
+        Testruns in PROCESSES mode run in their own process pool as with execute.
         """
+        if self.executor == TestRunExecutor.PROCESSES:
+            return await asyncio.to_thread(self.execute)
 
+        scheduled = await asyncio.to_thread(self._start)
+        try:
+            await self._execute_on_worker_pool(scheduled, worker_pool)
+        except Exception as err:
+            await asyncio.to_thread(self._fail, err)
+            raise
+        return await asyncio.to_thread(self._finish)
+
+    def _start(self) -> List[TestCaseDefDTO]:
+        """Marks the testrun as executing and returns testcases in scheduled order."""
+        with self._running_lock:
+            # e.g. resumed twice: both executions would overwrite the same testrun
+            if self._running.get(self.id, self) is not self:
+                raise TestRunNotResumableError(f"Testrun {self.id} is still executing")
+            self._running[self.id] = self
         self.status = Status.EXECUTING
-        self.persist()
+        self.end_ts = None
+        pending = self._pending_testcase_defs()
         total = len(self.testcase_defs)
-        self.notify(f"Starting testrun with {total} testcase(s)")
-
-        with ThreadPoolExecutor(max_workers=self.max_testrun_threads) as executor:
-            futures: Dict[Future[TestCaseDTO], TestCaseDefDTO] = {}
-            for definition in self.testcase_defs:
-                future = executor.submit(self._execute_single_testcase, definition)
-                futures[future] = definition
-
-            for future in as_completed(futures):
-                result = future.result()
-                with self._lock:
-                    self.results.append(result)
-                    # TODO: persisting after every testcase is O(N²) in serialization work
-                    # for large testsets — throttle to every N completions or a time-based
-                    # interval instead.
-                    self.persist()
+        if self.results:
+            msg = f"Resuming testrun: {len(pending)} of {total} testcase(s) pending"
+            self.notify(msg)
+        else:
+            self.notify(f"Starting testrun with {total} testcase(s)")
+        scheduled = self._schedule_testcases(self._check_preconditions(pending))
+        self.persist()
+        return scheduled
+
+    def _check_preconditions(
+        self, definitions: List[TestCaseDefDTO]
+    ) -> List[TestCaseDefDTO]:
+        """
+        Pre-pass which checks preconditions of all testcases in bulk before dispatch,
+        see PreconditionPrePass. Testcases which fail are completed as ABORTED right
+        away; returns the definitions of testcases to be executed.
+        """
+        if not definitions:
+            return definitions
+        try:
+            backend = self.backend_factory.create(domain_config=self.domain_config)
+            try:
+                prepass = PreconditionPrePass(backend, self.checker, self.notify)
+                passed, aborted = prepass.run(definitions, self.id)
+            finally:
+                backend.close()
+        except Exception as err:
+            msg = f"Skipping precondition pre-pass: {str(err)}"
+            self.notify(msg, importance=Importance.WARNING)
+            return definitions
+
+        for result in aborted:
+            self._collect_result(result, persist_testcase=True)
+        if aborted:
+            self.notify(
+                f"Aborted {len(aborted)} of {len(definitions)} testcase(s) "
+                "due to failed preconditions"
+            )
+        return passed
+
+    def _pending_testcase_defs(self) -> List[TestCaseDefDTO]:
+        """
+        Testcase definitions without a completed result. Results are matched to
+        definitions by testobject, testtype and scenario — a testset may contain the
+        same testcase several times, so matches are counted.
+        """
+        completed = Counter(_testcase_key(result) for result in self.results)
+        pending: List[TestCaseDefDTO] = []
+        for definition in self.testcase_defs:
+            key = _testcase_key(definition)
+            if completed[key] > 0:
+                completed[key] -= 1
+            else:
+                pending.append(definition)
+        return pending
 
+    def _fail(self, err: Exception) -> None:
+        self._unregister()
+        self.status = Status.ERROR
+        self.end_ts = datetime.now()
+        self.notify(f"Testrun failed: {str(err)}", importance=Importance.ERROR)
+        self._finalize_persistence()
+
+    def _finish(self) -> TestRunDTO:
         # testrun result is only OK if all testcases are OK
         if all(result.result == Result.OK for result in self.results):
             self.result = Result.OK
@@ -129,28 +432,222 @@ class TestRun:
         else:
             self.result = Result.NA
 
-        self.status = Status.FINISHED
+        self._unregister()
         self.end_ts = datetime.now()
-        self.notify(f"Testrun finished with result: {self.result.name}")
+        if self._cancellation.cancelled:
+            self.status = Status.ABORTED
+            pending = len(self._pending_testcase_defs())
+            if pending and self.result == Result.OK:
+                self.result = Result.NA
+            msg = f"Testrun cancelled with {pending} testcase(s) not executed"
+            self.notify(msg, importance=Importance.WARNING)
+        else:
+            self.status = Status.FINISHED
+            self.notify(f"Testrun finished with result: {self.result.name}")
 
-        self.persist()
+        self._finalize_persistence()
 
         return self.to_dto()
 
+    def _unregister(self) -> None:
+        with self._running_lock:
+            self._running.pop(self.id, None)
+
+    def _schedule_testcases(
+        self, definitions: List[TestCaseDefDTO]
+    ) -> List[TestCaseDefDTO]:
+        """
+        Orders testcases longest-expected-first, so that long testcases don't end up
+        running alone at the end of the testrun. Order and estimates are recorded
+        in testrun details.
+        """
+        scheduled = TestCaseScheduler(self.dto_storage).schedule(definitions)
+        self.details = [
+            testcase.to_detail(position) for position, testcase in enumerate(scheduled)
+        ]
+        return [testcase.definition for testcase in scheduled]
+
+    def _execute_in_threads(self, definitions: List[TestCaseDefDTO]) -> None:
+        """Executes testcases in worker threads which lease backends from a pool."""
+        self._backend_pool = BackendPool(
+            backend_factory=self.backend_factory,
+            domain_config=self.domain_config,
+            size=self.max_testrun_threads,
+        )
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_testrun_threads) as executor:
+                self._dispatch(
+                    definitions,
+                    submit=lambda d: executor.submit(self._execute_single_testcase, d),
+                )
+        finally:
+            self._backend_pool.close()
+            self._backend_pool = None
+
+    async def _execute_on_worker_pool(
+        self, definitions: List[TestCaseDefDTO], worker_pool: Executor
+    ) -> None:
+        """Executes testcases in a shared worker pool, leasing backends from a pool."""
+        loop = asyncio.get_running_loop()
+        self._backend_pool = BackendPool(
+            backend_factory=self.backend_factory,
+            domain_config=self.domain_config,
+            size=self.max_testrun_threads,
+        )
+        try:
+            await self._dispatch_async(
+                definitions,
+                submit=lambda d: loop.run_in_executor(
+                    worker_pool, self._execute_single_testcase, d
+                ),
+            )
+        finally:
+            await asyncio.to_thread(self._backend_pool.close)
+            self._backend_pool = None
+
+    def _execute_in_processes(self, definitions: List[TestCaseDefDTO]) -> None:
+        """
+        Executes testcases in worker processes. Each process builds its own backend
+        from the (picklable) backend factory. Notifications are streamed back via a
+        queue; final testcase results are returned and persisted by this process.
+        """
+        context = multiprocessing.get_context("spawn")  # fork is unsafe with threads
+        queue = context.Queue()
+        forwarder = NotificationForwarder(queue, self.notifiers)
+        forwarder.start()
+        try:
+            with ProcessPoolExecutor(
+                max_workers=self.max_testrun_threads,
+                mp_context=context,
+                initializer=init_worker,
+                initargs=(
+                    self.backend_factory,
+                    self.domain_config,
+                    queue,
+                    # each process spends its own budgets: hand out equal shares
+                    self.retry_policy.share(self.max_testrun_threads),
+                    self.checker,
+                ),
+            ) as executor:
+                self._dispatch(
+                    definitions,
+                    submit=lambda d: executor.submit(execute_testcase, d, self.id),
+                    persist_testcases=True,
+                )
+        finally:
+            forwarder.stop()
+            queue.close()
+
+    def _concurrency_limiter(self) -> ConcurrencyLimiter:
+        """Global limit is the worker count; platform limit respects the backend."""
+        return ConcurrencyLimiter.for_backend(
+            global_limit=self.max_testrun_threads,
+            backend_factory=self.backend_factory,
+            platform_limit=self.max_concurrency_per_platform,
+            testobject_limit=self.max_concurrency_per_testobject,
+        )
+
+    def _dispatch(
+        self,
+        definitions: List[TestCaseDefDTO],
+        submit: Callable[[TestCaseDefDTO], Future[TestCaseDTO]],
+        persist_testcases: bool = False,
+    ) -> None:
+        """
+        Submits testcases in scheduled order whenever all concurrency limits have a
+        free slot (see ConcurrencyLimiter.dispatch). Results are collected as they
+        complete and progress is persisted.
+        """
+        self._concurrency_limiter().dispatch(
+            definitions,
+            submit,
+            on_result=lambda result: self._collect_result(result, persist_testcases),
+            stopped=lambda: self._cancellation.cancelled,
+        )
+
+    async def _dispatch_async(
+        self,
+        definitions: List[TestCaseDefDTO],
+        submit: Callable[[TestCaseDefDTO], Awaitable[TestCaseDTO]],
+    ) -> None:
+        """Event loop counterpart of _dispatch, see there."""
+        limiter = self._concurrency_limiter()
+        pending = list(definitions)
+        running: Dict[asyncio.Future[TestCaseDTO], TestCaseDefDTO] = {}
+        try:
+            while pending or running:
+                if self._cancellation.cancelled:
+                    pending = []  # start no more testcases, wait for running ones
+                pending = limiter.submit_available(
+                    pending,
+                    running,
+                    lambda definition: asyncio.ensure_future(submit(definition)),
+                )
+                if not running:  # wait for slots freed by other testruns
+                    await asyncio.sleep(limiter.poll_interval_s)
+                    continue
+                done, _ = await asyncio.wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    limiter.release(running.pop(future))
+                    self._collect_result(future.result(), persist_testcase=False)
+        finally:
+            if running:  # testcases in worker threads can't be killed: let them finish
+                await asyncio.wait(running)
+            for definition in running.values():
+                limiter.release(definition)
+
+    def _collect_result(self, result: TestCaseDTO, persist_testcase: bool) -> None:
+        if persist_testcase:
+            self.dto_storage.write_dto(result)
+        if self._cancellation.cancelled and result.status == Status.ABORTED:
+            return  # stopped by cancellation: stays pending, so that resume reruns it
+        with self._lock:
+            self.results.append(result)
+            self.testcase_summaries.append(TestCaseSummaryDTO.from_testcase(result))
+            self._persister.on_progress(self._snapshot)
+
+    def _finalize_persistence(self) -> None:
+        """
+        Persists the final state via the background writer and stops it. The final
+        snapshot supersedes a pending progress snapshot, which is then not written.
+        """
+        try:
+            self._persister.persist_now(self._snapshot())
+        except Exception as err:
+            # the error may stem from a progress snapshot: write the final state
+            # directly, so that it is stored (or the error of storing it surfaces)
+            msg = f"Persisting testrun progress failed: {str(err)}"
+            self.notify(msg, importance=Importance.WARNING)
+            self.persist()
+        finally:
+            self._persister.close()
+
     def _execute_single_testcase(self, definition: TestCaseDefDTO) -> TestCaseDTO:
-        """Execute a single testcase in its own thread with its own backend.
+        """Execute a single testcase with a backend leased from the backend pool.
 
-        The backend is closed after the testcase finishes so that any resources
-        it holds are released promptly instead of waiting for garbage collection.
+        After the testcase, the backend is reset so that no session state leaks into
+        the next testcase which leases it. Backends are closed with the pool.
         """
-        backend = self.backend_factory.create(domain_config=self.domain_config)
-        with backend:
+        if self._backend_pool is None:
+            raise RuntimeError("Testcases can only be executed within execute()")
+        backend = self._backend_pool.acquire()
+        try:
             testcase = TestCaseCreator.create(
                 definition, self.id, backend, self.notifiers, self.dto_storage
             )
-            return testcase.execute()
+            return testcase.execute(
+                checker=self.checker,
+                cancellation=self._cancellation,
+                retry_policy=self.retry_policy,
+            )
+        finally:
+            self._backend_pool.recycle(backend)
 
-    def to_dto(self) -> TestRunDTO:
+    def to_dto(self, compact: bool = False) -> TestRunDTO:
+        """
+        Returns the testrun state as DTO. If compact is True, full testcase results
+        are omitted and only referenced via testcase summaries.
+        """
         return TestRunDTO(
             id=self.id,
             testset_id=self.testset_id,
@@ -158,15 +655,22 @@ class TestRun:
             start_ts=self.start_ts,
             end_ts=self.end_ts,
             result=self.result,
-            results=self.results,
+            results=[] if compact else self.results,
+            testcase_summaries=self.testcase_summaries,
+            details=self.details,
             testdefinitions=self.testcase_defs,
             stage=self.stage,
             instance=self.instance,
             domain=self.domain,
             status=self.status,
             testset_name=self.testset_name,
+            rerun_of=self.rerun_of,
             domain_config=self.domain_config,
         )
 
+    def _snapshot(self) -> TestRunDTO:
+        """State as it is persisted according to the configured storage mode."""
+        return self.to_dto(compact=self.storage_mode == TestRunStorageMode.DELTA)
+
     def persist(self) -> None:
-        self.dto_storage.write_dto(self.to_dto())
+        self.dto_storage.write_dto(self._snapshot())
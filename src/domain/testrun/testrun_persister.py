@@ -0,0 +1,119 @@
+import threading
+import time
+from typing import Callable
+
+from src.dtos import TestRunDTO
+from src.infrastructure_ports import IDtoStorage
+
+
+class TestRunPersister:
+    """
+    Persists TestRunDTO snapshots of a running testrun in a background thread.
+
+    Persistence policy: a snapshot is taken after every `persist_every_n` completed
+    testcases or when `persist_interval_s` seconds have passed since the last snapshot,
+    whichever comes first. Snapshots are handed to a writer thread which coalesces
+    them — if several snapshots are submitted while a write is in flight, only the
+    latest one is written. Final states (finished, error) are written via persist_now,
+    which blocks until the snapshot is stored.
+    """
+
+    __test__ = False  # prevents pytest collection
+
+    def __init__(
+        self,
+        dto_storage: IDtoStorage,
+        persist_every_n: int = 10,
+        persist_interval_s: float = 5.0,
+    ):
+        self.dto_storage = dto_storage
+        self.persist_every_n = max(1, persist_every_n)
+        self.persist_interval_s = persist_interval_s
+        self._condition = threading.Condition()
+        self._pending: TestRunDTO | None = None
+        self._writing: bool = False
+        self._closed: bool = False
+        self._error: Exception | None = None
+        self._thread: threading.Thread | None = None
+        self._completions_since_snapshot: int = 0
+        self._last_snapshot_ts: float = time.monotonic()
+
+    def on_progress(self, make_snapshot: Callable[[], TestRunDTO]) -> bool:
+        """
+        Registers a completed testcase. If the policy says a snapshot is due,
+        make_snapshot is called and its result is submitted for background writing.
+        Returns True if a snapshot was submitted.
+        """
+        self._completions_since_snapshot += 1
+        elapsed = time.monotonic() - self._last_snapshot_ts
+        if (
+            self._completions_since_snapshot < self.persist_every_n
+            and elapsed < self.persist_interval_s
+        ):
+            return False
+
+        self.submit(make_snapshot())
+        return True
+
+    def submit(self, snapshot: TestRunDTO) -> None:
+        """Hands a snapshot to the writer thread, replacing any pending snapshot."""
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Cannot submit snapshots to a closed persister")
+            self._pending = snapshot
+            self._completions_since_snapshot = 0
+            self._last_snapshot_ts = time.monotonic()
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="testrun-persister", daemon=True
+                )
+                self._thread.start()
+            self._condition.notify_all()
+
+    def persist_now(self, snapshot: TestRunDTO) -> None:
+        """Submits a snapshot and blocks until it (or a newer one) is written."""
+        self.submit(snapshot)
+        self.flush()
+
+    def flush(self) -> None:
+        """
+        Blocks until no snapshot is pending or in flight. Re-raises the last error
+        of the writer thread, if any.
+        """
+        with self._condition:
+            while self._pending is not None or self._writing:
+                self._condition.wait()
+            error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def close(self) -> None:
+        """Writes any pending snapshot and stops the writer thread."""
+        try:
+            self.flush()
+        finally:
+            with self._condition:
+                self._closed = True
+                self._condition.notify_all()
+            if self._thread is not None:
+                self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while self._pending is None and not self._closed:
+                    self._condition.wait()
+                if self._pending is None:  # closed and nothing left to write
+                    return
+                snapshot, self._pending = self._pending, None
+                self._writing = True
+
+            try:
+                self.dto_storage.write_dto(snapshot)
+            except Exception as err:
+                with self._condition:
+                    self._error = err
+            finally:
+                with self._condition:
+                    self._writing = False
+                    self._condition.notify_all()
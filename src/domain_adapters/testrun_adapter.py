@@ -1,16 +1,36 @@
-from typing import List, cast
+import asyncio
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Dict, List, cast
+from uuid import UUID
 
+from src.domain.testrun.sharding import ShardedTestRun, ShardWorker
 from src.domain.testrun.testrun import TestRun, TestRunLoader
 from src.domain_ports import (
+    CancelTestRunCommand,
     ExecuteTestRunCommand,
+    IsTestRunRunningCommand,
     ITestRun,
     ListTestRunsCommand,
     LoadTestCaseCommand,
     LoadTestRunCommand,
+    RerunFailuresCommand,
+    ResumeTestRunCommand,
+    RunShardWorkerCommand,
     SaveTestRunCommand,
 )
-from src.dtos import ObjectType, TestCaseDTO, TestRunDTO
-from src.infrastructure_ports import IBackendFactory, IDtoStorage, INotifier
+from src.dtos import (
+    ObjectType,
+    TestCaseDTO,
+    TestRunDTO,
+    TestRunExecutor,
+    TestRunStorageMode,
+)
+from src.infrastructure_ports import (
+    IBackendFactory,
+    IDtoStorage,
+    INotifier,
+    IShardQueue,
+)
 
 
 class TestRunAdapter(ITestRun):
@@ -22,24 +42,162 @@ class TestRunAdapter(ITestRun):
         notifiers: List[INotifier],
         dto_storage: IDtoStorage,
         max_testrun_threads: int = 4,
+        persist_every_n: int = 10,
+        persist_interval_s: float = 5.0,
+        storage_mode: TestRunStorageMode = TestRunStorageMode.FULL,
+        executor: TestRunExecutor = TestRunExecutor.THREADS,
+        max_concurrency_per_platform: int | None = None,
+        max_concurrency_per_testobject: int | None = None,
+        worker_pool: Executor | None = None,
+        shard_queue: IShardQueue | None = None,
+        shard_count: int = 1,
+        shard_timeout_s: float | None = 3600.0,
+        retry_max_attempts: int = 3,
+        retry_budget_per_testrun: int = 20,
+        retry_budget_global_per_minute: int = 100,
     ):
         self.backend_factory: IBackendFactory = backend_factory
         self.notifiers: List[INotifier] = notifiers
         self.dto_storage: IDtoStorage = dto_storage
         self.max_testrun_threads = max_testrun_threads
+        self.persist_every_n = persist_every_n
+        self.persist_interval_s = persist_interval_s
+        self.storage_mode = storage_mode
+        self.executor = executor
+        self.max_concurrency_per_platform = max_concurrency_per_platform
+        self.max_concurrency_per_testobject = max_concurrency_per_testobject
+        # worker pool shared by all async testruns; owned by the caller
+        self.worker_pool = worker_pool
+        # testruns with more than one shard are executed by shard workers
+        self.shard_queue = shard_queue
+        self.shard_count = shard_count
+        self.shard_timeout_s = shard_timeout_s
+        self.retry_max_attempts = retry_max_attempts
+        self.retry_budget_per_testrun = retry_budget_per_testrun
+        self.retry_budget_global_per_minute = retry_budget_global_per_minute
         self.loader = TestRunLoader(dto_storage)
 
     def execute_testrun(self, command: ExecuteTestRunCommand) -> TestRunDTO:
-        testrun = TestRun(
+        return self._create_testrun(command).execute()
+
+    async def execute_testrun_async(self, command: ExecuteTestRunCommand) -> TestRunDTO:
+        return await self._execute_async(self._create_testrun(command))
+
+    def resume_testrun(self, command: ResumeTestRunCommand) -> TestRunDTO:
+        """Resumes an interrupted testrun, executing only pending testcases."""
+        return self._resume_testrun(command).execute()
+
+    async def resume_testrun_async(self, command: ResumeTestRunCommand) -> TestRunDTO:
+        testrun = await asyncio.to_thread(self._resume_testrun, command)
+        return await self._execute_async(testrun)
+
+    def rerun_failures(self, command: RerunFailuresCommand) -> TestRunDTO:
+        """Executes a new testrun of the failed testcases of a previous testrun."""
+        return self._rerun_failures(command).execute()
+
+    async def rerun_failures_async(self, command: RerunFailuresCommand) -> TestRunDTO:
+        testrun = await asyncio.to_thread(self._rerun_failures, command)
+        return await self._execute_async(testrun)
+
+    def cancel_testrun(self, command: CancelTestRunCommand) -> bool:
+        """Cancels a testrun which is executing in this process."""
+        try:
+            testrun_id = UUID(command.testrun_id)
+        except ValueError:
+            return False
+        return TestRun.cancel_running(testrun_id)
+
+    def is_testrun_running(self, command: IsTestRunRunningCommand) -> bool:
+        """True if the testrun is executing in this process."""
+        try:
+            testrun_id = UUID(command.testrun_id)
+        except ValueError:
+            return False
+        return TestRun.is_running(testrun_id)
+
+    def run_shard_worker(self, command: RunShardWorkerCommand) -> int:
+        """Executes testrun shards from the shard queue on this node."""
+        if self.shard_queue is None:
+            raise ValueError("Running a shard worker requires a shard queue")
+        worker = ShardWorker(
+            shard_queue=self.shard_queue,
+            backend_factory=self.backend_factory,
+            notifiers=self.notifiers,
+            dto_storage=self.dto_storage,
+            max_threads=self.max_testrun_threads,
+            max_concurrency_per_platform=self.max_concurrency_per_platform,
+            max_concurrency_per_testobject=self.max_concurrency_per_testobject,
+            retry_max_attempts=self.retry_max_attempts,
+            retry_budget_per_testrun=self.retry_budget_per_testrun,
+            retry_budget_global_per_minute=self.retry_budget_global_per_minute,
+        )
+        return worker.run(idle_timeout_s=command.idle_timeout_s)
+
+    async def _execute_async(self, testrun: TestRun) -> TestRunDTO:
+        if self.worker_pool is not None:
+            return await testrun.execute_async(self.worker_pool)
+
+        # no shared worker pool configured: use a private one for this testrun
+        with ThreadPoolExecutor(max_workers=self.max_testrun_threads) as worker_pool:
+            return await testrun.execute_async(worker_pool)
+
+    def _create_testrun(self, command: ExecuteTestRunCommand) -> TestRun:
+        return self._testrun_class()(
             testrun_def=command.testrun_def,
             backend_factory=self.backend_factory,
             notifiers=self.notifiers,
             dto_storage=self.dto_storage,
-            max_testrun_threads=self.max_testrun_threads,
             testrun_id=command.testrun_id,
+            **self._testrun_options(),
+        )
+
+    def _resume_testrun(self, command: ResumeTestRunCommand) -> TestRun:
+        previous = self.loader.load_testrun(command.testrun_id, hydrate=True)
+        return self._testrun_class().resume(
+            previous,
+            backend_factory=self.backend_factory,
+            notifiers=self.notifiers,
+            dto_storage=self.dto_storage,
+            **self._testrun_options(),
+        )
+
+    def _rerun_failures(self, command: RerunFailuresCommand) -> TestRun:
+        previous = self.loader.load_testrun(command.testrun_id, hydrate=True)
+        return self._testrun_class().rerun_failures(
+            previous,
+            backend_factory=self.backend_factory,
+            notifiers=self.notifiers,
+            dto_storage=self.dto_storage,
+            testrun_id=command.new_testrun_id,
+            **self._testrun_options(),
         )
 
-        return testrun.execute()
+    def _sharded(self) -> bool:
+        return self.shard_queue is not None and self.shard_count > 1
+
+    def _testrun_class(self) -> type[TestRun]:
+        return ShardedTestRun if self._sharded() else TestRun
+
+    def _testrun_options(self) -> Dict[str, Any]:
+        options: Dict[str, Any] = dict(
+            max_testrun_threads=self.max_testrun_threads,
+            persist_every_n=self.persist_every_n,
+            persist_interval_s=self.persist_interval_s,
+            storage_mode=self.storage_mode,
+            executor=self.executor,
+            max_concurrency_per_platform=self.max_concurrency_per_platform,
+            max_concurrency_per_testobject=self.max_concurrency_per_testobject,
+            retry_max_attempts=self.retry_max_attempts,
+            retry_budget_per_testrun=self.retry_budget_per_testrun,
+            retry_budget_global_per_minute=self.retry_budget_global_per_minute,
+        )
+        if self._sharded():
+            options.update(
+                shard_queue=self.shard_queue,
+                shard_count=self.shard_count,
+                shard_timeout_s=self.shard_timeout_s,
+            )
+        return options
 
     def save_testrun(self, command: SaveTestRunCommand) -> None:
         """Saves a testrun, e.g. to disk"""
@@ -47,11 +205,13 @@ class TestRunAdapter(ITestRun):
 
     def load_testrun(self, command: LoadTestRunCommand) -> TestRunDTO:
         """Loads a testrun, e.g. from disk"""
-        return self.loader.load_testrun(command.testrun_id)
+        return self.loader.load_testrun(command.testrun_id, hydrate=command.hydrate)
 
     def list_testruns(self, command: ListTestRunsCommand) -> List[TestRunDTO]:
         """Lists testruns by domain and optionally date."""
-        return self.loader.list_testruns(domain=command.domain, date=command.date)
+        return self.loader.list_testruns(
+            domain=command.domain, date=command.date, hydrate=command.hydrate
+        )
 
     def load_testcase(self, command: LoadTestCaseCommand) -> TestCaseDTO:
         """Loads a persisted testcase by ID."""
@@ -12,11 +12,16 @@ from .i_report import (
 )
 from .i_specification import FindSpecsCommand, ISpec
 from .i_testrun import (
+    CancelTestRunCommand,
+    IsTestRunRunningCommand,
     ExecuteTestRunCommand,
     ITestRun,
     ListTestRunsCommand,
     LoadTestCaseCommand,
     LoadTestRunCommand,
+    RerunFailuresCommand,
+    ResumeTestRunCommand,
+    RunShardWorkerCommand,
     SaveTestRunCommand,
 )
 from .i_testset import (
@@ -41,6 +46,11 @@ __all__ = [
     "ExecuteTestRunCommand",
     "SaveTestRunCommand",
     "LoadTestRunCommand",
+    "ResumeTestRunCommand",
+    "CancelTestRunCommand",
+    "IsTestRunRunningCommand",
+    "RunShardWorkerCommand",
+    "RerunFailuresCommand",
     "LoadTestCaseCommand",
     "ListTestRunsCommand",
     "ITestSet",
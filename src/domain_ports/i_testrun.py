@@ -12,12 +12,34 @@ class ExecuteTestRunCommand(DTO):
     testrun_id: UUID4 | None = None  # pre-assigned by caller (e.g. HTTP router)
 
 
+class ResumeTestRunCommand(DTO):
+    testrun_id: str
+
+
+class RerunFailuresCommand(DTO):
+    testrun_id: str  # testrun whose failed testcases are rerun
+    new_testrun_id: UUID4 | None = None  # pre-assigned by caller (e.g. HTTP router)
+
+
+class CancelTestRunCommand(DTO):
+    testrun_id: str
+
+
+class IsTestRunRunningCommand(DTO):
+    testrun_id: str
+
+
+class RunShardWorkerCommand(DTO):
+    idle_timeout_s: float | None = None  # stop once no shard arrived for this long
+
+
 class SaveTestRunCommand(DTO):
     testrun: TestRunDTO
 
 
 class LoadTestRunCommand(DTO):
     testrun_id: str
+    hydrate: bool = False  # load full testcase results of DELTA-stored testruns
 
 
 class LoadTestCaseCommand(DTO):
@@ -27,6 +49,7 @@ class LoadTestCaseCommand(DTO):
 class ListTestRunsCommand(DTO):
     domain: str
     date: Optional[str] = None
+    hydrate: bool = False  # load full testcase results of DELTA-stored testruns
 
 
 class ITestRun(ABC):
@@ -36,6 +59,38 @@ class ITestRun(ABC):
     def execute_testrun(self, command: ExecuteTestRunCommand) -> TestRunDTO:
         """Execute testcases."""
 
+    @abstractmethod
+    async def execute_testrun_async(self, command: ExecuteTestRunCommand) -> TestRunDTO:
+        """Execute testcases from an event loop, sharing one bounded worker pool."""
+
+    @abstractmethod
+    def resume_testrun(self, command: ResumeTestRunCommand) -> TestRunDTO:
+        """Resume an interrupted testrun, executing only testcases not completed yet."""
+
+    @abstractmethod
+    async def resume_testrun_async(self, command: ResumeTestRunCommand) -> TestRunDTO:
+        """Resume an interrupted testrun from an event loop, see resume_testrun."""
+
+    @abstractmethod
+    def rerun_failures(self, command: RerunFailuresCommand) -> TestRunDTO:
+        """Execute a new testrun of the NOK and NA testcases of a previous testrun."""
+
+    @abstractmethod
+    async def rerun_failures_async(self, command: RerunFailuresCommand) -> TestRunDTO:
+        """Rerun failed testcases from an event loop, see rerun_failures."""
+
+    @abstractmethod
+    def cancel_testrun(self, command: CancelTestRunCommand) -> bool:
+        """Cancel a running testrun; False if it doesn't run in this process."""
+
+    @abstractmethod
+    def is_testrun_running(self, command: IsTestRunRunningCommand) -> bool:
+        """True if the testrun is executing in this process."""
+
+    @abstractmethod
+    def run_shard_worker(self, command: RunShardWorkerCommand) -> int:
+        """Execute shards of sharded testruns, returns the number of executed shards."""
+
     @abstractmethod
     def save_testrun(self, command: SaveTestRunCommand) -> None:
         """Save testrun results."""
@@ -2,11 +2,16 @@ from typing import List, Optional
 from uuid import UUID
 
 from src.domain_ports import (
+    CancelTestRunCommand,
     ExecuteTestRunCommand,
+    IsTestRunRunningCommand,
     ITestRun,
     ListTestRunsCommand,
     LoadTestCaseCommand,
     LoadTestRunCommand,
+    RerunFailuresCommand,
+    ResumeTestRunCommand,
+    RunShardWorkerCommand,
     SaveTestRunCommand,
 )
 from src.dtos import TestCaseDTO, TestRunDTO
@@ -28,19 +33,73 @@ class TestRunDriver:
         command = ExecuteTestRunCommand(testrun_def=testrun_def, testrun_id=testrun_id)
         return self.adapter.execute_testrun(command=command)
 
+    async def execute_testrun_async(
+        self,
+        testrun_def: TestRunDefDTO,
+        testrun_id: UUID | None = None,
+    ) -> TestRunDTO:
+        """Executes a testrun from an event loop and returns the result."""
+        command = ExecuteTestRunCommand(testrun_def=testrun_def, testrun_id=testrun_id)
+        return await self.adapter.execute_testrun_async(command=command)
+
+    def resume_testrun(self, testrun_id: str) -> TestRunDTO:
+        """Resumes an interrupted testrun, executing only pending testcases."""
+        command = ResumeTestRunCommand(testrun_id=testrun_id)
+        return self.adapter.resume_testrun(command=command)
+
+    async def resume_testrun_async(self, testrun_id: str) -> TestRunDTO:
+        """Resumes an interrupted testrun from an event loop."""
+        command = ResumeTestRunCommand(testrun_id=testrun_id)
+        return await self.adapter.resume_testrun_async(command=command)
+
+    def rerun_failures(
+        self, testrun_id: str, new_testrun_id: UUID | None = None
+    ) -> TestRunDTO:
+        """Executes a new testrun of the NOK and NA testcases of a previous testrun."""
+        command = RerunFailuresCommand(
+            testrun_id=testrun_id, new_testrun_id=new_testrun_id
+        )
+        return self.adapter.rerun_failures(command=command)
+
+    async def rerun_failures_async(
+        self, testrun_id: str, new_testrun_id: UUID | None = None
+    ) -> TestRunDTO:
+        """Reruns failed testcases of a previous testrun from an event loop."""
+        command = RerunFailuresCommand(
+            testrun_id=testrun_id, new_testrun_id=new_testrun_id
+        )
+        return await self.adapter.rerun_failures_async(command=command)
+
+    def cancel_testrun(self, testrun_id: str) -> bool:
+        """Cancels a running testrun, returns False if it is not running."""
+        command = CancelTestRunCommand(testrun_id=testrun_id)
+        return self.adapter.cancel_testrun(command=command)
+
+    def is_testrun_running(self, testrun_id: str) -> bool:
+        """True if the testrun is executing in this process."""
+        command = IsTestRunRunningCommand(testrun_id=testrun_id)
+        return self.adapter.is_testrun_running(command=command)
+
+    def run_shard_worker(self, idle_timeout_s: float | None = None) -> int:
+        """Executes shards of sharded testruns until idle for idle_timeout_s."""
+        command = RunShardWorkerCommand(idle_timeout_s=idle_timeout_s)
+        return self.adapter.run_shard_worker(command=command)
+
     def save_testrun(self, testrun: TestRunDTO) -> None:
         """Saves a testrun."""
         command = SaveTestRunCommand(testrun=testrun)
         self.adapter.save_testrun(command=command)
 
-    def load_testrun(self, testrun_id: str) -> TestRunDTO:
-        """Loads a testrun by ID."""
-        command = LoadTestRunCommand(testrun_id=testrun_id)
+    def load_testrun(self, testrun_id: str, hydrate: bool = False) -> TestRunDTO:
+        """Loads a testrun by ID, optionally with full testcase results."""
+        command = LoadTestRunCommand(testrun_id=testrun_id, hydrate=hydrate)
         return self.adapter.load_testrun(command=command)
 
-    def list_testruns(self, domain: str, date: Optional[str] = None) -> List[TestRunDTO]:
+    def list_testruns(
+        self, domain: str, date: Optional[str] = None, hydrate: bool = False
+    ) -> List[TestRunDTO]:
         """Lists testruns by domain and optionally by date."""
-        command = ListTestRunsCommand(domain=domain, date=date)
+        command = ListTestRunsCommand(domain=domain, date=date, hydrate=hydrate)
         return self.adapter.list_testruns(command=command)
 
     def load_testcase(self, testcase_id: UUID) -> TestCaseDTO:
@@ -1,7 +1,9 @@
 # flake8: noqa
 from .dto import DTO
 from .domain_config_dtos import (
+    CompareMode,
     DomainConfigDTO,
+    SampleStrategy,
 )
 from .specification_dtos import (
     AnySpec,
@@ -23,8 +25,13 @@ from .testrun_dtos import (
     TestRunDefDTO,
     SpecEntryDTO,
     TestCaseDTO,
+    TestCaseSummaryDTO,
+    TestRunStorageMode,
+    TestRunExecutor,
     TestRunSummaryDTO,
     TestRunDTO,
+    TestRunShardDTO,
+    ShardResultDTO,
 )
 from .report_dtos import (
     ReportArtifactFormat,
@@ -1,3 +1,4 @@
+from enum import Enum
 from typing import Dict, List
 
 from pydantic import Field
@@ -6,6 +7,22 @@ from src.dtos.dto import DTO
 from src.dtos.storage_dtos import LocationDTO
 
 
+class CompareMode(Enum):
+    """Controls how compare testcases compare test sql and testobject."""
+
+    SAMPLE = "SAMPLE"  # compare rows of a random sample of primary keys
+    RECONCILE = "RECONCILE"  # compare all rows via hierarchical hash buckets
+    PUSHDOWN = "PUSHDOWN"  # compare all rows in the database, load differing rows
+
+
+class SampleStrategy(Enum):
+    """Controls how compare testcases sample primary keys from the test sql."""
+
+    RESERVOIR = "RESERVOIR"  # uniform sample in a single pass over all keys
+    HASH = "HASH"  # keys whose seeded hash passes a modulo filter
+    STRATIFIED = "STRATIFIED"  # equal number of keys per value of a column
+
+
 class DomainConfigDTO(DTO):
     """Configuration for a single domain's test execution."""
 
@@ -18,16 +35,51 @@ class DomainConfigDTO(DTO):
     sample_size_default: int
     # per-object overrides for sample size, keyed by testobject name
     sample_size_per_object: Dict[str, int] = Field(default_factory=dict)
+    # compare mode of compare test cases, per-object overrides keyed by testobject name
+    compare_mode_default: CompareMode = CompareMode.SAMPLE
+    compare_mode_per_object: Dict[str, CompareMode] = Field(default_factory=dict)
+    # key sampling strategy, per-object overrides keyed by testobject name. Stratified
+    # sampling needs the column to stratify by, keyed by testobject name
+    sample_strategy_default: SampleStrategy = SampleStrategy.RESERVOIR
+    sample_strategy_per_object: Dict[str, SampleStrategy] = Field(default_factory=dict)
+    sample_stratify_by_per_object: Dict[str, str] = Field(default_factory=dict)
+    # seed for key sampling to reproduce samples of a previous testrun, None means
+    # a new random seed per testcase
+    sample_seed: int | None = None
     # stage → list of spec location path strings (e.g. {"test": ["local:///path/"]})
     spec_locations: Dict[str, List[str]]
     # storage location where test reports are written
     reports_location: LocationDTO
+    # testcase deadline in seconds, None means no deadline. Per-object overrides
+    # (keyed by testobject name) take precedence over per-testtype overrides (keyed
+    # by TestType value, e.g. "COMPARE"), which take precedence over the default
+    testcase_timeout_s_default: float | None = None
+    testcase_timeout_s_per_testtype: Dict[str, float] = Field(default_factory=dict)
+    testcase_timeout_s_per_object: Dict[str, float] = Field(default_factory=dict)
 
     @property
     def id(self) -> str:
         """Object ID for storage purposes."""
         return self.domain
 
+    def testcase_timeout_s(self, testobject: str, testtype: str) -> float | None:
+        """Return the deadline in seconds for a testcase, None if it has none."""
+        if testobject in self.testcase_timeout_s_per_object:
+            return self.testcase_timeout_s_per_object[testobject]
+        if testtype in self.testcase_timeout_s_per_testtype:
+            return self.testcase_timeout_s_per_testtype[testtype]
+        return self.testcase_timeout_s_default
+
+    def compare_mode(self, testobject: str) -> CompareMode:
+        """Return the compare mode for compare testcases of a testobject."""
+        return self.compare_mode_per_object.get(testobject, self.compare_mode_default)
+
+    def sample_strategy(self, testobject: str) -> SampleStrategy:
+        """Return the key sampling strategy for compare testcases of a testobject."""
+        return self.sample_strategy_per_object.get(
+            testobject, self.sample_strategy_default
+        )
+
     def spec_locations_by_stage(self, stage: str) -> List[LocationDTO]:
         """Return spec LocationDTOs for the given stage.
 
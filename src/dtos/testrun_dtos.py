@@ -95,6 +95,7 @@ class TestRunDefDTO(DTO):
     labels: List[str] = Field(default=[])
     testset_id: UUID4 | None = None
     testset_name: str | None = None
+    rerun_of: UUID4 | None = None  # testrun whose failed testcases are rerun
 
     @classmethod
     def from_testset(
@@ -148,6 +149,21 @@ class TestRunDefDTO(DTO):
             testset_name=testset.name,
         )
 
+    @classmethod
+    def from_testrun(cls, testrun: TestRunDTO) -> Self:
+        """Recreates the definition a (possibly interrupted) testrun was started from."""
+        return cls(
+            testcase_defs=testrun.testdefinitions,
+            domain=testrun.domain,
+            stage=testrun.stage,
+            instance=testrun.instance,
+            domain_config=testrun.domain_config,
+            labels=testrun.labels,
+            testset_id=testrun.testset_id,
+            testset_name=testrun.testset_name,
+            rerun_of=testrun.rerun_of,
+        )
+
 
 class SpecEntryDTO(DTO):
     """Slim spec entry for UI discovery: specs per testobject/testtype/scenario.
@@ -192,6 +208,22 @@ class TestRunSummaryDTO(DTO):
     na_testcases: int = 0
 
 
+class TestRunStorageMode(Enum):
+    """Controls how testcase results are stored within a persisted testrun."""
+
+    __test__ = False  # prevents pytest collection
+    FULL = "FULL"  # testrun embeds full TestCaseDTOs in results
+    DELTA = "DELTA"  # testrun references separately persisted TestCaseDTOs
+
+
+class TestRunExecutor(Enum):
+    """Controls how testcases of a testrun are executed in parallel."""
+
+    __test__ = False  # prevents pytest collection
+    THREADS = "THREADS"  # worker threads, backends pooled per thread
+    PROCESSES = "PROCESSES"  # worker processes, one backend per process
+
+
 class TestCaseDTO(TestDTO):
     __test__ = False  # prevents pytest collection
     id: UUID4 = Field(default_factory=uuid4)
@@ -206,21 +238,78 @@ class TestCaseDTO(TestDTO):
     specs: List[AnySpec]
 
 
+class TestCaseSummaryDTO(DTO):
+    """Compact reference to a separately persisted TestCaseDTO."""
+
+    __test__ = False  # prevents pytest collection
+    id: UUID4
+    testobject: TestObjectDTO
+    testtype: TestType
+    scenario: str | None = Field(default=None)
+    result: Result
+    status: Status
+    start_ts: datetime
+    end_ts: datetime | None = None
+
+    @classmethod
+    def from_testcase(cls, testcase: TestCaseDTO) -> Self:
+        return cls(
+            id=testcase.id,
+            testobject=testcase.testobject,
+            testtype=testcase.testtype,
+            scenario=testcase.scenario,
+            result=testcase.result,
+            status=testcase.status,
+            start_ts=testcase.start_ts,
+            end_ts=testcase.end_ts,
+        )
+
+
 class TestRunDTO(TestDTO):
     __test__ = False  # prevents pytest collection
     id: UUID4 = Field(default_factory=uuid4)
     testdefinitions: List[TestCaseDefDTO] = Field(default=[])
+    # full testcase results -- empty for testruns stored in DELTA mode until hydrated
     results: List[TestCaseDTO] = Field(default=[])
+    # compact per-testcase summaries, always populated for completed testcases
+    testcase_summaries: List[TestCaseSummaryDTO] = Field(default=[])
+    # testrun whose failed testcases were rerun in this testrun
+    rerun_of: UUID4 | None = Field(default=None)
+    # execution details, e.g. scheduled testcase order and duration estimates
+    details: List[Dict[str, Union[str, int, float]]] = Field(default=[])
     summary: TestRunSummaryDTO = Field(default_factory=TestRunSummaryDTO)
 
     @model_validator(mode="after")
     def _compute_summary(self) -> Self:
-        total = len(self.testdefinitions) if self.testdefinitions else len(self.results)
+        completed = self.testcase_summaries or self.results
+        total = len(self.testdefinitions) if self.testdefinitions else len(completed)
         self.summary = TestRunSummaryDTO(
             total_testcases=total,
-            completed_testcases=len(self.results),
-            ok_testcases=sum(1 for tc in self.results if tc.result == Result.OK),
-            nok_testcases=sum(1 for tc in self.results if tc.result == Result.NOK),
-            na_testcases=sum(1 for tc in self.results if tc.result == Result.NA),
+            completed_testcases=len(completed),
+            ok_testcases=sum(1 for tc in completed if tc.result == Result.OK),
+            nok_testcases=sum(1 for tc in completed if tc.result == Result.NOK),
+            na_testcases=sum(1 for tc in completed if tc.result == Result.NA),
         )
         return self
+
+
+class TestRunShardDTO(DTO):
+    """Part of the testcases of a testrun, handed to a worker node via a shard queue."""
+
+    __test__ = False  # prevents pytest collection
+    id: UUID4 = Field(default_factory=uuid4)
+    testrun_id: UUID4
+    index: int
+    shard_count: int
+    testcase_defs: List[TestCaseDefDTO]
+
+
+class ShardResultDTO(DTO):
+    """Completion record of a shard, referencing the testcases persisted by the worker."""
+
+    shard_id: UUID4
+    testrun_id: UUID4
+    index: int
+    worker: str
+    testcase_ids: List[UUID4] = Field(default=[])
+    error: str | None = None  # set if the worker failed to execute the shard
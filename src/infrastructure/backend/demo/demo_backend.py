@@ -1,7 +1,7 @@
 from __future__ import annotations
 
+import codecs
 import csv
-from random import randint
 from typing import Dict, List, Optional, Tuple
 
 import duckdb
@@ -12,15 +12,18 @@ from src.dtos import (
     DBInstanceDTO,
     DomainConfigDTO,
     LocationDTO,
+    SampleStrategy,
     SchemaSpecDTO,
     SpecType,
     TestObjectDTO,
 )
 from src.infrastructure.demo_latency import randomly_slow_class
-from src.infrastructure_ports import BackendError, IBackend
+from src.infrastructure_ports import BackendError, IBackend, TransientBackendError
 
+from .demo_line_counter import LineCounter
 from .demo_naming_resolver import DemoNamingResolver, TestobjectType
 from .demo_query_handler import DemoQueryHandler
+from .demo_rowcount_cache import RowcountCache, RowcountKey
 
 
 class DemoBackendError(BackendError):
@@ -44,10 +47,11 @@ class DemoBackend(IBackend):
     of database, a QueryHandler must be provided.
     """
 
-    supports_db_comparison = False
+    supports_db_comparison = True
     supports_clustering = False
     supports_partitions = False
     supports_primary_keys = False
+    preferred_concurrency = None  # local DuckDB files: no query throttling
 
     def __init__(
         self,
@@ -56,6 +60,8 @@ class DemoBackend(IBackend):
         domain_config: DomainConfigDTO,
         naming_resolver: DemoNamingResolver,
         query_handler: DemoQueryHandler,
+        rowcount_cache: Optional[RowcountCache] = None,
+        con: Optional[duckdb.DuckDBPyConnection] = None,
     ):
         """
         Initialize backend.
@@ -70,11 +76,17 @@ class DemoBackend(IBackend):
             naming_resolver: resolver object which translates between business naming
                 conventions for testobjects and technical coordinates
             query_handler: translates user-provided SQL queries to required stage/instance
-
-        Each instance owns a fresh DuckDB connection with all .db files attached
-        READ_ONLY. The connection is private to this backend instance — no
-        sharing across threads, no cursors of a parent connection — so concurrent
-        testcases cannot deadlock on DuckDB's writer lock.
+            rowcount_cache: optional persistent cache of file rowcounts, so that
+                unchanged files are not counted again
+            con: optional connection to a database which has all .db files in
+                db_path attached already, e.g. a cursor of a shared database. The
+                backend owns it and closes it on close().
+
+        Without con, each instance owns a fresh DuckDB database with all .db files
+        attached READ_ONLY. Either way the connection is private to this backend
+        instance — temp tables and registered relations are connection-local and
+        attached files are read-only — so concurrent testcases cannot deadlock on
+        DuckDB's writer lock.
         """
 
         self.files_path: str = files_path
@@ -83,16 +95,29 @@ class DemoBackend(IBackend):
         self.naming_resolver: DemoNamingResolver = naming_resolver
         self.query_handler: DemoQueryHandler = query_handler
         self.fs: LocalFileSystem = LocalFileSystem()
-        self.con: duckdb.DuckDBPyConnection = duckdb.connect()
-        attach_sql = self._build_attach_statement()
+        self.line_counter = LineCounter(self.fs)
+        self.rowcount_cache: Optional[RowcountCache] = rowcount_cache
+        # values registered as relations on the connection, by relation name
+        self._registered: Dict[str, List] = {}
+        if con is None:
+            con = self.connect_database(db_path)
+        self.con: duckdb.DuckDBPyConnection = con
+
+    @classmethod
+    def connect_database(cls, db_path: str) -> duckdb.DuckDBPyConnection:
+        """Open a new in-memory DuckDB database with all .db files in db_path attached."""
+        con = duckdb.connect()
+        attach_sql = cls._build_attach_statement(LocalFileSystem(), db_path)
         if attach_sql:
-            self.con.execute(attach_sql)
+            con.execute(attach_sql)
+        return con
 
-    def _build_attach_statement(self) -> str:
+    @staticmethod
+    def _build_attach_statement(fs: LocalFileSystem, db_path: str) -> str:
         """Build the SQL to ATTACH all .db files in db_path as READ_ONLY."""
         statement = ""
         db_files: List[str] = [
-            f for f in self.fs.ls(path=self.db_path, detail=False) if f.endswith(".db")
+            f for f in fs.ls(path=db_path, detail=False) if f.endswith(".db")
         ]
         for db_file in db_files:
             db_name: str = db_file.split(sep="/")[-1].removesuffix(".db")
@@ -113,6 +138,47 @@ class DemoBackend(IBackend):
         except Exception:
             pass
 
+    def reset(self) -> None:
+        """
+        Drop all connection-local temp tables (e.g. __query__) and registered
+        relations (e.g. __sample_keys__).
+        """
+        temp_tables = self.con.execute(
+            "SELECT table_name FROM duckdb_tables() WHERE temporary"
+        ).fetchall()
+        for (table_name,) in temp_tables:
+            self.con.execute(f'DROP TABLE IF EXISTS temp."{table_name}"')
+        for name in self._registered:
+            self.con.unregister(name)
+        self._registered = {}
+
+    def is_healthy(self) -> bool:
+        """Backend is healthy if its DuckDB connection still answers queries."""
+        try:
+            return self.con.execute("SELECT 1").fetchone() == (1,)
+        except Exception:
+            return False
+
+    def _query(self, query: str) -> pl.DataFrame:
+        try:
+            return self.con.query(query).pl()
+        except duckdb.IOException as err:
+            # e.g. files which are temporarily locked or unreachable
+            raise TransientBackendError(str(err)) from err
+
+    def _execute(self, statement: str) -> None:
+        try:
+            self.con.execute(statement)
+        except duckdb.IOException as err:
+            raise TransientBackendError(str(err)) from err
+
+    def interrupt(self) -> None:
+        """Abort the running DuckDB query; the connection stays usable."""
+        try:
+            self.con.interrupt()
+        except Exception:
+            pass
+
     def list_testobjects(self, db: DBInstanceDTO) -> List[TestObjectDTO]:
         """
         Gets both file-like testobjects (e.g. file directories in raw layer)
@@ -141,7 +207,7 @@ class DemoBackend(IBackend):
             WHERE table_catalog = '{coords.catalog}'
             AND table_schema = '{coords.schema}'
         """
-        tables_df = self.con.query(query=query).pl()
+        tables_df = self._query(query)
         tables: List[str] = tables_df.to_dict(as_series=False)["table_name"]
         db_testobjects = [
             TestObjectDTO(name=n, domain=domain, stage=stage, instance=instance)
@@ -172,6 +238,38 @@ class DemoBackend(IBackend):
 
         return count
 
+    def testobject_has_rows(self, testobject: TestObjectDTO) -> bool:
+        """
+        Probes for a first row instead of counting: LIMIT 1 for tables, the first
+        data line of any file for file-like testobjects.
+        """
+        return self.testobjects_have_rows([testobject])[0]
+
+    def testobjects_have_rows(self, testobjects: List[TestObjectDTO]) -> List[bool]:
+        """
+        Probes all database testobjects in one UNION ALL query; file testobjects are
+        probed one by one.
+        """
+        has_rows: Dict[int, bool] = {}
+        selects: List[str] = []
+        for index, testobject in enumerate(testobjects):
+            object_type = self.naming_resolver.get_testobject_type(testobject=testobject)
+            if object_type == TestobjectType.FILE:
+                has_rows[index] = self._file_testobject_has_rows(testobject)
+                continue
+            coords = self.naming_resolver.testobject_to_db_coordinates(testobject)
+            selects.append(
+                f"SELECT {index} AS __index__, EXISTS (SELECT 1 "
+                f"FROM {coords.catalog}.{coords.schema}.{coords.table}) AS __has_rows__"
+            )
+
+        if selects:
+            has_rows_df = self._query("\nUNION ALL\n".join(selects))
+            for index, exists in has_rows_df.iter_rows():
+                has_rows[index] = exists
+
+        return [has_rows[index] for index in range(len(testobjects))]
+
     def _get_db_rowcount(
         self,
         testobject: TestObjectDTO,
@@ -193,7 +291,7 @@ class DemoBackend(IBackend):
             FROM {coords.catalog}.{coords.schema}.{coords.table}
             {where_clause}
         """
-        count_df = self.con.query(query).pl()
+        count_df = self._query(query)
         count_dict: Dict[str, List[int]] = count_df.to_dict(as_series=False)
         count: int = count_dict["__cnt__"][0]
 
@@ -206,7 +304,7 @@ class DemoBackend(IBackend):
         encoding: Optional[str] = None,
         skip_lines: Optional[int] = None,
     ) -> int:
-        """Get rowcount of a file-like testobject by streaming lines.
+        """Get rowcount of a file-like testobject by counting line breaks in chunks.
 
         Expects a ('filepath', '=<full_path>') entry in filters
         to identify the exact file to count.
@@ -225,28 +323,92 @@ class DemoBackend(IBackend):
         if not self.fs.exists(filepath):
             raise DemoBackendError(f"File not found: {filepath}")
 
-        file_encoding: str = encoding or self._infer_encoding(filepath)
+        # requested encoding and skip lines are part of the key, not inferred ones:
+        # inference gives the same result as long as the file is unchanged
+        cache_key: Optional[RowcountKey] = None
+        if self.rowcount_cache is not None:
+            cache_key = self._rowcount_cache_key(filepath, encoding, skip_lines)
+            cached: Optional[int] = self.rowcount_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        head: bytes = self.line_counter.read_head(filepath)
+        file_encoding: str = encoding or self._infer_encoding(filepath, head)
         file_skip: int = (
             skip_lines
             if skip_lines is not None
-            else self._infer_skip_lines(filepath, file_encoding)
+            else self._infer_skip_lines(head, file_encoding)
+        )
+
+        line_count: int = self.line_counter.count_lines(filepath, file_encoding, head)
+        count: int = max(0, line_count - file_skip)
+
+        if self.rowcount_cache is not None and cache_key is not None:
+            self.rowcount_cache.put(cache_key, count)
+        return count
+
+    def _rowcount_cache_key(
+        self, filepath: str, encoding: Optional[str], skip_lines: Optional[int]
+    ) -> RowcountKey:
+        """
+        Rowcount cache key of a file: its size and version, which is the etag of
+        object stores or else the modification time.
+        """
+        info: Dict = self.fs.info(filepath)
+        version = info.get("etag") or info.get("mtime") or info.get("created")
+        return (
+            filepath,
+            int(info["size"]),
+            str(version),
+            encoding or "",
+            -1 if skip_lines is None else skip_lines,
         )
 
-        line_count: int = 0
-        with self.fs.open(filepath, mode="r", encoding=file_encoding) as fh:
-            for _ in fh:
-                line_count += 1
+    def _file_testobject_has_rows(self, testobject: TestObjectDTO) -> bool:
+        """True as soon as any file of the testobject has a line after its header."""
+        folder: str = testobject.name.removeprefix("raw_").removeprefix("export_")
+        dirpath = "/".join(
+            [
+                self.files_path,
+                testobject.domain,
+                testobject.stage,
+                testobject.instance,
+                folder,
+            ]
+        )
+        if not self.fs.isdir(dirpath):
+            raise DemoBackendError(f"Directory not found: {dirpath}")
 
-        return max(0, line_count - file_skip)
+        for filepath in sorted(self.fs.ls(path=dirpath, detail=False)):
+            if self.fs.isdir(filepath):
+                continue
+            head: bytes = self.line_counter.read_head(filepath)
+            file_encoding: str = self._infer_encoding(filepath, head)
+            file_skip: int = self._infer_skip_lines(head, file_encoding)
+            if self.line_counter.count_lines_in(head, file_encoding, head) > file_skip:
+                return True
+            # lines of the first chunk are only header lines: count all lines
+            if len(head) == self.line_counter.head_size:
+                line_count = self.line_counter.count_lines(filepath, file_encoding, head)
+                if line_count > file_skip:
+                    return True
+        return False
 
-    def _infer_encoding(self, filepath: str) -> str:
-        """Infer encoding by trying common encodings on a small sample."""
+    @staticmethod
+    def _infer_encoding(filepath: str, head: bytes) -> str:
+        """
+        Infer encoding from the first chunk of a file: by its byte order mark, else
+        by trying common encodings.
+        """
+        if head.startswith((codecs.BOM_UTF32_LE, codecs.BOM_UTF32_BE)):
+            return "utf-32"
+        if head.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+            return "utf-16"
         candidates: List[str] = ["utf-8", "ascii", "latin-1", "cp1252"]
         for enc in candidates:
             try:
-                with self.fs.open(filepath, mode="rb") as fh:
-                    sample: bytes = fh.read(8192)
-                sample.decode(enc)
+                # final=False: the chunk may end within a multi-byte character
+                codecs.getincrementaldecoder(enc)().decode(head, final=False)
                 return enc
             except (UnicodeDecodeError, LookupError):
                 continue
@@ -254,14 +416,16 @@ class DemoBackend(IBackend):
             f"Cannot infer encoding for file: {filepath}. Tried: {', '.join(candidates)}"
         )
 
-    def _infer_skip_lines(self, filepath: str, encoding: str) -> int:
-        """Infer number of header lines to skip (assumes csv-like format)."""
-        with self.fs.open(filepath, mode="r", encoding=encoding) as fh:
-            head_lines: List[str] = []
-            for i, line in enumerate(fh):
-                if i >= 20:
-                    break
-                head_lines.append(line)
+    def _infer_skip_lines(self, head: bytes, encoding: str) -> int:
+        """
+        Infer number of header lines to skip from the first chunk of a file (assumes
+        csv-like format).
+        """
+        text: str = codecs.getincrementaldecoder(encoding)().decode(head, final=False)
+        head_lines: List[str] = text.splitlines(keepends=True)
+        if len(head) == self.line_counter.head_size:
+            head_lines = head_lines[:-1]  # last line may be cut off
+        head_lines = head_lines[:20]
 
         if len(head_lines) < 2:
             return 0
@@ -284,7 +448,7 @@ class DemoBackend(IBackend):
 
     def run_query(self, query: str, db: DBInstanceDTO) -> pl.DataFrame:
         """See interface definition (parent class IBackend)."""
-        return self.con.query(query).pl()
+        return self._query(query)
 
     def get_schema(self, testobject: TestObjectDTO) -> SchemaSpecDTO:
         """
@@ -308,7 +472,7 @@ class DemoBackend(IBackend):
                 AND table_schema = '{coords.schema}'
                 AND table_name = '{coords.table}'
             """
-        schema_as_df = self.con.query(schema_query).pl()
+        schema_as_df = self._query(schema_query)
         # convert to dict with keys 'col', 'dtype' and value-lists as values
         schema_as_named_dict: Dict[str, List[str]] = schema_as_df.to_dict(as_series=False)
         # convert to a dict with column names as keys and dtypes as values
@@ -342,7 +506,7 @@ class DemoBackend(IBackend):
             FROM INFORMATION_SCHEMA.COLUMNS
             WHERE table_name = '__query__'
         """
-        schema_as_df = self.con.query(query).pl()
+        schema_as_df = self._query(query)
         schema_as_named_dict: Dict[str, List[str]] = schema_as_df.to_dict(as_series=False)
         schema_as_dict: Dict[str, str] = dict[str, str](
             zip(schema_as_named_dict["col"], schema_as_named_dict["dtype"], strict=False)
@@ -410,20 +574,37 @@ class DemoBackend(IBackend):
         return harmonized_schema_dto
 
     @staticmethod
-    def _get_concat_key(
-        primary_keys: List[str], cast_to: Optional[SchemaSpecDTO] = None
+    def _get_key_columns(
+        primary_keys: List[str],
+        cast_to: Optional[SchemaSpecDTO] = None,
+        relation: Optional[str] = None,
+    ) -> List[str]:
+        """Primary key columns of relation, cast to their dtype in cast_to if given."""
+        prefix: str = "" if relation is None else f"{relation}."
+        dtypes: Dict[str, str] = {} if cast_to is None else cast_to.columns or {}
+        return [
+            f"CAST({prefix}{key} AS {dtypes[key]})" if key in dtypes else prefix + key
+            for key in primary_keys
+        ]
+
+    @classmethod
+    def _key_match(
+        cls,
+        left: str,
+        right: str,
+        primary_keys: List[str],
+        cast_to: Optional[SchemaSpecDTO] = None,
     ) -> str:
-        if cast_to is not None:
-            assert cast_to.columns is not None  # caller provides populated schema
-            column_list: List[str] = [
-                f"CAST(CAST({col} AS {dtype}) AS STRING)"
-                for col, dtype in cast_to.columns.items()
-                if col in primary_keys
-            ]
-        else:
-            column_list: List[str] = [f"CAST({key} AS STRING)" for key in primary_keys]
-        concat_key: str = ", '|', ".join(column_list)
-        return f"CONCAT({concat_key})"
+        """
+        Join condition which matches rows of left and right on their typed primary
+        keys instead of a concatenated string key. Keys of left are cast to cast_to,
+        keys of right must be typed already. NULL keys match each other.
+        """
+        left_keys = cls._get_key_columns(primary_keys, cast_to, relation=left)
+        return " AND ".join(
+            f"{left_key} IS NOT DISTINCT FROM {right}.{key}"
+            for left_key, key in zip(left_keys, primary_keys, strict=True)
+        )
 
     @staticmethod
     def _get_column_selection(
@@ -438,35 +619,43 @@ class DemoBackend(IBackend):
                 cols: List[str] = [
                     f"CAST({col} AS {dtype}) AS {col}"
                     for col, dtype in cast_to.columns.items()
-                    if col != "__concat_key__"
                 ]
         else:
             if cast_to is None:
-                cols: List[str] = [col for col in columns if col != "__concat_key__"]
+                cols: List[str] = list(columns)
             else:
                 assert cast_to.columns is not None  # caller provides populated schema
                 cols: List[str] = [
                     f"CAST({col} AS {cast_to.columns[col]}) AS {col}"
                     for col in columns
-                    if col in cast_to.columns and col != "__concat_key__"
+                    if col in cast_to.columns
                 ]
 
         column_selection: str = ", ".join(cols)
         return column_selection
 
-    def _setup_test_db_statement(self, key_sample: List[str]) -> str:
-        """SQL statement to (re)create a connection-local temp table of keys.
+    def _register_rows(
+        self, name: str, rows: List[Tuple], schema: List[Tuple[str, pl.DataType | None]]
+    ) -> None:
+        """Registers rows as a connection-local relation with the given schema.
 
-        Uses CREATE OR REPLACE TEMP TABLE so the table lives in DuckDB's
-        per-connection ``temp`` schema and cannot collide with anything in
-        another DemoBackend instance.
+        The relation is handed to DuckDB as Arrow data (zero-copy) instead of a
+        VALUES literal, so large key samples don't produce huge SQL to parse and
+        keys may contain any characters. Columns without dtype are inferred from the
+        rows. Registering the rows which are already registered is a no-op, e.g. the
+        same key sample for query and testobject.
         """
-        key_values: str = ", ".join([f"('{key_value}')" for key_value in key_sample])
-        statement = f"""
-            CREATE OR REPLACE TEMP TABLE __concat_keys__ (__concat_key__ STRING);
-            INSERT INTO __concat_keys__ VALUES {key_values}
-        """
-        return statement
+        if self._registered.get(name) == rows:
+            return
+        relation = pl.DataFrame(
+            rows, schema=schema, orient="row", infer_schema_length=None
+        )
+        self.con.register(name, relation)
+        self._registered[name] = list(rows)
+
+    def _register_key_sample(self, primary_keys: List[str], key_sample: List[Tuple]):
+        schema = [(key, None) for key in primary_keys]
+        self._register_rows("__sample_keys__", key_sample, schema)
 
     def get_sample_keys(
         self,
@@ -475,32 +664,82 @@ class DemoBackend(IBackend):
         sample_size: int,
         db: DBInstanceDTO,
         cast_to: Optional[SchemaSpecDTO] = None,
-    ) -> List[str]:
-        """See interface definition (parent class IBackend)."""
+        strategy: SampleStrategy = SampleStrategy.RESERVOIR,
+        seed: int = 0,
+        stratify_by: Optional[str] = None,
+    ) -> List[Tuple]:
+        """
+        See interface definition (parent class IBackend). Keys are ranked by a seeded
+        hash (ties broken by key), so that samples repeat however many threads scan;
+        DuckDB's own REPEATABLE sampling only repeats single-threaded:
+            - RESERVOIR keeps the sample_size keys with the lowest hash, a bounded
+              top-k over all distinct keys which never sorts them all
+            - HASH keeps keys whose seeded hash modulo (keys / 2 * sample_size) is 0
+              and only sorts these by hash to cut them to sample_size
+            - STRATIFIED ranks keys by seeded hash within each stratum, which sorts
+              all keys of each stratum, and keeps the first sample_size / strata keys
+              of each stratum
+        """
 
         if len(primary_keys) == 0:
             raise DemoBackendError("Provide a non-empty list of primary keys!")
+        if strategy == SampleStrategy.STRATIFIED and stratify_by is None:
+            raise DemoBackendError("Provide a column to stratify the sample by!")
 
-        concat_key: str = self._get_concat_key(primary_keys, cast_to=cast_to)
-
-        random_number: int = randint(0, 100)
-        sample_query: str = f"""
-            {query}
-            SELECT DISTINCT({concat_key}) AS __concat_key__
-            FROM __expected__
-            ORDER BY SHA256(CONCAT('{random_number}', __concat_key__))
-            LIMIT {sample_size}
-        """
-        result_df = self.con.query(sample_query).pl()
-        result_list = result_df.to_dict(as_series=False)["__concat_key__"]
+        key_columns: List[str] = self._get_key_columns(primary_keys, cast_to)
+        key_selection: str = ", ".join(
+            f"{column} AS {key}"
+            for column, key in zip(key_columns, primary_keys, strict=True)
+        )
+        keys: str = ", ".join(primary_keys)
+        key_hash: str = f"HASH({seed}, {keys})"
+        key_rank: str = f"{key_hash}, {keys}"
 
-        return result_list
+        if strategy == SampleStrategy.RESERVOIR:
+            sample_query: str = f"""
+                {query}
+                SELECT {keys} FROM (SELECT DISTINCT {key_selection} FROM __expected__)
+                ORDER BY {key_rank}
+                LIMIT {sample_size}
+            """
+        elif strategy == SampleStrategy.HASH:
+            sample_query: str = f"""
+                {query}
+                SELECT {keys} FROM (
+                    SELECT *, COUNT(*) OVER () AS __keys__
+                    FROM (SELECT DISTINCT {key_selection} FROM __expected__)
+                )
+                WHERE {key_hash} % GREATEST(1, __keys__ // {2 * sample_size}) = 0
+                ORDER BY {key_rank}
+                LIMIT {sample_size}
+            """
+        else:
+            sample_query: str = f"""
+                {query}
+                SELECT {keys} FROM (
+                    SELECT
+                        *,
+                        ROW_NUMBER() OVER (
+                            PARTITION BY __stratum__ ORDER BY {key_rank}
+                        ) AS __rank__,
+                        COUNT(DISTINCT __stratum__) OVER () AS __strata__
+                    FROM (
+                        SELECT DISTINCT {key_selection}, {stratify_by} AS __stratum__
+                        FROM __expected__
+                    )
+                )
+                WHERE __rank__ <= CEIL({sample_size} / __strata__)
+                ORDER BY __rank__, {key_rank}
+                LIMIT {sample_size}
+            """
+        result_df = self._query(sample_query)
+        return result_df.rows()
 
     def get_sample_from_query(
         self,
         query: str,
         primary_keys: List[str],
-        key_sample: List[str],
+        key_sample: List[Tuple],
         db: DBInstanceDTO,
         columns: Optional[List[str]] = None,
         cast_to: Optional[SchemaSpecDTO] = None,
@@ -510,27 +749,24 @@ class DemoBackend(IBackend):
                 "Provide a non-empty list of primary keys and samples!"
             )
 
-        concat_key: str = self._get_concat_key(primary_keys, cast_to)
         column_selection: str = self._get_column_selection(columns, cast_to)
+        key_match: str = self._key_match("__obj__", "__keys__", primary_keys, cast_to)
 
         sample_query: str = f"""
             {query}
-            SELECT __obj__.* FROM (
-                SELECT {column_selection}, {concat_key} AS __concat_key__
-                FROM __expected__
-            ) AS __obj__
-            INNER JOIN __concat_keys__ AS __keys__
-                ON __obj__.__concat_key__ = __keys__.__concat_key__
-        """
-        self.con.execute(self._setup_test_db_statement(key_sample=key_sample))
-        result_as_df = self.con.query(sample_query).pl()
+            SELECT {column_selection}
+            FROM __expected__ AS __obj__
+            SEMI JOIN __sample_keys__ AS __keys__ ON {key_match}
+        """
+        self._register_key_sample(primary_keys, key_sample)
+        result_as_df = self._query(sample_query)
         return result_as_df
 
     def get_sample_from_testobject(
         self,
         testobject: TestObjectDTO,
         primary_keys: List[str],
-        key_sample: List[str],
+        key_sample: List[Tuple],
         columns: Optional[List[str]] = None,
         cast_to: Optional[SchemaSpecDTO] = None,
     ) -> pl.DataFrame:
@@ -548,16 +784,186 @@ class DemoBackend(IBackend):
         coords = self.naming_resolver.testobject_to_db_coordinates(testobject)
 
         column_selection: str = self._get_column_selection(columns, cast_to)
-        concat_key: str = self._get_concat_key(primary_keys, cast_to)
+        key_match: str = self._key_match("__obj__", "__keys__", primary_keys, cast_to)
 
         sample_query: str = f"""
-            SELECT __obj__.* FROM (
-                SELECT {column_selection}, {concat_key} AS __concat_key__
-                FROM {coords.catalog}.{coords.schema}.{coords.table}
-            ) AS __obj__
-            INNER JOIN __concat_keys__ AS __keys__
-                ON __obj__.__concat_key__ = __keys__.__concat_key__
-        """
-        self.con.execute(self._setup_test_db_statement(key_sample=key_sample))
-        result_as_df = self.con.query(sample_query).pl()
+            SELECT {column_selection}
+            FROM {coords.catalog}.{coords.schema}.{coords.table} AS __obj__
+            SEMI JOIN __sample_keys__ AS __keys__ ON {key_match}
+        """
+        self._register_key_sample(primary_keys, key_sample)
+        result_as_df = self._query(sample_query)
         return result_as_df
+
+    def get_diff_from_query(
+        self,
+        query: str,
+        testobject: TestObjectDTO,
+        primary_keys: List[str],
+        db: DBInstanceDTO,
+        cast_to: SchemaSpecDTO,
+        max_rows: int,
+    ) -> Tuple[pl.DataFrame, int]:
+        """
+        See interface definition (parent class IBackend). Both sides are row-hashed
+        and anti-joined on primary keys and row hash in both directions within
+        DuckDB, over all rows of query and testobject.
+        """
+        if len(primary_keys) == 0:
+            raise DemoBackendError("Provide a non-empty list of primary keys!")
+
+        assert cast_to.columns is not None  # caller provides populated schema
+        testobject_source = self._comparable_testobject_source(testobject)
+        column_selection: str = self._get_column_selection(cast_to=cast_to)
+        rowhash: str = f"HASH({', '.join(cast_to.columns)})"
+
+        def key_match(left: str, right: str) -> str:
+            return self._key_match(left, right, primary_keys)
+
+        diff_query: str = f"""
+            {query}
+            SELECT * EXCLUDE (__rowhash__), COUNT(*) OVER () AS __diff_count__
+            FROM (
+                WITH __exp__ AS (
+                    SELECT *, {rowhash} AS __rowhash__ FROM (
+                        SELECT {column_selection} FROM __expected__
+                    )
+                ), __act__ AS (
+                    SELECT *, {rowhash} AS __rowhash__ FROM (
+                        SELECT {column_selection} FROM {testobject_source}
+                    )
+                )
+                SELECT __exp__.*, 'testobject' AS __source__
+                FROM __exp__ ANTI JOIN __act__
+                    ON {key_match("__exp__", "__act__")}
+                    AND __exp__.__rowhash__ = __act__.__rowhash__
+                UNION ALL
+                SELECT __act__.*, 'testquery' AS __source__
+                FROM __act__ ANTI JOIN __exp__
+                    ON {key_match("__act__", "__exp__")}
+                    AND __act__.__rowhash__ = __exp__.__rowhash__
+            )
+            ORDER BY {", ".join(primary_keys)}, __source__
+            LIMIT {max_rows}
+        """
+        diff_df = self._query(diff_query)
+        diff_count: int = diff_df["__diff_count__"][0] if len(diff_df) > 0 else 0
+        return diff_df.drop("__diff_count__"), diff_count
+
+    def get_bucket_digests(
+        self,
+        query: str,
+        testobject: TestObjectDTO,
+        primary_keys: List[str],
+        db: DBInstanceDTO,
+        cast_to: SchemaSpecDTO,
+        bucket_count: int,
+        level: int,
+        parent_buckets: Optional[List[int]] = None,
+    ) -> Tuple[pl.DataFrame, pl.DataFrame]:
+        """
+        See interface definition (parent class IBackend). Digests are the sum of
+        row hashes per bucket (modulo a large prime), which is order-independent
+        and - unlike XOR - doesn't cancel out duplicate rows.
+        """
+        assert cast_to.columns is not None  # caller provides populated schema
+        bucket_filter: Optional[int] = None
+        if parent_buckets is not None:
+            self._register_buckets(parent_buckets)
+            bucket_filter = bucket_count**level
+
+        rowhash: str = f"HASH({', '.join(cast_to.columns)})"
+
+        def digests(source: str) -> str:
+            bucketed = self._bucketed_rows(
+                source, primary_keys, cast_to, bucket_count, level, bucket_filter
+            )
+            return f"""
+                SELECT
+                    __bucket__,
+                    COUNT(*) AS __rows__,
+                    CAST(SUM(CAST({rowhash} AS HUGEINT)) % 9223372036854775783 AS BIGINT)
+                        AS __digest__
+                FROM ({bucketed})
+                GROUP BY __bucket__
+            """
+
+        testobject_source = self._comparable_testobject_source(testobject)
+        expected = self._query(f"{query}\n{digests('__expected__')}")
+        actual = self._query(digests(testobject_source))
+        return expected, actual
+
+    def get_rows_from_buckets(
+        self,
+        query: str,
+        testobject: TestObjectDTO,
+        primary_keys: List[str],
+        db: DBInstanceDTO,
+        cast_to: SchemaSpecDTO,
+        bucket_count: int,
+        level: int,
+        buckets: List[int],
+    ) -> Tuple[pl.DataFrame, pl.DataFrame]:
+        """See interface definition (parent class IBackend)."""
+        self._register_buckets(buckets)
+
+        def rows(source: str) -> str:
+            bucketed = self._bucketed_rows(
+                source,
+                primary_keys,
+                cast_to,
+                bucket_count,
+                level,
+                bucket_filter=bucket_count ** (level + 1),
+            )
+            return f"SELECT * EXCLUDE (__key_hash__, __bucket__) FROM ({bucketed})"
+
+        testobject_source = self._comparable_testobject_source(testobject)
+        expected = self._query(f"{query}\n{rows('__expected__')}")
+        actual = self._query(rows(testobject_source))
+        return expected, actual
+
+    def _comparable_testobject_source(self, testobject: TestObjectDTO) -> str:
+        testobject_type = self.naming_resolver.get_testobject_type(testobject)
+        if testobject_type == TestobjectType.FILE:
+            raise DemoBackendError("Comparing files not yet supported")
+        coords = self.naming_resolver.testobject_to_db_coordinates(testobject)
+        return f"{coords.catalog}.{coords.schema}.{coords.table}"
+
+    def _bucketed_rows(
+        self,
+        source: str,
+        primary_keys: List[str],
+        cast_to: SchemaSpecDTO,
+        bucket_count: int,
+        level: int,
+        bucket_filter: Optional[int] = None,
+    ) -> str:
+        """
+        Selects rows of source with their bucket at the given level. If bucket_filter
+        is set, only rows whose key hash modulo bucket_filter is in the registered
+        relation __buckets__ are selected.
+        """
+        if len(primary_keys) == 0:
+            raise DemoBackendError("Provide a non-empty list of primary keys!")
+
+        key_columns: str = ", ".join(self._get_key_columns(primary_keys, cast_to))
+        column_selection: str = self._get_column_selection(cast_to=cast_to)
+        where_clause: str = ""
+        if bucket_filter is not None:
+            where_clause = (
+                f"WHERE __key_hash__ % {bucket_filter} "
+                "IN (SELECT __bucket__ FROM __buckets__)"
+            )
+        return f"""
+            SELECT *, __key_hash__ % {bucket_count ** (level + 1)} AS __bucket__
+            FROM (
+                SELECT {column_selection}, HASH({key_columns}) AS __key_hash__
+                FROM {source}
+            )
+            {where_clause}
+        """
+
+    def _register_buckets(self, buckets: List[int]) -> None:
+        rows = [(bucket,) for bucket in buckets]
+        self._register_rows("__buckets__", rows, [("__bucket__", pl.UInt64())])
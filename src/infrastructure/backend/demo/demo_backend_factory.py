@@ -1,11 +1,15 @@
+import threading
 from pathlib import Path
 
+import duckdb
+
 from src.dtos import DomainConfigDTO
 from src.infrastructure_ports import IBackendFactory
 
 from .demo_backend import DemoBackend
 from .demo_naming_resolver import DemoNamingResolver
 from .demo_query_handler import DemoQueryHandler
+from .demo_rowcount_cache import RowcountCache
 
 # Use project-root-relative paths for test fixtures
 local_raw_data = Path("tests/fixtures/demo/data/raw")
@@ -18,25 +22,72 @@ class DemoBackendFactory(IBackendFactory):
     The factory used to cache one backend per domain, but that meant every
     worker thread in a TestRun shared the same backend — and therefore the
     same DuckDB session — which deadlocked under concurrent DDL/DML. With no
-    caching each testcase gets its own backend and its own connection, so
-    there is nothing to contend on.
+    caching each caller gets its own backend and its own connection, so there
+    is nothing to contend on. Reuse across testcases is handled by the testrun's
+    backend pool, which leases one backend per worker thread.
+
+    With a rowcount_cache_path, all backends share a persistent cache of file
+    rowcounts with at most rowcount_cache_size entries.
+
+    With shared_database, the factory opens one DuckDB database and attaches all
+    .db files once, on first use; each backend gets its own cursor, i.e. its own
+    connection to that database. Temp tables and registered relations stay local
+    to the cursor and attached files are read-only, so backends stay as isolated
+    as with a database of their own, but are created without listing and
+    attaching files again. .db files added to db_path later are not attached.
     """
 
     def __init__(
         self,
         files_path: str = str(local_raw_data),
         db_path: str = str(local_db_data),
+        rowcount_cache_path: str | None = None,
+        rowcount_cache_size: int = 10_000,
+        shared_database: bool = False,
     ):
         self.files_path = files_path
         self.db_path = db_path
+        self.rowcount_cache_path = rowcount_cache_path
+        self.rowcount_cache_size = rowcount_cache_size
+        self.shared_database = shared_database
+        self._database: duckdb.DuckDBPyConnection | None = None
+        self._lock = threading.Lock()
+
+    def __reduce__(self):
+        # worker processes open a shared database of their own
+        args = (
+            self.files_path,
+            self.db_path,
+            self.rowcount_cache_path,
+            self.rowcount_cache_size,
+            self.shared_database,
+        )
+        return (DemoBackendFactory, args)
+
+    def preferred_concurrency(self) -> int | None:
+        return DemoBackend.preferred_concurrency
 
     def create(self, domain_config: DomainConfigDTO) -> DemoBackend:
         query_handler = DemoQueryHandler(domain_config=domain_config)
         naming_resolver = DemoNamingResolver(domain_cofig=domain_config)
+        rowcount_cache = (
+            None
+            if self.rowcount_cache_path is None
+            else RowcountCache(self.rowcount_cache_path, self.rowcount_cache_size)
+        )
         return DemoBackend(
             files_path=self.files_path,
             db_path=self.db_path,
             domain_config=domain_config,
             naming_resolver=naming_resolver,
             query_handler=query_handler,
+            rowcount_cache=rowcount_cache,
+            con=self._cursor() if self.shared_database else None,
         )
+
+    def _cursor(self) -> duckdb.DuckDBPyConnection:
+        """New connection to the shared database, which is opened on first use."""
+        with self._lock:
+            if self._database is None:
+                self._database = DemoBackend.connect_database(self.db_path)
+            return self._database.cursor()
@@ -0,0 +1,183 @@
+import codecs
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple
+
+import polars as pl
+import pyarrow as pa
+from fsspec import AbstractFileSystem
+
+
+class _LineBreaks:
+    """Line break counts of a contiguous range of a file, in code units."""
+
+    def __init__(self, lf: int, cr: int, crlf: int, first: int | None, last: int | None):
+        self.lf = lf
+        self.cr = cr
+        self.crlf = crlf
+        self.first = first  # first and last code unit, None for empty ranges
+        self.last = last
+
+    def followed_by(self, other: "_LineBreaks", cr: int, lf: int) -> "_LineBreaks":
+        """Counts of this range and the directly following range."""
+        if self.last is None:
+            return other
+        if other.first is None:
+            return self
+        split_crlf = 1 if self.last == cr and other.first == lf else 0
+        return _LineBreaks(
+            lf=self.lf + other.lf,
+            cr=self.cr + other.cr,
+            crlf=self.crlf + other.crlf + split_crlf,
+            first=self.first,
+            last=other.last,
+        )
+
+
+class LineCounter:
+    """
+    Counts lines of large files without decoding them. Files are read in large
+    binary chunks; newlines are counted at C level with bytes.count for encodings
+    with single-byte newlines (e.g. utf-8, latin-1) and with vectorized compute on
+    code units for UTF-16 and UTF-32. Chunks of big files are counted in parallel.
+
+    Lines are counted as in Python's text mode: '\\n', '\\r\\n' and '\\r' end a line,
+    and a last line without line break counts, too.
+    """
+
+    head_size: int = 64 * 1024  # first chunk, e.g. to infer encoding and header
+    chunk_size: int = 8 * 1024 * 1024
+    parallel_min_size: int = 64 * 1024 * 1024  # files are split into ranges above
+
+    def __init__(self, fs: AbstractFileSystem, max_workers: int = 4):
+        self.fs = fs
+        self.max_workers = max_workers
+
+    def read_head(self, filepath: str) -> bytes:
+        """Reads the first chunk of a file."""
+        with self.fs.open(filepath, mode="rb") as fh:
+            return fh.read(self.head_size)
+
+    def count_lines(self, filepath: str, encoding: str, head: bytes) -> int:
+        """
+        Counts lines of a file in the given encoding. head is the first chunk of
+        the file, which determines the byte order of UTF-16 and UTF-32 files.
+        """
+        width, cr, lf, bom = self._line_break_units(encoding, head)
+        size: int = self.fs.size(filepath)
+        if size <= len(head):
+            return self.count_lines_in(head, encoding, head)
+
+        ranges = self._ranges(bom, size)
+        if len(ranges) == 1:
+            breaks = [self._count_range(filepath, bom, size, width, cr, lf)]
+        else:
+            with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+                breaks = list(
+                    executor.map(
+                        lambda range_: self._count_range(
+                            filepath, range_[0], range_[1], width, cr, lf
+                        ),
+                        ranges,
+                    )
+                )
+
+        total = breaks[0]
+        for following in breaks[1:]:
+            total = total.followed_by(following, cr, lf)
+        return self._lines(total, cr, lf)
+
+    def count_lines_in(self, data: bytes, encoding: str, head: bytes) -> int:
+        """Counts lines of a chunk of data, e.g. of the first chunk of a file."""
+        width, cr, lf, bom = self._line_break_units(encoding, head)
+        data = data[bom : len(data) - (len(data) - bom) % width]
+        return self._lines(self._count(data, width, cr, lf), cr, lf)
+
+    @staticmethod
+    def _line_break_units(encoding: str, head: bytes) -> Tuple[int, int, int, int]:
+        """
+        Code unit width and the code units of '\\r' and '\\n' in this encoding, as
+        well as the length of the byte order mark which the codec strips.
+        """
+        codec: str = codecs.lookup(encoding).name
+        boms: List[bytes] = []
+        if codec == "utf-8-sig":
+            codec, boms = "utf-8", [codecs.BOM_UTF8]
+        elif codec in ["utf-16", "utf-32"]:
+            if codec == "utf-16":
+                boms = [codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE]
+            else:
+                boms = [codecs.BOM_UTF32_LE, codecs.BOM_UTF32_BE]
+            codec += "-be" if head.startswith(boms[1]) else "-le"
+        bom: int = next((len(bom) for bom in boms if head.startswith(bom)), 0)
+
+        cr_bytes, lf_bytes = "\r".encode(codec), "\n".encode(codec)
+        # code units are compared as integers in native byte order
+        cr = int.from_bytes(cr_bytes, sys.byteorder)
+        lf = int.from_bytes(lf_bytes, sys.byteorder)
+        return len(lf_bytes), cr, lf, bom
+
+    def _ranges(self, start: int, end: int) -> List[Tuple[int, int]]:
+        size = end - start
+        if size < self.parallel_min_size or self.max_workers < 2:
+            return [(start, end)]
+        range_size = -(-size // self.max_workers)
+        range_size += -range_size % self.chunk_size  # whole chunks per range
+        return [
+            (range_start, min(range_start + range_size, end))
+            for range_start in range(start, end, range_size)
+        ]
+
+    def _count_range(
+        self, filepath: str, start: int, end: int, width: int, cr: int, lf: int
+    ) -> _LineBreaks:
+        total = _LineBreaks(0, 0, 0, None, None)
+        with self.fs.open(filepath, mode="rb") as fh:
+            fh.seek(start)
+            position = start
+            while position < end:
+                chunk: bytes = fh.read(min(self.chunk_size, end - position))
+                if not chunk:
+                    break
+                position += len(chunk)
+                chunk = chunk[: len(chunk) - len(chunk) % width]
+                total = total.followed_by(self._count(chunk, width, cr, lf), cr, lf)
+        return total
+
+    @staticmethod
+    def _count(data: bytes, width: int, cr: int, lf: int) -> _LineBreaks:
+        if len(data) == 0:
+            return _LineBreaks(0, 0, 0, None, None)
+        if width == 1:
+            cr_byte, lf_byte = bytes([cr]), bytes([lf])
+            return _LineBreaks(
+                lf=data.count(lf_byte),
+                cr=data.count(cr_byte),
+                crlf=data.count(cr_byte + lf_byte),
+                first=data[0],
+                last=data[-1],
+            )
+
+        # multi-byte code units: wrap data as integer array (zero-copy) and compare
+        # all units at once
+        unit_type = pa.uint16() if width == 2 else pa.uint32()
+        units = pl.Series(
+            pa.Array.from_buffers(
+                unit_type, len(data) // width, [None, pa.py_buffer(data)]
+            )
+        )
+        is_cr, is_lf = units == cr, units == lf
+        return _LineBreaks(
+            lf=int(is_lf.sum()),
+            cr=int(is_cr.sum()),
+            crlf=int((is_cr.head(-1) & is_lf.tail(-1)).sum()),
+            first=units[0],
+            last=units[-1],
+        )
+
+    @staticmethod
+    def _lines(breaks: _LineBreaks, cr: int, lf: int) -> int:
+        if breaks.last is None:
+            return 0
+        unterminated = 0 if breaks.last in [cr, lf] else 1
+        return breaks.lf + breaks.cr - breaks.crlf + unterminated
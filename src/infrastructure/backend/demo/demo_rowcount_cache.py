@@ -0,0 +1,97 @@
+import sqlite3
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import Tuple
+
+# filepath, size in bytes, version (e.g. mtime or etag), encoding, skip lines
+RowcountKey = Tuple[str, int, str, str, int]
+
+
+class RowcountCache:
+    """
+    Persistent cache of file rowcounts in a small SQLite database, shared by all
+    backends, threads and processes which use the same path. Landing files are
+    immutable once written, so a rowcount stays valid as long as size and version
+    (mtime or etag) of the file are unchanged. The cache holds at most max_entries
+    rowcounts; least recently used ones are evicted.
+
+    The cache is best effort: if the database can't be read or written (e.g. it is
+    locked for too long), lookups miss and rowcounts are not stored.
+    """
+
+    def __init__(self, path: str, max_entries: int = 10_000, timeout_s: float = 5.0):
+        if max_entries < 1:
+            raise ValueError(f"Max entries must be positive, got {max_entries}")
+        self.path = path
+        self.max_entries = max_entries
+        self.timeout_s = timeout_s
+
+    def get(self, key: RowcountKey) -> int | None:
+        """Returns the cached rowcount and marks it as recently used."""
+        try:
+            with closing(self._connect()) as con, con:
+                row = con.execute(
+                    """
+                    UPDATE rowcounts SET last_used = ?
+                    WHERE filepath = ? AND size = ? AND version = ?
+                        AND encoding = ? AND skip_lines = ?
+                    RETURNING rowcount
+                    """,
+                    (time.time(), *key),
+                ).fetchone()
+        except sqlite3.Error:
+            return None
+        return None if row is None else row[0]
+
+    def put(self, key: RowcountKey, rowcount: int) -> None:
+        """Caches a rowcount, drops those of older versions of the file and evicts."""
+        filepath, size, version = key[:3]
+        try:
+            with closing(self._connect()) as con, con:
+                con.execute(
+                    """
+                    DELETE FROM rowcounts
+                    WHERE filepath = ? AND (size != ? OR version != ?)
+                    """,
+                    (filepath, size, version),
+                )
+                con.execute(
+                    "INSERT OR REPLACE INTO rowcounts VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (*key, rowcount, time.time()),
+                )
+                con.execute(
+                    """
+                    DELETE FROM rowcounts WHERE rowid IN (
+                        SELECT rowid FROM rowcounts
+                        ORDER BY last_used DESC LIMIT -1 OFFSET ?
+                    )
+                    """,
+                    (self.max_entries,),
+                )
+        except sqlite3.Error:
+            pass
+
+    def _connect(self) -> sqlite3.Connection:
+        # a connection per operation (commits on success, closed by callers):
+        # connections can't be shared across threads
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        con = sqlite3.connect(self.path, timeout=self.timeout_s)
+        con.execute(
+            """
+            CREATE TABLE IF NOT EXISTS rowcounts (
+                filepath TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                version TEXT NOT NULL,
+                encoding TEXT NOT NULL,
+                skip_lines INTEGER NOT NULL,
+                rowcount INTEGER NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (filepath, size, version, encoding, skip_lines)
+            )
+            """
+        )
+        con.execute(
+            "CREATE INDEX IF NOT EXISTS rowcounts_last_used ON rowcounts (last_used)"
+        )
+        return con
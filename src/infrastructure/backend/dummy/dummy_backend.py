@@ -5,6 +5,7 @@ import polars as pl
 from src.dtos import (
     DBInstanceDTO,
     LocationDTO,
+    SampleStrategy,
     SchemaSpecDTO,
     SpecType,
     TestObjectDTO,
@@ -80,14 +81,17 @@ class DummyBackend(IBackend):
         sample_size: int,
         db: DBInstanceDTO,
         cast_to: Optional[SchemaSpecDTO] = None,
-    ) -> List[str]:
-        return ["a_10", "b_20"]
+        strategy: SampleStrategy = SampleStrategy.RESERVOIR,
+        seed: int = 0,
+        stratify_by: Optional[str] = None,
+    ) -> List[Tuple]:
+        return [("a", 10), ("b", 20)]
 
     def get_sample_from_query(
         self,
         query: str,
         primary_keys: List[str],
-        key_sample: List[str],
+        key_sample: List[Tuple],
         db: DBInstanceDTO,
         columns: Optional[List[str]] = None,
         cast_to: Optional[SchemaSpecDTO] = None,
@@ -98,7 +102,7 @@ class DummyBackend(IBackend):
         self,
         testobject: TestObjectDTO,
         primary_keys: List[str],
-        key_sample: List[str],
+        key_sample: List[Tuple],
         columns: Optional[List[str]] = None,
         cast_to: Optional[SchemaSpecDTO] = None,
     ) -> pl.DataFrame:
@@ -0,0 +1,5 @@
+from .file_shard_queue import FileShardQueue
+
+__all__ = [
+    "FileShardQueue",
+]
@@ -0,0 +1,110 @@
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import List
+
+from src.dtos import ShardResultDTO, TestRunShardDTO
+from src.infrastructure_ports import IShardQueue
+
+
+class FileShardQueue(IShardQueue):
+    """
+    Shard queue on a (shared) local filesystem — a stand-in for a message broker
+    which is good enough for worker processes on one host or hosts sharing a mount.
+
+    Shards are files in pending/, named by enqueue time so that they are claimed
+    in FIFO order. A worker claims a shard by renaming it to claimed/ — renames are
+    atomic, so of several concurrently claiming workers exactly one succeeds.
+    The modification time of a claimed file is its lease: workers renew it by
+    touching the file, and claims which were not renewed for lease_s seconds are
+    moved back to pending/. Completion records are written to results/<testrun_id>/.
+    """
+
+    def __init__(self, path: str, lease_s: float = 300.0):
+        if lease_s <= 0:
+            raise ValueError(f"Lease must be positive, got {lease_s}")
+        self.path = Path(path)
+        self.lease_s = lease_s
+        self._pending = self.path / "pending"
+        self._claimed = self.path / "claimed"
+        self._results = self.path / "results"
+        for folder in (self._pending, self._claimed, self._results):
+            folder.mkdir(parents=True, exist_ok=True)
+
+    def put(self, shard: TestRunShardDTO) -> None:
+        name = f"{time.time_ns():020d}_{shard.testrun_id}_{shard.id}.json"
+        self._write_atomically(self._pending / name, shard.to_json())
+
+    def claim(self) -> TestRunShardDTO | None:
+        self._requeue_expired()
+        for pending in sorted(self._pending.glob("*.json")):
+            claimed = self._claimed / pending.name
+            try:
+                os.utime(pending)  # starts the lease, which survives the rename
+                pending.rename(claimed)
+            except FileNotFoundError:
+                continue  # claimed by another worker in the meantime
+            shard = TestRunShardDTO.from_json(claimed.read_bytes())
+            if self._result_path(str(shard.testrun_id), str(shard.id)).exists():
+                # completed by a worker whose lease expired shortly before
+                claimed.unlink(missing_ok=True)
+                continue
+            return shard
+        return None
+
+    def renew(self, shard: TestRunShardDTO) -> bool:
+        for claimed in self._claimed.glob(f"*_{shard.id}.json"):
+            try:
+                os.utime(claimed)
+                return True
+            except FileNotFoundError:
+                break
+        return False
+
+    def complete(self, result: ShardResultDTO) -> None:
+        path = self._result_path(str(result.testrun_id), str(result.shard_id))
+        path.parent.mkdir(exist_ok=True)
+        self._write_atomically(path, result.to_json())
+        for claimed in self._claimed.glob(f"*_{result.shard_id}.json"):
+            claimed.unlink(missing_ok=True)
+
+    def list_results(self, testrun_id: str) -> List[ShardResultDTO]:
+        folder = self._results / testrun_id
+        if not folder.exists():
+            return []
+        return [
+            ShardResultDTO.from_json(file.read_bytes())
+            for file in sorted(folder.glob("*.json"))
+        ]
+
+    def withdraw(self, testrun_id: str) -> int:
+        withdrawn = 0
+        for folder in (self._pending, self._claimed):
+            for shard in folder.glob(f"*_{testrun_id}_*.json"):
+                try:
+                    shard.unlink()
+                    withdrawn += 1
+                except FileNotFoundError:
+                    continue  # claimed or completed in the meantime
+        return withdrawn
+
+    def _requeue_expired(self) -> None:
+        """Moves claims whose lease expired back to pending, keeping their position."""
+        expired_before = time.time() - self.lease_s
+        for claimed in self._claimed.glob("*.json"):
+            try:
+                if claimed.stat().st_mtime < expired_before:
+                    claimed.rename(self._pending / claimed.name)
+            except FileNotFoundError:
+                continue  # completed or requeued by another worker in the meantime
+
+    def _result_path(self, testrun_id: str, shard_id: str) -> Path:
+        return self._results / testrun_id / f"{shard_id}.json"
+
+    @staticmethod
+    def _write_atomically(path: Path, content: str) -> None:
+        """Readers never see partially written files: write aside, then rename."""
+        tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+        tmp.write_text(content)
+        os.replace(tmp, path)
@@ -1,6 +1,7 @@
 import json
 import logging
 from abc import ABC, abstractmethod
+import re
 from datetime import datetime
 from typing import Dict, List, Type
 
@@ -96,6 +97,10 @@ class JsonSerializer(ISerializer):
 # --- Storage ---
 
 
+# date folder of testruns: {type}/{domain}/{YYYY-MM-DD}/...
+_DATE_FOLDER = re.compile(r"/(\d{4}-\d{2}-\d{2})/")
+
+
 class DtoStorageFileError(StorageError):
     """Error raised by file-based DTO storage implementations."""
 
@@ -245,9 +250,12 @@ class DtoStorageFile(IDtoStorage):
         object_type: ObjectType,
         filters: Dict[str, str] | None = None,
         order_by: str | None = None,
+        limit: int | None = None,
     ) -> List[DTO]:
         if order_by is not None and order_by != "date":
             raise ValueError(f"Unsupported order_by: {order_by}. Only 'date' supported.")
+        if limit is not None and order_by != "date":
+            raise ValueError("A limit requires order_by='date'")
 
         search_path = self.storage_location.path + self._get_folder(object_type)
 
@@ -272,6 +280,9 @@ class DtoStorageFile(IDtoStorage):
         except Exception as err:
             raise DtoStorageFileError(f"Error listing {object_type}: {err}") from err
 
+        if limit is not None:
+            matches = self._most_recent_matches(matches, limit)
+
         results: List[DTO] = []
         for match_path in matches:
             try:
@@ -289,9 +300,31 @@ class DtoStorageFile(IDtoStorage):
 
         if order_by == "date":
             results.sort(key=lambda d: getattr(d, "start_ts", datetime.min))
+        if limit is not None:
+            results = results[-limit:] if limit > 0 else []
 
         return results
 
+    @staticmethod
+    def _most_recent_matches(matches: List[str], limit: int) -> List[str]:
+        """
+        Paths of the most recent date folders which together hold at least limit
+        files, so that older DTOs aren't read. Paths without a date folder can't
+        be ordered without reading them and are all kept.
+        """
+        by_date: Dict[str, List[str]] = {}
+        for path in matches:
+            date = _DATE_FOLDER.search(path)
+            by_date.setdefault(date.group(1) if date else "", []).append(path)
+
+        undated = by_date.pop("", [])
+        recent: List[str] = []
+        for date in sorted(by_date, reverse=True):
+            if len(recent) >= limit:
+                break
+            recent.extend(by_date[date])
+        return recent + undated
+
 
 class MemoryDtoStorage(DtoStorageFile):
     def __init__(
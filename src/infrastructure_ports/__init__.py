@@ -8,11 +8,12 @@ from .errors import (
     StorageError,
     StorageTypeUnknownError,
 )
-from .i_backend import BackendError, IBackend
+from .i_backend import BackendError, IBackend, TransientBackendError
 from .i_backend_factory import IBackendFactory
 from .i_dto_storage import IDtoStorage
 from .i_dto_storage_factory import IDtoStorageFactory
 from .i_notifier import INotifier
+from .i_shard_queue import IShardQueue
 from .i_user_storage import IUserStorage
 from .i_user_storage_factory import IUserStorageFactory
 
@@ -20,6 +21,7 @@ __all__ = [
     "IBackend",
     "IBackendFactory",
     "BackendError",
+    "TransientBackendError",
     "IUserStorage",
     "IUserStorageFactory",
     "IDtoStorage",
@@ -28,4 +30,5 @@ __all__ = [
     "StorageTypeUnknownError",
     "ObjectNotFoundError",
     "INotifier",
+    "IShardQueue",
 ]
@@ -3,7 +3,7 @@ from typing import List, Optional, Tuple
 
 import polars as pl
 
-from src.dtos import DBInstanceDTO, SchemaSpecDTO, TestObjectDTO
+from src.dtos import DBInstanceDTO, SampleStrategy, SchemaSpecDTO, TestObjectDTO
 
 
 class BackendError(Exception):
@@ -12,14 +12,27 @@ class BackendError(Exception):
     """
 
 
+class TransientBackendError(BackendError):
+    """
+    Exception raised when a backend operation fails for a reason which is likely
+    to go away if the operation is repeated, e.g. a connection reset, a throttled
+    request or a temporarily unavailable warehouse. Backends raise it to signal
+    that retrying is safe; all other errors are treated as permanent.
+    """
+
+
 class IBackend(ABC):
-    # if the backend supports pushdown, compare will delegate to backend
+    # if the backend supports pushdown, compare may delegate to backend (PUSHDOWN and
+    # RECONCILE compare modes)
     supports_db_comparison: bool
     # if clustering/partitioning are supported, testcase schema compare them to specs
     supports_clustering: bool
     supports_partitions: bool
     # if backend enforces primary keys, testcase schema will compare them to specs
     supports_primary_keys: bool
+    # max number of testcases the data platform should serve concurrently, e.g. due
+    # to query throttling per service account; None means no preference
+    preferred_concurrency: int | None = None
 
     @abstractmethod
     def list_testobjects(self, db: DBInstanceDTO) -> List[TestObjectDTO]:
@@ -72,6 +85,25 @@ class IBackend(ABC):
               file at once.
         """
 
+    def testobject_has_rows(self, testobject: TestObjectDTO) -> bool:
+        """Return True if the testobject (table or file) contains at least one row.
+
+        Used by precondition checks which don't need the exact rowcount. Backends
+        should override this with a probe which stops at the first row (e.g.
+        LIMIT 1 or the first data line of a file) instead of a full count.
+        Default counts all rows via get_testobject_rowcount.
+        """
+        return self.get_testobject_rowcount(testobject) > 0
+
+    def testobjects_have_rows(self, testobjects: List[TestObjectDTO]) -> List[bool]:
+        """Bulk counterpart of testobject_has_rows, results in the given order.
+
+        Used by the testrun pre-pass to check many testobjects in few round-trips.
+        Backends which can probe several tables in one query (e.g. UNION ALL)
+        should override this. Default probes them one by one.
+        """
+        return [self.testobject_has_rows(testobject) for testobject in testobjects]
+
     @abstractmethod
     def get_raw_testobject(self, testobject: TestObjectDTO) -> TestObjectDTO:
         """Given a stage testobject, returns the corresponding raw file testobject."""
@@ -84,10 +116,20 @@ class IBackend(ABC):
         sample_size: int,
         db: DBInstanceDTO,
         cast_to: Optional[SchemaSpecDTO] = None,
-    ) -> List[str]:
+        strategy: SampleStrategy = SampleStrategy.RESERVOIR,
+        seed: int = 0,
+        stratify_by: Optional[str] = None,
+    ) -> List[Tuple]:
         """
         Given a test sql (query), and a list of column names (which must be returned
-        by the query), obtains a random sample of column values of defined size.
+        by the query), obtains a random sample of distinct primary keys of defined
+        size. Keys are tuples of typed values in the order of primary_keys, cast to
+        cast_to if provided, so that backends can match them on native columns.
+            - Keys are sampled with the given strategy; the same seed must yield
+              the same sample for the same data
+            - STRATIFIED samples an equal number of keys per value of the column
+              stratify_by, which must be returned by the query
+            - HASH may return slightly fewer keys than sample_size
             - Client must translate the query via translate_query() first
             - Provided query must contain the expectation as '__expected__ AS ' CTE
         """
@@ -97,7 +139,7 @@ class IBackend(ABC):
         self,
         query: str,
         primary_keys: List[str],
-        key_sample: List[str],
+        key_sample: List[Tuple],
         db: DBInstanceDTO,
         columns: Optional[List[str]] = None,
         cast_to: Optional[SchemaSpecDTO] = None,
@@ -117,7 +159,7 @@ class IBackend(ABC):
         self,
         testobject: TestObjectDTO,
         primary_keys: List[str],
-        key_sample: List[str],
+        key_sample: List[Tuple],
         columns: Optional[List[str]] = None,
         cast_to: Optional[SchemaSpecDTO] = None,
     ) -> pl.DataFrame:
@@ -127,16 +169,117 @@ class IBackend(ABC):
         testobject.
         """
 
+    def get_diff_from_query(
+        self,
+        query: str,
+        testobject: TestObjectDTO,
+        primary_keys: List[str],
+        db: DBInstanceDTO,
+        cast_to: SchemaSpecDTO,
+        max_rows: int,
+    ) -> Tuple[pl.DataFrame, int]:
+        """
+        Compares a test sql (query) with the testobject inside the database, for
+        backends which support pushdown (supports_db_comparison). All columns of
+        cast_to are compared; all testobject rows are matched with all query rows on
+        primary keys, in both directions. Returns rows which differ — at most
+        max_rows of them, ordered by key — and the total number of differing rows.
+            - Client must translate the query via translate_query() first
+            - Provided query must contain the expectation as '__expected__ AS ' CTE
+            - Rows missing in the testobject have '__source__' = 'testobject', rows
+              missing in the query have '__source__' = 'testquery'
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not support comparison in database"
+        )
+
+    def get_bucket_digests(
+        self,
+        query: str,
+        testobject: TestObjectDTO,
+        primary_keys: List[str],
+        db: DBInstanceDTO,
+        cast_to: SchemaSpecDTO,
+        bucket_count: int,
+        level: int,
+        parent_buckets: Optional[List[int]] = None,
+    ) -> Tuple[pl.DataFrame, pl.DataFrame]:
+        """
+        Partitions rows of a test sql (query) and of the testobject into buckets by
+        a hash of their primary keys and returns per-bucket digests of both sides,
+        for backends which support pushdown (supports_db_comparison). Digests are
+        aggregates of row hashes of all columns of cast_to, independent of row order.
+            - Buckets are hierarchical: the bucket of a row at a level is its key
+              hash modulo bucket_count ** (level + 1), so that each bucket splits
+              into bucket_count buckets at the next level
+            - If parent_buckets are given, only rows of these buckets of the
+              previous level are considered
+            - Returned dataframes have columns '__bucket__', '__rows__' and
+              '__digest__'; buckets without rows are omitted
+            - Client must translate the query via translate_query() first
+            - Provided query must contain the expectation as '__expected__ AS ' CTE
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not support comparison in database"
+        )
+
+    def get_rows_from_buckets(
+        self,
+        query: str,
+        testobject: TestObjectDTO,
+        primary_keys: List[str],
+        db: DBInstanceDTO,
+        cast_to: SchemaSpecDTO,
+        bucket_count: int,
+        level: int,
+        buckets: List[int],
+    ) -> Tuple[pl.DataFrame, pl.DataFrame]:
+        """
+        Returns all rows of the given buckets (see get_bucket_digests) of the test
+        sql (query) and of the testobject, with all columns of cast_to.
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not support comparison in database"
+        )
+
+    def reset(self) -> None:
+        """Reset session state between two testcases which share this backend.
+
+        Backends are pooled per testrun and reused by one worker thread for many
+        testcases. Backends which keep session state — e.g. temp tables created
+        while sampling — should override this to discard it, so that no state
+        leaks from one testcase into the next. Default is a no-op.
+        """
+        return None
+
+    def is_healthy(self) -> bool:
+        """Return False if the backend can no longer be used, e.g. lost connection.
+
+        Called between testcases by the backend pool; unhealthy backends are
+        closed and replaced by a fresh one. Must not raise.
+        """
+        return True
+
+    def interrupt(self) -> None:
+        """Abort the query which currently runs on this backend, if any.
+
+        Called from another thread when a testcase exceeds its deadline or its
+        testrun is cancelled; the interrupted call should then raise promptly.
+        Backends whose clients can't abort queries rely on the default no-op —
+        testcases then stop at their next step. Must not raise.
+        """
+        return None
+
     def close(self) -> None:
         """Release any resources held by the backend.
 
         Backends that own external handles — database connections, file
         descriptors, network sockets — should override this to release them
-        promptly. Callers (notably ``TestRun._execute_single_testcase``) invoke
-        ``close()`` after every testcase so resources don't accumulate during a
-        long testrun. Backends without external resources can rely on the
-        default no-op. Implementations must be safe to call more than once and
-        must never raise.
+        promptly. Callers (notably the backend pool of ``TestRun``) invoke
+        ``close()`` at the end of a testrun or when replacing an unhealthy
+        backend, so resources don't accumulate. Backends without external
+        resources can rely on the default no-op. Implementations must be safe
+        to call more than once and must never raise.
         """
         return None
 
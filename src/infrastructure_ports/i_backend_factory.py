@@ -8,3 +8,11 @@ class IBackendFactory(ABC):
     @abstractmethod
     def create(self, domain_config: DomainConfigDTO) -> IBackend:
         """Will dynamically create and parametrize data_platforms based on config"""
+
+    def preferred_concurrency(self) -> int | None:
+        """
+        Preferred concurrency of the backends created by this factory, see
+        IBackend.preferred_concurrency. Allows to respect platform limits before
+        any backend is created. Default: no preference.
+        """
+        return None
@@ -58,22 +58,26 @@ class IDtoStorage(ABC):
         object_type: ObjectType,
         filters: Dict[str, str] | None = None,
         order_by: str | None = None,
+        limit: int | None = None,
     ) -> List[DTO]:
         """
         Lists DTOs of a given type, optionally filtered and ordered.
 
         Supported filters: domain, date (YYYY-MM-DD), testrun_id.
         Supported order_by: "date" only (raises ValueError otherwise).
+        A limit keeps only the most recent DTOs and requires order_by="date";
+        implementations should avoid reading older DTOs at all.
 
         Args:
             object_type: Type of objects to list
             filters: Optional dict of filter criteria
             order_by: Optional ordering field
+            limit: Optional max number of most recent DTOs to return
 
         Returns:
             List of deserialized DTO objects
 
         Raises:
             StorageError: For storage errors
-            ValueError: If order_by is not supported
+            ValueError: If order_by is not supported or limit is given without it
         """
@@ -0,0 +1,52 @@
+from abc import ABC, abstractmethod
+from typing import List
+
+from src.dtos import ShardResultDTO, TestRunShardDTO
+
+
+class IShardQueue(ABC):
+    """
+    Work queue which hands shards of a testrun to worker nodes (processes or hosts)
+    and collects their completion records. Abstracts underlying infrastructure,
+    e.g. a shared filesystem, a message broker or a cloud task queue.
+
+    Claims are leases: a claimed shard whose lease is not renewed within lease_s
+    seconds, e.g. because its worker died, is handed to another worker.
+    """
+
+    lease_s: float
+
+    @abstractmethod
+    def put(self, shard: TestRunShardDTO) -> None:
+        """Enqueues a shard for execution by any worker."""
+
+    @abstractmethod
+    def claim(self) -> TestRunShardDTO | None:
+        """
+        Takes the next pending shard off the queue. Each shard is handed to exactly
+        one worker, also if several workers claim concurrently, until its lease
+        expires. Returns None if no shard is pending.
+        """
+
+    @abstractmethod
+    def renew(self, shard: TestRunShardDTO) -> bool:
+        """
+        Extends the lease on a claimed shard. Returns False if the shard is not
+        claimed anymore, e.g. because its lease expired or it was withdrawn.
+        """
+
+    @abstractmethod
+    def complete(self, result: ShardResultDTO) -> None:
+        """Records that a claimed shard was executed (successfully or not)."""
+
+    @abstractmethod
+    def list_results(self, testrun_id: str) -> List[ShardResultDTO]:
+        """Returns completion records of all completed shards of a testrun."""
+
+    @abstractmethod
+    def withdraw(self, testrun_id: str) -> int:
+        """
+        Removes pending and claimed shards of a testrun, so that no worker starts
+        them (again), e.g. after the testrun was cancelled or timed out. Returns
+        the number of removed shards.
+        """
@@ -78,9 +78,15 @@ class DataTesterClient:
         return [TestObjectDTO.model_validate(o) for o in data]
 
     async def get_testruns(self, domain: str) -> list[TestRunDTO]:
+        # not hydrated: the testrun list only needs testcase summaries
         data: Any = await self._get(f"/{domain}/testrun/")
         return [TestRunDTO.model_validate(r) for r in data]
 
+    async def get_testrun(self, domain: str, testrun_id: str) -> TestRunDTO:
+        # hydrated: the testrun matrix opens full testcase results
+        data: Any = await self._get(f"/{domain}/testrun/{testrun_id}?hydrate=true")
+        return TestRunDTO.model_validate(data)
+
     async def find_specs(self, domain: str, body: FindSpecsDTO) -> TestRunDefDTO:
         data: Any = await self._post(
             f"/{domain}/specification/find", body.model_dump(mode="json")
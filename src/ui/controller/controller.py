@@ -198,6 +198,21 @@ class Controller:
             _log.error("load_testruns(%s): %s", domain, err)
             return err
 
+    async def load_testrun(
+        self, domain: str, testrun_id: str
+    ) -> tuple[TestRunDTO | None, str | None]:
+        """Loads a single testrun with full testcase results, e.g. when it is opened."""
+        try:
+            return await self._client.get_testrun(domain, testrun_id), None
+        except BackendError as exc:
+            err = f"Backend error {exc.status_code}: {exc.detail}"
+            _log.error("load_testrun(%s, %s): %s", domain, testrun_id, err)
+            return None, err
+        except Exception as exc:
+            err = f"Could not reach backend: {exc}"
+            _log.error("load_testrun(%s, %s): %s", domain, testrun_id, err)
+            return None, err
+
     async def load_specs(self, domain: str, force: bool = False) -> str | None:
         if not force and self._is_fresh(domain, "specs"):
             return None
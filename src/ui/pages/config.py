@@ -626,6 +626,24 @@ def register(make_controller: ControllerFactory) -> None:
                                 sample_size_per_object=per_obj_work,
                                 spec_locations=spec_locs_work,
                                 reports_location=reports_loc,
+                                # not editable here yet: keep configured values
+                                compare_mode_default=cfg.compare_mode_default,
+                                compare_mode_per_object=cfg.compare_mode_per_object,
+                                sample_strategy_default=cfg.sample_strategy_default,
+                                sample_strategy_per_object=(
+                                    cfg.sample_strategy_per_object
+                                ),
+                                sample_stratify_by_per_object=(
+                                    cfg.sample_stratify_by_per_object
+                                ),
+                                sample_seed=cfg.sample_seed,
+                                testcase_timeout_s_default=cfg.testcase_timeout_s_default,
+                                testcase_timeout_s_per_testtype=(
+                                    cfg.testcase_timeout_s_per_testtype
+                                ),
+                                testcase_timeout_s_per_object=(
+                                    cfg.testcase_timeout_s_per_object
+                                ),
                             )
                             err = await controller.save_config(domain, new_dto)
                             if err:
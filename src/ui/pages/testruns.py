@@ -5,10 +5,17 @@ import logging
 
 from nicegui import background_tasks, ui
 
-from src.dtos import Result, Status as RunStatus, TestCaseDTO, TestRunDTO, TestType
+from src.dtos import (
+    Result,
+    Status as RunStatus,
+    TestCaseDTO,
+    TestCaseSummaryDTO,
+    TestRunDTO,
+    TestType,
+)
 from src.ui.common import Status as LoadStatus
 from src.ui.components import NavBar, StatusBar, render_testobject_matrix
-from src.ui.controller import ControllerFactory
+from src.ui.controller import Controller, ControllerFactory
 from src.ui.styles import (
     CARD_HEADER_ROW_CLASSES,
     CARD_ITEM_DATE_CLASSES,
@@ -273,8 +280,15 @@ def _render_result_matrix(testrun: TestRunDTO) -> None:
     render_testobject_matrix(rows, columns, cell_fn)
 
 
-def _render_testrun_card(testrun: TestRunDTO) -> None:
-    expanded = {"open": False}
+def _testcase_summaries(testrun: TestRunDTO) -> list[TestCaseSummaryDTO]:
+    """Summaries of the testcases of a listed (not hydrated) testrun."""
+    return testrun.testcase_summaries or [
+        TestCaseSummaryDTO.from_testcase(tc) for tc in testrun.results
+    ]
+
+
+def _render_testrun_card(testrun: TestRunDTO, controller: Controller) -> None:
+    expanded = {"open": False, "loaded": False}
 
     with ui.card().classes(CARD_SURFACE_CLASSES).props("flat"):
         with ui.row().classes(CARD_HEADER_ROW_CLASSES).style("gap: 0.75rem;"):
@@ -326,17 +340,35 @@ def _render_testrun_card(testrun: TestRunDTO) -> None:
             ).props("flat dense round").classes(ICON_BUTTON_PRIMARY_CLASSES)
 
         body = ui.element("div").classes("px-4 pb-3 w-full")
-        with body:
-            _render_result_matrix(testrun)
         body.set_visibility(False)
 
-        def _toggle(_: object = None) -> None:
+        async def _load_results() -> None:
+            # only opened testruns are loaded with their full testcase results
+            with body:
+                ui.label("Loading test results...").classes(
+                    "text-slate-500 text-xs font-mono"
+                )
+            hydrated, err = await controller.load_testrun(testrun.domain, str(testrun.id))
+            body.clear()
+            with body:
+                if hydrated is None:
+                    expanded["loaded"] = False  # retried when opened again
+                    ui.label(f"Could not load test results: {err}").classes(
+                        "text-red-400 text-xs font-mono"
+                    )
+                    return
+                _render_result_matrix(hydrated)
+
+        async def _toggle(_: object = None) -> None:
             expanded["open"] = not expanded["open"]
             body.set_visibility(expanded["open"])
             toggle_btn.props(
                 f"icon={'expand_less' if expanded['open'] else 'expand_more'} "
                 "flat dense round"
             )
+            if expanded["open"] and not expanded["loaded"]:
+                expanded["loaded"] = True
+                await _load_results()
 
         toggle_btn.on("click", _toggle)
 
@@ -460,7 +492,8 @@ def register(make_controller: ControllerFactory) -> None:
                     if run_status and tr.status != run_status:
                         continue
                     if search and not any(
-                        search in tc.testobject.name.lower() for tc in tr.results
+                        search in tc.testobject.name.lower()
+                        for tc in _testcase_summaries(tr)
                     ):
                         continue
                     filtered.append(tr)
@@ -481,7 +514,7 @@ def register(make_controller: ControllerFactory) -> None:
                     return
 
                 for tr in filtered:
-                    _render_testrun_card(tr)
+                    _render_testrun_card(tr, controller)
 
             testrun_list()
 
@@ -0,0 +1,119 @@
+"""
+Benchmark: thread-pool vs process-pool execution of compare testcases.
+
+Runs the same testrun of compare testcases against the demo DWH with both
+TestRunExecutor modes and increasing sample sizes, and prints wall-clock times.
+Process workers pay a fixed start-up cost (interpreter spawn, imports, backend
+creation), so threads win for small samples; with growing sample sizes the
+Polars/Python part of the compare dominates and processes overtake threads.
+
+Not collected by pytest. Run from the project root:
+
+    uv run python -m tests.benchmarks.benchmark_testrun_executor
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from src.domain.testrun.testrun import TestRun
+from src.dtos import (
+    DomainConfigDTO,
+    LocationDTO,
+    TestObjectDTO,
+    TestRunExecutor,
+    TestType,
+)
+from src.dtos.testrun_dtos import TestCaseDefDTO, TestRunDefDTO
+from src.infrastructure.backend.demo import DemoBackendFactory
+from src.infrastructure.storage.dto_storage_file import JsonSerializer, MemoryDtoStorage
+from tests.fixtures.demo.prepare_demo_data import clean_up_demo_data, prepare_demo_data
+from tests.integration.testcase.test_compare_testcase import schema, sql
+
+testobject = TestObjectDTO(
+    domain="payments", stage="test", instance="alpha", name="core_account_payments"
+)
+
+
+def make_testrun_def(sample_size: int, testcases: int) -> TestRunDefDTO:
+    domain_config = DomainConfigDTO(
+        domain="payments",
+        instances={"test": ["alpha"]},
+        spec_locations={"test": ["memory://specs"]},
+        reports_location=LocationDTO("memory://testreports"),
+        compare_datatypes=["int", "string", "bool"],
+        sample_size_default=sample_size,
+        sample_size_per_object={},
+    )
+    definitions = [
+        TestCaseDefDTO(
+            testobject=testobject,
+            testtype=TestType.COMPARE,
+            specs=[schema, sql],
+            domain_config=domain_config,
+            scenario=f"run_{i}",
+        )
+        for i in range(testcases)
+    ]
+    return TestRunDefDTO(
+        testcase_defs=definitions,
+        domain=testobject.domain,
+        stage=testobject.stage,
+        instance=testobject.instance,
+        domain_config=domain_config,
+    )
+
+
+def run(
+    backend_factory: DemoBackendFactory,
+    executor: TestRunExecutor,
+    sample_size: int,
+    testcases: int,
+    workers: int,
+) -> float:
+    dto_storage = MemoryDtoStorage(
+        serializer=JsonSerializer(), storage_location=LocationDTO("memory://bench/")
+    )
+    testrun = TestRun(
+        make_testrun_def(sample_size, testcases),
+        backend_factory,
+        [],
+        dto_storage,
+        max_testrun_threads=workers,
+        executor=executor,
+    )
+    start = time.perf_counter()
+    testrun.execute()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--testcases", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument(
+        "--sample-sizes", type=int, nargs="+", default=[100, 1_000, 10_000, 100_000]
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        location = Path(tmp) / "demo"
+        prepare_demo_data(location)
+        backend_factory = DemoBackendFactory(
+            files_path=str(location / "raw"), db_path=str(location / "dbs")
+        )
+        try:
+            print(f"{'sample size':>12} {'threads [s]':>12} {'processes [s]':>14}")
+            for sample_size in args.sample_sizes:
+                timings = [
+                    run(backend_factory, mode, sample_size, args.testcases, args.workers)
+                    for mode in (TestRunExecutor.THREADS, TestRunExecutor.PROCESSES)
+                ]
+                print(f"{sample_size:>12} {timings[0]:>12.2f} {timings[1]:>14.2f}")
+        finally:
+            clean_up_demo_data(location)
+
+
+if __name__ == "__main__":
+    main()
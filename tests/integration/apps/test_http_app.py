@@ -159,6 +159,29 @@ class TestFullFlowPayments:
         for tc in tr_dto.results:
             assert tc.status.value == "FINISHED"
 
+        # finished testruns can't be resumed, unknown ones are not found
+        resume_resp = client.post(f"/payments/testrun/{testrun_id}/resume")
+        assert resume_resp.status_code == 409
+        resume_resp = client.post("/payments/testrun/unknown-testrun/resume")
+        assert resume_resp.status_code == 404
+        # only running testruns can be cancelled
+        cancel_resp = client.post(f"/payments/testrun/{testrun_id}/cancel")
+        assert cancel_resp.status_code == 409
+        cancel_resp = client.post("/payments/testrun/unknown-testrun/cancel")
+        assert cancel_resp.status_code == 404
+
+        # rerunning failures only executes the NOK stagecount testcase
+        rerun_resp = client.post(f"/payments/testrun/{testrun_id}/rerun-failures")
+        assert rerun_resp.status_code == 202
+        rerun_id = rerun_resp.json()["testrun_id"]
+        rerun_dto = TestRunDTO.from_json(
+            client.get(f"/payments/testrun/{rerun_id}").content
+        )
+        assert str(rerun_dto.rerun_of) == testrun_id
+        assert [(tc.testobject.name, tc.testtype.value) for tc in rerun_dto.results] == [
+            ("stage_transactions", "STAGECOUNT")
+        ]
+
         # 6. Verify individual testcase persistence
         for tc in tr_dto.results:
             tc_get_resp = client.get(f"/payments/testcase/{tc.id}")
@@ -1,7 +1,10 @@
 from uuid import uuid4
 
+import pytest
+
 from src.domain.testrun.testcases import CompareTestCase
 from src.dtos import (
+    CompareMode,
     CompareSpecDTO,
     LocationDTO,
     SchemaSpecDTO,
@@ -51,7 +54,11 @@ testobject = TestObjectDTO(
 )
 
 
-def test_straight_through_execution(domain_config, demo_data: DemoData):
+@pytest.mark.parametrize("compare_mode", list(CompareMode))
+def test_straight_through_execution(domain_config, demo_data: DemoData, compare_mode):
+    domain_config = domain_config.model_copy(
+        update={"compare_mode_default": compare_mode}
+    )
     definition = TestCaseDefDTO(
         testobject=testobject,
         testtype=TestType.COMPARE,
@@ -15,6 +15,7 @@ from src.dtos import (
     ReportArtifact,
     ReportArtifactFormat,
     TestCaseDTO,
+    TestCaseSummaryDTO,
     TestRunDTO,
 )
 from src.infrastructure.storage.dto_storage_file import JsonSerializer, MemoryDtoStorage
@@ -95,6 +96,22 @@ class TestReport:
         assert isinstance(artifact, bytes)
         assert artifact.startswith(b"PK\x03\x04")
 
+    def test_create_testrun_report_artifact_from_delta_testrun(
+        self, report, dto_storage, testrun: TestRunDTO, testcase_result: TestCaseDTO
+    ):
+        dto_storage.write_dto(testcase_result)
+        summary = TestCaseSummaryDTO.from_testcase(testcase_result)
+        delta_testrun = testrun.model_copy(
+            update={"results": [], "testcase_summaries": [summary]}
+        )
+        dto_storage.write_dto(delta_testrun)
+
+        artifact = report.create_testrun_report_artifact(
+            testrun_id=str(testrun.id),
+            artifact_format=ReportArtifactFormat.XLSX,
+        )
+        assert artifact.startswith(b"PK\x03\x04")
+
     def test_create_testcase_artifact_no_formatter(
         self, report, dto_storage, testcase_result: TestCaseDTO
     ):
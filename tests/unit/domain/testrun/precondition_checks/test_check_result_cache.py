@@ -0,0 +1,73 @@
+import pickle
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.domain.testrun.precondition_checks import CheckResultCache
+
+
+class TestCheckResultCache:
+    def test_outcomes_are_computed_once_per_key(self):
+        cache = CheckResultCache()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return True, ""
+
+        assert cache.get_or_compute("a", compute) == (True, "")
+        assert cache.get_or_compute("a", compute) == (True, "")
+        assert cache.get_or_compute("b", compute) == (True, "")
+        assert len(calls) == 2
+        assert (cache.hits, cache.misses) == (1, 2)
+
+    def test_concurrent_lookups_wait_for_in_flight_lookup(self):
+        cache = CheckResultCache()
+        calls = []
+
+        def slow_compute():
+            calls.append(1)
+            time.sleep(0.1)
+            return False, "Testobject is empty!"
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            outcomes = list(
+                executor.map(lambda _: cache.get_or_compute("a", slow_compute), range(8))
+            )
+
+        assert len(calls) == 1
+        assert outcomes == [(False, "Testobject is empty!")] * 8
+
+    def test_failed_lookups_are_not_cached(self):
+        cache = CheckResultCache()
+        started = threading.Event()
+
+        def failing():
+            started.set()
+            time.sleep(0.05)
+            raise ConnectionError("connection reset")
+
+        def waiting():
+            started.wait()
+            return cache.get_or_compute("a", lambda: (True, ""))
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            failed = executor.submit(cache.get_or_compute, "a", failing)
+            waited = executor.submit(waiting)
+
+            with pytest.raises(ConnectionError):
+                failed.result()
+            assert waited.result() == (True, "")  # waiter ran the check itself
+
+    def test_pickled_cache_keeps_known_outcomes(self):
+        cache = CheckResultCache()
+        cache.get_or_compute("a", lambda: (True, ""))
+        cache.put("b", (False, "Testobject is empty!"))
+
+        copy = pickle.loads(pickle.dumps(cache))
+
+        assert copy.get_or_compute("a", lambda: (False, "")) == (True, "")
+        assert copy.peek("b") == (False, "Testobject is empty!")
+        assert copy.peek("c") is None
@@ -1,6 +1,10 @@
 from typing import Dict
 
-from src.domain.testrun.precondition_checks import Checkable, CheckTestObjectExists
+from src.domain.testrun.precondition_checks import (
+    Checkable,
+    CheckResultCache,
+    CheckTestObjectExists,
+)
 from src.dtos import Importance, TestObjectDTO
 from src.infrastructure.backend.dummy import DummyBackend
 
@@ -55,3 +59,23 @@ class TestCheckTestObjectExists:
 
         assert result is False
         assert checkable.summary == "Testobject testobject_not_exists not found!"
+
+    def test_cached_check_lists_testobjects_once(self):
+        calls = []
+
+        def counting_list_testobjects(*args, **kwargs):
+            calls.append(1)
+            return _TESTOBJECTS
+
+        cache = CheckResultCache()
+        checkables = [DummyCheckable() for _ in range(3)]
+        for checkable in checkables:
+            checkable.testobject.name = "testobject_not_exists"
+            checkable.backend.list_testobjects = counting_list_testobjects  # ty: ignore[invalid-assignment]
+
+        results = [CheckTestObjectExists().check(c, cache=cache) for c in checkables]
+
+        assert results == [False, False, False]
+        assert len(calls) == 1
+        for checkable in checkables:  # summary is replayed from the cache
+            assert checkable.summary == "Testobject testobject_not_exists not found!"
@@ -51,3 +51,17 @@ class TestCheckTestObjectNotEmpty:
         check_result = checker._check(checkable)
 
         assert check_result is True
+
+    def test_rows_are_probed_without_counting(self):
+        checkable = DummyCheckable()
+
+        def get_testobject_rowcount(testobject: TestObjectDTO, *args, **kwargs) -> int:
+            raise AssertionError("testobject must not be counted")
+
+        def testobject_has_rows(testobject: TestObjectDTO) -> bool:
+            return True
+
+        checkable.backend.get_testobject_rowcount = get_testobject_rowcount  # ty: ignore[invalid-assignment]
+        checkable.backend.testobject_has_rows = testobject_has_rows  # ty: ignore[invalid-assignment]
+
+        assert CheckTestObjectNotEmpty()._check(checkable) is True
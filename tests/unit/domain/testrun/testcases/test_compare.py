@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Tuple
 
 import polars as pl
 import pytest
@@ -10,8 +10,10 @@ from src.domain.testrun.testcases.compare import (
     SchemaMismatchError,
 )
 from src.dtos import (
+    CompareMode,
     CompareSpecDTO,
     LocationDTO,
+    SampleStrategy,
     SchemaSpecDTO,
     SpecType,
     TestType,
@@ -39,7 +41,6 @@ class TestCompareTestCase:
             "a": [1, 2, 3],
             "b": ["this", "that", "other"],
             "c": [True, False, True],
-            "__concat_key__": ["1|this", "2|that", "3|other"],
         }
     )
 
@@ -52,11 +53,11 @@ class TestCompareTestCase:
 
         testcase_.backend.get_schema_from_query = get_schema_from_query
 
-        def get_sample_keys_(query, *args, **kwargs) -> List[str]:
+        def get_sample_keys_(query, *args, **kwargs) -> List[Tuple]:
             if "exception" in query:
                 raise CompareTestCaseError("This is a simulated exception.")
             else:
-                return self.data.select("__concat_key__").to_series().to_list()
+                return self.data.select("a", "b").rows()
 
         testcase_.backend.get_sample_keys = get_sample_keys_
 
@@ -118,6 +119,88 @@ class TestCompareTestCase:
         assert "compare_diff" in testcase.diff
         assert testcase.summary == "Testobject differs from SQL in 1 row(s)."
 
+    def test_differing_values_are_attributed_to_columns(self, testcase):
+        changed = self.data[:-1].with_columns(
+            pl.when(pl.col("a") == 1).then(False).otherwise(pl.col("c")).alias("c")
+        )
+        testcase.backend.get_sample_from_query = lambda *args, **kwargs: changed
+
+        testcase._execute()
+
+        assert testcase.diff["column_diff"] == {
+            "a": [1],
+            "b": ["this"],
+            "__column__": ["c"],
+            "__expected__": ["false"],
+            "__actual__": ["true"],
+        }
+        assert testcase.diff["compare_diff"]["a"] == [3]
+        assert {"Differing values in column c": 1} in testcase.facts
+        assert testcase.summary == "Testobject differs from SQL in 3 row(s)."
+
+    def test_column_counts_of_trimmed_diff_are_labelled(self, testcase):
+        changed = self.data[:-1].with_columns(
+            pl.when(pl.col("a") == 1).then(False).otherwise(pl.col("c")).alias("c")
+        )
+        testcase.backend.get_sample_from_query = lambda *args, **kwargs: changed
+        testcase.max_diff_rows = 2
+
+        testcase._execute()
+
+        assert testcase.summary == "Testobject differs from SQL in 3 row(s)."
+        assert {
+            "Differing values in column c (among 2 of 3 differing rows)": 1
+        } in testcase.facts
+        assert not any("Differing values in column c" in f for f in testcase.facts)
+
+    def record_sample_keys(self, testcase) -> List[dict]:
+        calls: List[dict] = []
+
+        def get_sample_keys_(**kwargs) -> List[Tuple]:
+            calls.append(kwargs)
+            return self.data.select("a", "b").rows()
+
+        testcase.backend.get_sample_keys = get_sample_keys_
+        return calls
+
+    def test_sample_seed_is_recorded_in_details(self, testcase):
+        calls = self.record_sample_keys(testcase)
+
+        testcase._execute()
+
+        seed = calls[0]["seed"]
+        assert calls[0]["strategy"] == SampleStrategy.RESERVOIR
+        assert {"Sample strategy": "RESERVOIR"} in testcase.details
+        assert {"Sample seed": seed} in testcase.details
+
+    def test_configured_sample_seed_and_strategy_are_used(self, testcase):
+        name = testcase.testobject.name
+        testcase.domain_config = testcase.domain_config.model_copy(
+            update={
+                "sample_seed": 42,
+                "sample_strategy_per_object": {name: SampleStrategy.STRATIFIED},
+                "sample_stratify_by_per_object": {name: "c"},
+            }
+        )
+        calls = self.record_sample_keys(testcase)
+
+        testcase._execute()
+
+        assert calls[0]["seed"] == 42
+        assert calls[0]["strategy"] == SampleStrategy.STRATIFIED
+        assert calls[0]["stratify_by"] == "c"
+
+    def test_stratified_sampling_without_column_falls_back(self, testcase):
+        testcase.domain_config = testcase.domain_config.model_copy(
+            update={"sample_strategy_default": SampleStrategy.STRATIFIED}
+        )
+        calls = self.record_sample_keys(testcase)
+
+        testcase._execute()
+
+        assert calls[0]["strategy"] == SampleStrategy.RESERVOIR
+        assert any("Warning" in fact for fact in testcase.facts)
+
     def test_get_schema_from_query_failure(self, testcase):
         def raise_error(*args, **kwargs):
             raise RuntimeError("backend timeout")
@@ -179,3 +262,239 @@ class TestCompareTestCase:
 
         with pytest.raises(SchemaMismatchError):
             testcase._execute()
+
+    def test_only_first_diff_rows_are_kept_but_all_are_counted(self, testcase):
+        expected = pl.DataFrame({"a": [3, 1, 2, 4], "b": ["x", "y", "z", "w"]})
+        actual = expected.with_columns(pl.col("b") + "_changed")
+        testcase.max_diff_rows = 3
+
+        diff, diff_count = testcase._compare(expected.lazy(), actual.lazy())
+
+        assert diff_count == 8
+        assert diff["a"].to_list() == [1, 1, 2]
+        assert diff["__source__"].to_list() == ["testobject", "testquery", "testobject"]
+
+    def test_columns_which_cant_be_cast_are_compared_as_strings(self, testcase):
+        expected = pl.DataFrame({"a": [1, 2], "b": ["x", "y"]})
+        actual = pl.DataFrame({"a": ["1", "two"], "b": ["x", "y"]})
+
+        diff, diff_count = testcase._compare(expected, actual)
+
+        assert diff_count == 2
+        assert diff["a"].to_list() == ["2", "two"]
+
+    @staticmethod
+    def make_pushdown(testcase):
+        testcase.domain_config = testcase.domain_config.model_copy(
+            update={"compare_mode_default": CompareMode.PUSHDOWN}
+        )
+        testcase.backend.supports_db_comparison = True
+
+    def test_pushdown_loads_only_diff(self, testcase):
+        calls = []
+
+        def get_diff_from_query(*args, **kwargs):
+            calls.append(kwargs)
+            return self.data[:1].with_columns(pl.lit("testquery").alias("__source__")), 7
+
+        def fail(*args, **kwargs):
+            raise AssertionError("samples must not be loaded in pushdown mode")
+
+        self.make_pushdown(testcase)
+        testcase.backend.get_diff_from_query = get_diff_from_query
+        testcase.backend.get_sample_from_query = fail
+        testcase.backend.get_sample_from_testobject = fail
+
+        testcase._execute()
+
+        assert calls[0]["max_rows"] == testcase.max_diff_rows
+        assert calls[0]["primary_keys"] == ["a", "b"]
+        assert testcase.result == testcase.result.NOK
+        assert testcase.summary == "Testobject differs from SQL in 7 row(s)."
+        assert testcase.diff["compare_diff"]["__source__"] == ["testquery"]
+        assert {"Compare mode": "pushdown"} in testcase.facts
+
+    def test_pushdown_without_diff(self, testcase):
+        def get_diff_from_query(*args, **kwargs):
+            return self.data.clear(), 0
+
+        self.make_pushdown(testcase)
+        testcase.backend.get_diff_from_query = get_diff_from_query
+
+        testcase._execute()
+
+        assert testcase.result == testcase.result.OK
+        assert testcase.summary == "Testobject equals test sql."
+
+    def test_pushdown_failure(self, testcase):
+        self.make_pushdown(testcase)  # dummy backend can't compare
+
+        with pytest.raises(QueryExecutionError) as err:
+            testcase._execute()
+
+        assert "Error while comparing test query with testobject" in str(err)
+
+    def test_sample_mode_samples_with_pushdown_backend(self, testcase):
+        def fail(*args, **kwargs):
+            raise AssertionError("diff must not be computed in sample mode")
+
+        testcase.backend.supports_db_comparison = True
+        testcase.backend.get_diff_from_query = fail
+
+        testcase._execute()
+
+        assert testcase.result == testcase.result.OK
+        assert "from testobject equals sample from test sql" in testcase.summary
+        assert any("Specified sample size" in detail for detail in testcase.details)
+
+    def test_pushdown_falls_back_to_samples(self, testcase):
+        self.make_pushdown(testcase)
+        testcase.backend.supports_db_comparison = False
+
+        testcase._execute()
+
+        assert "from testobject equals sample from test sql" in testcase.summary
+        assert any("Warning" in fact for fact in testcase.facts)
+
+    def make_reconciling(self, testcase, digests, rows):
+        """Lets the backend serve bucket digests per level and rows of buckets."""
+        calls = []
+
+        def get_bucket_digests(*args, level, parent_buckets, **kwargs):
+            calls.append(("digests", level, parent_buckets))
+            return digests[level]
+
+        def get_rows_from_buckets(*args, level, buckets, **kwargs):
+            calls.append(("rows", level, buckets))
+            return rows
+
+        testcase.domain_config = testcase.domain_config.model_copy(
+            update={"compare_mode_default": CompareMode.RECONCILE}
+        )
+
+        def get_diff_from_query(*args, max_rows, **kwargs):
+            calls.append(("diff", max_rows))
+            return self.data[:1].with_columns(pl.lit("testquery").alias("__source__")), 3
+
+        testcase.backend.supports_db_comparison = True
+        testcase.backend.get_bucket_digests = get_bucket_digests
+        testcase.backend.get_rows_from_buckets = get_rows_from_buckets
+        testcase.backend.get_diff_from_query = get_diff_from_query
+        return calls
+
+    @staticmethod
+    def digests(buckets, rows, digests):
+        return pl.DataFrame(
+            {"__bucket__": buckets, "__rows__": rows, "__digest__": digests},
+            schema={
+                "__bucket__": pl.UInt64,
+                "__rows__": pl.Int64,
+                "__digest__": pl.Int64,
+            },
+        )
+
+    def test_reconciliation_without_differing_buckets(self, testcase):
+        equal = self.digests([0, 1], [10, 20], [111, 222])
+        calls = self.make_reconciling(testcase, {0: (equal, equal)}, None)
+
+        testcase._execute()
+
+        assert calls == [("digests", 0, None)]
+        assert testcase.result == testcase.result.OK
+        assert {"Compare mode": "reconciliation"} in testcase.facts
+
+    def test_reconciliation_loads_rows_of_differing_buckets(self, testcase):
+        expected = self.digests([0, 1, 2], [10, 20, 1], [111, 222, 333])
+        actual = self.digests([0, 1], [10, 20], [111, 999])
+        rows = (self.data, self.data[:-1])
+        calls = self.make_reconciling(testcase, {0: (expected, actual)}, rows)
+
+        testcase._execute()
+
+        assert calls == [("digests", 0, None), ("rows", 0, [1, 2])]
+        assert testcase.result == testcase.result.NOK
+        assert testcase.summary == "Testobject differs from SQL in 1 row(s)."
+        assert {"Differing buckets at level 0": 2} in testcase.details
+
+    def test_reconciliation_drills_down_into_large_buckets(self, testcase):
+        testcase.max_bucket_rows = 15
+        level_0 = (
+            self.digests([0, 1], [10, 20], [1, 2]),
+            self.digests([0, 1], [10, 20], [1, 3]),
+        )
+        level_1 = (
+            self.digests([1, 257], [10, 10], [4, 5]),
+            self.digests([1, 257], [10, 10], [4, 6]),
+        )
+        rows = (self.data, self.data)
+        calls = self.make_reconciling(testcase, {0: level_0, 1: level_1}, rows)
+
+        testcase._execute()
+
+        assert calls == [
+            ("digests", 0, None),
+            ("digests", 1, [1]),
+            ("rows", 1, [257]),
+        ]
+        assert testcase.result == testcase.result.OK  # loaded rows don't differ
+
+    def test_reconciliation_derives_bucket_count_from_rowcount(self, testcase):
+        equal = self.digests([0], [10], [111])
+        counts = []
+
+        def get_bucket_digests(*args, bucket_count, **kwargs):
+            counts.append(bucket_count)
+            return equal, equal
+
+        self.make_reconciling(testcase, {}, None)
+        testcase.backend.get_bucket_digests = get_bucket_digests
+        for rowcount in (10, 100_000, 10**9):
+            testcase.backend.get_testobject_rowcount = (
+                lambda *args, rowcount=rowcount, **kwargs: rowcount
+            )
+            testcase._execute()
+
+        assert counts == [testcase.min_bucket_count, 100, testcase.max_bucket_count]
+
+    def test_reconciliation_with_widespread_differences_diffs_in_backend(self, testcase):
+        testcase.max_bucket_rows = 15
+        level_0 = (
+            self.digests([0, 1, 2], [10, 10, 10], [1, 2, 3]),
+            self.digests([0, 1, 2], [10, 10, 10], [1, 4, 5]),
+        )
+        calls = self.make_reconciling(testcase, {0: level_0}, None)
+
+        testcase._execute()
+
+        assert calls == [("digests", 0, None), ("diff", testcase.max_diff_rows)]
+        assert testcase.summary == "Testobject differs from SQL in 3 row(s)."
+        assert any("Reconciliation" in fact for fact in testcase.facts)
+
+    def test_reconciliation_caps_rows_loaded_at_last_level(self, testcase):
+        testcase.max_bucket_rows = 15
+        testcase.max_bucket_levels = 1
+        level_0 = (
+            self.digests([0, 1], [10, 20], [1, 2]),
+            self.digests([0, 1], [10, 20], [1, 3]),
+        )
+        calls = self.make_reconciling(testcase, {0: level_0}, None)
+
+        testcase._execute()
+
+        assert calls == [("digests", 0, None), ("diff", testcase.max_diff_rows)]
+        assert testcase.result == testcase.result.NOK
+
+    def test_reconciliation_falls_back_to_samples(self, testcase):
+        testcase.domain_config = testcase.domain_config.model_copy(
+            update={
+                "compare_mode_per_object": {
+                    testcase.testobject.name: CompareMode.RECONCILE
+                }
+            }
+        )
+
+        testcase._execute()
+
+        assert testcase.result == testcase.result.OK
+        assert "from testobject equals sample from test sql" in testcase.summary
+        assert any("Warning" in fact for fact in testcase.facts)
@@ -1,5 +1,10 @@
+import threading
+
+from src.domain.testrun.cancellation import CancellationToken
 from src.domain.testrun.precondition_checks import Checkable, IPreconditionChecker
+from src.domain.testrun.retry_policy import RetryPolicy
 from src.dtos import SpecType, TestCaseDTO, TestType
+from src.infrastructure_ports import TransientBackendError
 
 
 class DummyChecker(IPreconditionChecker):
@@ -93,6 +98,130 @@ class TestExecutingTestcases:
         assert testcase.result.name == "OK"
         assert isinstance(result, TestCaseDTO)
 
+    def make_hanging(self, testcase):
+        """Lets the testcase block in _execute until the backend is interrupted."""
+        interrupted = threading.Event()
+
+        def hang(*args, **kwargs):
+            if not interrupted.wait(timeout=5):
+                raise AssertionError("backend was not interrupted")
+            raise RuntimeError("query interrupted")
+
+        testcase._execute = hang
+        testcase.backend.interrupt = interrupted.set
+        testcase.required_specs = []
+        testcase.preconditions = []
+        return interrupted
+
+    def test_execution_exceeding_deadline(self, testcase_creator):
+        testcase = testcase_creator.create(ttype=TestType.DUMMY_OK)
+        testcase.domain_config = testcase.domain_config.model_copy(
+            update={"testcase_timeout_s_per_testtype": {"DUMMY_OK": 0.05}}
+        )
+        interrupted = self.make_hanging(testcase)
+
+        result = testcase.execute(checker=DummyChecker())
+
+        assert interrupted.is_set()
+        assert result.status.name == "ERROR"
+        assert result.result.name == "NA"
+        assert result.summary == "Stopped test execution: Testcase timed out after 0.05 s"
+
+    def test_execution_within_deadline(self, testcase_creator):
+        testcase = testcase_creator.create(ttype=TestType.DUMMY_OK)
+        testcase.domain_config = testcase.domain_config.model_copy(
+            update={"testcase_timeout_s_default": 5.0}
+        )
+        testcase.required_specs = []
+        testcase.preconditions = []
+
+        result = testcase.execute(checker=DummyChecker())
+
+        assert result.status.name == "FINISHED"
+        assert not testcase.cancellation.cancelled  # deadline is disarmed
+
+    def test_execution_cancelled_by_testrun(self, testcase_creator):
+        testcase = testcase_creator.create(ttype=TestType.DUMMY_OK)
+        interrupted = self.make_hanging(testcase)
+        cancellation = CancellationToken()
+        threading.Timer(0.05, cancellation.cancel, args=("Testrun cancelled",)).start()
+
+        result = testcase.execute(checker=DummyChecker(), cancellation=cancellation)
+
+        assert interrupted.is_set()
+        assert result.status.name == "ABORTED"
+        assert result.summary == "Stopped test execution: Testrun cancelled"
+
+    def make_failing(self, testcase, errors):
+        """Lets _execute raise the given errors first and then run as usual."""
+        execute = testcase._execute
+        calls = []
+
+        def fail_first(*args, **kwargs):
+            calls.append(1)
+            if len(calls) <= len(errors):
+                testcase.facts.append({"stale": "fact"})
+                raise errors[len(calls) - 1]
+            return execute(*args, **kwargs)
+
+        testcase._execute = fail_first
+        testcase.required_specs = []
+        testcase.preconditions = []
+        return calls
+
+    def no_backoff(self, monkeypatch, **kwargs):
+        monkeypatch.setattr(RetryPolicy, "base_delay_s", 0.0)
+        return RetryPolicy(**kwargs)
+
+    def test_execution_retrying_transient_errors(self, testcase_creator, monkeypatch):
+        testcase = testcase_creator.create(ttype=TestType.DUMMY_OK)
+        errors = [TransientBackendError("connection reset")] * 2
+        calls = self.make_failing(testcase, errors)
+        retry_policy = self.no_backoff(monkeypatch, max_attempts=3)
+
+        result = testcase.execute(checker=DummyChecker(), retry_policy=retry_policy)
+
+        assert len(calls) == 3
+        assert result.status.name == "FINISHED"
+        assert result.result.name == "OK"
+        assert {"stale": "fact"} not in result.facts
+        assert {"Retries of test execution": 2} in result.details
+        assert retry_policy.testrun_budget.spent == 2
+
+    def test_execution_giving_up_after_max_attempts(self, testcase_creator, monkeypatch):
+        testcase = testcase_creator.create(ttype=TestType.DUMMY_OK)
+        calls = self.make_failing(testcase, [TransientBackendError("timeout")] * 3)
+        retry_policy = self.no_backoff(monkeypatch, max_attempts=2)
+
+        result = testcase.execute(checker=DummyChecker(), retry_policy=retry_policy)
+
+        assert len(calls) == 2
+        assert result.status.name == "ERROR"
+        assert {"Retries of test execution": 1} in result.details
+
+    def test_execution_not_retrying_permanent_errors(self, testcase_creator, monkeypatch):
+        testcase = testcase_creator.create(ttype=TestType.DUMMY_OK)
+        calls = self.make_failing(testcase, [ValueError("syntax error")])
+        retry_policy = self.no_backoff(monkeypatch)
+
+        result = testcase.execute(checker=DummyChecker(), retry_policy=retry_policy)
+
+        assert len(calls) == 1
+        assert result.status.name == "ERROR"
+        assert retry_policy.testrun_budget.spent == 0
+
+    def test_execution_stopping_retries_when_budget_is_spent(
+        self, testcase_creator, monkeypatch
+    ):
+        testcase = testcase_creator.create(ttype=TestType.DUMMY_OK)
+        calls = self.make_failing(testcase, [TransientBackendError("reset")] * 2)
+        retry_policy = self.no_backoff(monkeypatch, budget_per_testrun=1)
+
+        result = testcase.execute(checker=DummyChecker(), retry_policy=retry_policy)
+
+        assert len(calls) == 2
+        assert result.status.name == "ERROR"
+
     def test_adding_details(self, testcase_creator):
         testcase = testcase_creator.create(ttype=TestType.DUMMY_OK)
         detail_1 = {"detail1": "data_1"}
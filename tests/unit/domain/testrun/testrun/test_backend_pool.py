@@ -0,0 +1,114 @@
+import threading
+from typing import List, cast
+
+import pytest
+from src.domain.testrun.backend_pool import BackendPool, BackendPoolError
+from src.infrastructure.backend.dummy import DummyBackend, DummyBackendFactory
+
+
+class TrackingBackend(DummyBackend):
+    """Dummy backend which records lifecycle calls."""
+
+    def __init__(self):
+        super().__init__()
+        self.resets = 0
+        self.closed = False
+        self.healthy = True
+
+    def reset(self) -> None:
+        self.resets += 1
+
+    def is_healthy(self) -> bool:
+        return self.healthy
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class TrackingBackendFactory(DummyBackendFactory):
+    def __init__(self):
+        self.created: List[TrackingBackend] = []
+
+    def create(self, domain_config) -> TrackingBackend:
+        backend = TrackingBackend()
+        self.created.append(backend)
+        return backend
+
+
+class TestBackendPool:
+    @pytest.fixture
+    def factory(self) -> TrackingBackendFactory:
+        return TrackingBackendFactory()
+
+    def test_idle_backend_is_reused(self, factory, domain_config):
+        pool = BackendPool(factory, domain_config, size=2)
+
+        first = cast(TrackingBackend, pool.acquire())
+        pool.recycle(first)
+        second = pool.acquire()
+
+        assert first is second
+        assert len(factory.created) == 1
+        assert first.resets == 1
+
+    def test_concurrent_leases_get_distinct_backends(self, factory, domain_config):
+        pool = BackendPool(factory, domain_config, size=3)
+        leased = []
+
+        def lease():
+            leased.append(pool.acquire())
+
+        threads = [threading.Thread(target=lease) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len({id(backend) for backend in leased}) == 3
+        assert pool.leased == 3
+
+    def test_pool_cannot_grow_beyond_size(self, factory, domain_config):
+        pool = BackendPool(factory, domain_config, size=1)
+        pool.acquire()
+
+        with pytest.raises(BackendPoolError):
+            pool.acquire()
+        assert len(factory.created) == 1
+
+    def test_leases_are_not_bound_to_threads(self, factory, domain_config):
+        pool = BackendPool(factory, domain_config, size=1)
+        first = pool.acquire()
+
+        worker = threading.Thread(target=lambda: pool.recycle(first))
+        worker.start()
+        worker.join()
+
+        assert pool.acquire() is first
+
+    def test_unhealthy_backend_is_replaced(self, factory, domain_config):
+        pool = BackendPool(factory, domain_config, size=1)
+        first = cast(TrackingBackend, pool.acquire())
+        first.healthy = False
+
+        pool.recycle(first)
+        second = pool.acquire()
+
+        assert first.closed
+        assert second is not first
+        assert pool.leased == 1
+
+    def test_close_closes_all_backends(self, factory, domain_config):
+        pool = BackendPool(factory, domain_config, size=1)
+        backend = cast(TrackingBackend, pool.acquire())
+
+        pool.close()
+
+        assert backend.closed
+        assert pool.leased == 0
+
+    def test_acquiring_from_closed_pool_fails(self, factory, domain_config):
+        pool = BackendPool(factory, domain_config, size=1)
+        pool.close()
+
+        with pytest.raises(BackendPoolError):
+            pool.acquire()
@@ -0,0 +1,50 @@
+import pytest
+from src.domain.testrun.cancellation import CancellationToken, CancelledError
+
+
+class TestCancellationToken:
+    def test_cancel_runs_callbacks_once_and_keeps_first_reason(self):
+        token = CancellationToken()
+        calls = []
+        token.register(lambda: calls.append("interrupt"))
+
+        token.cancel("timed out")
+        token.cancel("cancelled")
+
+        assert token.cancelled
+        assert token.reason == "timed out"
+        assert calls == ["interrupt"]
+        with pytest.raises(CancelledError, match="timed out"):
+            token.raise_if_cancelled()
+
+    def test_unregistered_callbacks_are_not_called(self):
+        token = CancellationToken()
+        calls = []
+        unregister = token.register(lambda: calls.append("interrupt"))
+
+        unregister()
+        token.cancel("cancelled")
+
+        assert calls == []
+
+    def test_register_on_cancelled_token_calls_immediately(self):
+        token = CancellationToken()
+        token.cancel("cancelled")
+        calls = []
+
+        token.register(lambda: calls.append("interrupt"))
+
+        assert calls == ["interrupt"]
+
+    def test_failing_callback_does_not_stop_others(self):
+        token = CancellationToken()
+        calls = []
+
+        def fail():
+            raise RuntimeError("boom")
+
+        token.register(fail)
+        token.register(lambda: calls.append("interrupt"))
+        token.cancel("cancelled")
+
+        assert calls == ["interrupt"]
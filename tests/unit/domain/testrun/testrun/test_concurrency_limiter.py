@@ -0,0 +1,58 @@
+from uuid import uuid4
+
+import pytest
+from src.domain.testrun.concurrency_limiter import ConcurrencyLimiter
+from src.dtos import TestType
+from src.dtos.testrun_dtos import TestCaseDefDTO
+
+
+class TestConcurrencyLimiter:
+    @pytest.fixture
+    def platform(self) -> str:
+        return f"platform-{uuid4()}"  # slots are shared per platform across limiters
+
+    @pytest.fixture
+    def make_definition(self, testobject, domain_config):
+        def make(name: str = testobject.name) -> TestCaseDefDTO:
+            return TestCaseDefDTO(
+                testobject=testobject.model_copy(update={"name": name}),
+                testtype=TestType.SCHEMA,
+                specs=[],
+                domain_config=domain_config,
+            )
+
+        return make
+
+    def test_global_limit(self, platform, make_definition):
+        limiter = ConcurrencyLimiter(global_limit=2, platform=platform)
+
+        acquired = [limiter.try_acquire(make_definition(str(i))) for i in range(3)]
+
+        assert acquired == [True, True, False]
+
+    def test_testobject_limit(self, platform, make_definition):
+        limiter = ConcurrencyLimiter(
+            global_limit=4, platform=platform, testobject_limit=1
+        )
+        busy, other = make_definition("busy"), make_definition("other")
+
+        assert limiter.try_acquire(busy)
+        assert not limiter.try_acquire(busy)
+        assert limiter.try_acquire(other)
+        limiter.release(busy)
+        assert limiter.try_acquire(busy)
+
+    def test_platform_limit_is_shared_across_limiters(self, platform, make_definition):
+        first = ConcurrencyLimiter(global_limit=4, platform=platform, platform_limit=2)
+        second = ConcurrencyLimiter(global_limit=4, platform=platform, platform_limit=2)
+
+        assert first.try_acquire(make_definition("a"))
+        assert second.try_acquire(make_definition("b"))
+        assert not second.try_acquire(make_definition("c"))
+        # other platforms are not affected
+        third = ConcurrencyLimiter(global_limit=4, platform=f"{platform}-other")
+        assert third.try_acquire(make_definition("c"))
+
+    def test_limits_must_be_positive(self, platform):
+        with pytest.raises(ValueError):
+            ConcurrencyLimiter(global_limit=4, platform=platform, testobject_limit=0)
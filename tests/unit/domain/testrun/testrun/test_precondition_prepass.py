@@ -0,0 +1,109 @@
+from typing import List
+from uuid import uuid4
+
+import pytest
+
+from src.domain.testrun.precondition_checks import (
+    CheckResultCache,
+    PreConditionChecker,
+)
+from src.domain.testrun.precondition_prepass import PreconditionPrePass
+from src.domain.testrun.testcases import TestCaseCreator
+from src.dtos import DBInstanceDTO, Status, TestObjectDTO, TestType
+from src.dtos.testrun_dtos import TestCaseDefDTO
+from src.infrastructure.backend.dummy import DummyBackend
+
+
+class CountingBackend(DummyBackend):
+    """testobject1 has rows, testobject2 is empty, any other testobject is missing"""
+
+    def __init__(self) -> None:
+        self.listed: List[DBInstanceDTO] = []
+        self.probed: List[List[str]] = []
+
+    def list_testobjects(self, db: DBInstanceDTO) -> List[TestObjectDTO]:
+        self.listed.append(db)
+        return super().list_testobjects(db)
+
+    def testobjects_have_rows(self, testobjects: List[TestObjectDTO]) -> List[bool]:
+        self.probed.append([testobject.name for testobject in testobjects])
+        return [testobject.name == "testobject1" for testobject in testobjects]
+
+
+class TestPreconditionPrePass:
+    @pytest.fixture
+    def backend(self):
+        return CountingBackend()
+
+    @pytest.fixture
+    def checker(self):
+        return PreConditionChecker(cache=CheckResultCache())
+
+    def make_definitions(self, domain_config, names: List[str]) -> List[TestCaseDefDTO]:
+        return [
+            TestCaseDefDTO(
+                testobject=TestObjectDTO(
+                    name=name, domain="dom", stage="stage", instance="inst"
+                ),
+                testtype=TestType.STAGECOUNT,
+                specs=[],
+                domain_config=domain_config,
+            )
+            for name in names
+        ]
+
+    def test_failing_testcases_are_aborted(self, domain_config, backend, checker):
+        names = ["testobject1", "testobject2", "missing", "testobject1"]
+        definitions = self.make_definitions(domain_config, names)
+        prepass = PreconditionPrePass(backend, checker, lambda *args: None)
+
+        passed, aborted = prepass.run(definitions, uuid4())
+
+        assert passed == [definitions[0], definitions[3]]
+        assert [result.status for result in aborted] == [Status.ABORTED] * 2
+        assert [result.summary for result in aborted] == [
+            "Testobject testobject2 is empty!",
+            "Testobject missing not found!",
+        ]
+
+    def test_checks_run_in_bulk(self, domain_config, backend, checker):
+        names = ["testobject1", "testobject2", "missing", "testobject1"]
+        definitions = self.make_definitions(domain_config, names)
+        prepass = PreconditionPrePass(backend, checker, lambda *args: None)
+
+        prepass.run(definitions, uuid4())
+
+        assert len(backend.listed) == 1
+        # missing testobjects are not probed, duplicates are probed once
+        assert backend.probed == [["testobject1", "testobject2"]]
+
+    def test_testcases_hit_warm_cache(self, domain_config, backend, checker):
+        definitions = self.make_definitions(domain_config, ["testobject1"])
+        PreconditionPrePass(backend, checker, lambda *args: None).run(
+            definitions, uuid4()
+        )
+
+        testcase = TestCaseCreator.create(definitions[0], uuid4(), backend, [], None)
+
+        assert testcase.precheck(checker) is None
+        assert len(backend.listed) == 1
+        assert len(backend.probed) == 1
+
+    def test_failing_bulk_check_is_left_to_testcases(
+        self, domain_config, backend, checker
+    ):
+        def fail(*args, **kwargs):
+            raise ConnectionError("connection reset")
+
+        backend.testobjects_have_rows = fail
+        notifications = []
+        definitions = self.make_definitions(domain_config, ["testobject1"])
+        prepass = PreconditionPrePass(
+            backend, checker, lambda msg, importance: notifications.append(msg)
+        )
+
+        passed, aborted = prepass.run(definitions, uuid4())
+
+        assert passed == definitions  # testobject_not_empty is checked by testcase
+        assert aborted == []
+        assert "connection reset" in notifications[0]
@@ -0,0 +1,95 @@
+import pickle
+import time
+
+import pytest
+
+from src.domain.testrun.retry_policy import RetryBudget, RetryPolicy
+from src.infrastructure_ports import BackendError, TransientBackendError
+
+
+class TestRetryBudget:
+    def test_spending_budget_without_window(self):
+        budget = RetryBudget(2)
+
+        assert budget.try_spend() is True
+        assert budget.try_spend() is True
+        assert budget.try_spend() is False
+        assert budget.spent == 2
+
+    def test_refilling_budget_after_window(self):
+        budget = RetryBudget(1, window_s=0.05)
+
+        assert budget.try_spend() is True
+        assert budget.try_spend() is False
+        time.sleep(0.06)
+        assert budget.try_spend() is True
+
+
+class TestRetryPolicy:
+    def test_invalid_max_attempts_are_rejected(self):
+        with pytest.raises(ValueError):
+            RetryPolicy(max_attempts=0)
+
+    def test_transient_errors_are_found_in_cause_chain(self):
+        try:
+            try:
+                raise TransientBackendError("connection reset")
+            except TransientBackendError as err:
+                raise RuntimeError("query failed") from err
+        except RuntimeError as err:
+            chained = err
+
+        assert RetryPolicy.is_transient(chained) is True
+        assert RetryPolicy.is_transient(BackendError("syntax error")) is False
+
+    def test_retrying_until_max_attempts(self):
+        policy = RetryPolicy(max_attempts=3, budget_global_per_minute=1000)
+        err = TransientBackendError("timeout")
+
+        assert policy.should_retry(err, attempt=1) is True
+        assert policy.should_retry(err, attempt=2) is True
+        assert policy.should_retry(err, attempt=3) is False
+        assert policy.should_retry(ValueError("bad"), attempt=1) is False
+        assert policy.testrun_budget.spent == 2
+
+    def test_global_budget_is_shared_by_policies(self):
+        first = RetryPolicy(budget_global_per_minute=7)
+        second = RetryPolicy(budget_global_per_minute=7)
+
+        assert first.global_budget is second.global_budget
+        assert first.testrun_budget is not second.testrun_budget
+
+    def test_delays_are_capped(self):
+        policy = RetryPolicy()
+
+        delays = [policy.delay_s(attempt) for attempt in range(1, 20)]
+
+        assert all(0 <= delay <= policy.max_delay_s for delay in delays)
+        assert policy.delay_s(1) <= policy.base_delay_s
+
+    def test_pickled_policy_has_fresh_budget(self):
+        policy = RetryPolicy(max_attempts=4, budget_per_testrun=1)
+        policy.should_retry(TransientBackendError("reset"), attempt=1)
+
+        copy = pickle.loads(pickle.dumps(policy))
+
+        assert copy.max_attempts == 4
+        assert copy.testrun_budget.retries == 1
+        assert copy.testrun_budget.spent == 0
+
+    def test_shares_split_budgets_without_exceeding_them(self):
+        policy = RetryPolicy(
+            max_attempts=4, budget_per_testrun=10, budget_global_per_minute=99
+        )
+
+        share = policy.share(4)
+
+        assert share.max_attempts == 4
+        assert share.testrun_budget.retries == 2
+        assert share.global_budget.retries == 24
+        assert share.testrun_budget is not policy.testrun_budget
+
+    def test_share_of_too_small_budget_disables_retries(self):
+        share = RetryPolicy(budget_per_testrun=3).share(4)
+
+        assert share.should_retry(TransientBackendError("reset"), attempt=1) is False
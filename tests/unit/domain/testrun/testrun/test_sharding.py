@@ -0,0 +1,366 @@
+import multiprocessing
+import threading
+import time
+from uuid import uuid4
+
+import pytest
+from src.domain.testrun.concurrency_limiter import ConcurrencyLimiter
+from src.domain.testrun.sharding import (
+    ShardedTestRun,
+    ShardFailedError,
+    ShardTimeoutError,
+    ShardWorker,
+    run_shard_worker,
+)
+from src.dtos import (
+    LocationDTO,
+    ObjectType,
+    Result,
+    SchemaSpecDTO,
+    ShardResultDTO,
+    Status,
+    TestObjectDTO,
+    TestRunDTO,
+    TestType,
+)
+from src.dtos.testrun_dtos import TestCaseDefDTO, TestRunDefDTO
+from src.infrastructure.backend.dummy import DummyBackendFactory
+from src.infrastructure.notifier import InMemoryNotifier
+from src.infrastructure.shard_queue import FileShardQueue
+from src.infrastructure.storage.dto_storage_file import (
+    JsonSerializer,
+    LocalDtoStorage,
+    MemoryDtoStorage,
+)
+
+
+class TestShardedTestRun:
+    @pytest.fixture
+    def dto_storage(self) -> MemoryDtoStorage:
+        return MemoryDtoStorage(
+            serializer=JsonSerializer(),
+            storage_location=LocationDTO(f"memory://sharding/{uuid4().hex}/"),
+        )
+
+    @pytest.fixture
+    def shard_queue(self, tmp_path) -> FileShardQueue:
+        return FileShardQueue(path=str(tmp_path / "queue"))
+
+    @pytest.fixture
+    def testrun_def(self, domain_config) -> TestRunDefDTO:
+        testtypes = [TestType.DUMMY_OK] * 4 + [TestType.DUMMY_NOK]
+        definitions = []
+        for index, testtype in enumerate(testtypes):
+            testobject = TestObjectDTO(
+                name=f"to_{index}", domain="payments", stage="test", instance="alpha"
+            )
+            spec = SchemaSpecDTO(
+                location=LocationDTO(path="dummy://loc"), testobject=testobject.name
+            )
+            definitions.append(
+                TestCaseDefDTO(
+                    testobject=testobject,
+                    testtype=testtype,
+                    specs=[spec],
+                    domain_config=domain_config,
+                )
+            )
+        return TestRunDefDTO(
+            testcase_defs=definitions,
+            domain="payments",
+            stage="test",
+            instance="alpha",
+            domain_config=domain_config,
+        )
+
+    def make_testrun(self, testrun_def, shard_queue, dto_storage, **kwargs):
+        return ShardedTestRun(
+            testrun_def,
+            DummyBackendFactory(),
+            [InMemoryNotifier()],
+            dto_storage,
+            shard_queue=shard_queue,
+            shard_poll_interval_s=0.01,
+            **kwargs,
+        )
+
+    def start_worker(self, shard_queue, dto_storage) -> threading.Thread:
+        worker = ShardWorker(shard_queue, DummyBackendFactory(), [], dto_storage)
+        thread = threading.Thread(
+            target=worker.run,
+            kwargs={"idle_timeout_s": 0.5, "poll_interval_s": 0.01},
+        )
+        thread.start()
+        return thread
+
+    def single_shard(self, testrun_def, shard_queue, dto_storage):
+        testrun = self.make_testrun(testrun_def, shard_queue, dto_storage, shard_count=1)
+        testrun.details = [{"estimated_duration_s": 1.0}] * 5
+        return testrun._split(testrun_def.testcase_defs)[0]
+
+    @staticmethod
+    def count_concurrent_testcases(worker: ShardWorker, monkeypatch) -> dict:
+        """Slows down testcases of the worker and counts how many run at once."""
+        counts = {"running": 0, "max_running": 0, "total": 0}
+        lock = threading.Lock()
+        execute_testcase = worker._execute_testcase
+
+        def counting_execute(*args):
+            with lock:
+                counts["running"] += 1
+                counts["total"] += 1
+                counts["max_running"] = max(counts["max_running"], counts["running"])
+            time.sleep(0.02)
+            try:
+                return execute_testcase(*args)
+            finally:
+                with lock:
+                    counts["running"] -= 1
+
+        monkeypatch.setattr(worker, "_execute_testcase", counting_execute)
+        return counts
+
+    def test_split_balances_expected_durations(
+        self, testrun_def, shard_queue, dto_storage
+    ):
+        testrun = self.make_testrun(testrun_def, shard_queue, dto_storage, shard_count=2)
+        testrun.details = [
+            {"estimated_duration_s": estimate} for estimate in (5.0, 4.0, 3.0, 2.0, 2.0)
+        ]
+
+        shards = testrun._split(testrun_def.testcase_defs)
+
+        loads = [
+            [testrun_def.testcase_defs.index(d) for d in shard.testcase_defs]
+            for shard in shards
+        ]
+        # greedy: 5 -> A, 4 -> B, 3 -> B, 2 -> A, 2 -> A (ties go to the first shard)
+        assert loads == [[0, 3, 4], [1, 2]]
+        assert all(shard.shard_count == 2 for shard in shards)
+        assert {shard.testrun_id for shard in shards} == {testrun.id}
+
+    def test_split_creates_no_more_shards_than_testcases(
+        self, testrun_def, shard_queue, dto_storage
+    ):
+        testrun = self.make_testrun(testrun_def, shard_queue, dto_storage, shard_count=8)
+        testrun.details = [{"estimated_duration_s": 1.0}] * 5
+
+        shards = testrun._split(testrun_def.testcase_defs)
+
+        assert len(shards) == 5
+
+    def test_workers_execute_shards_and_coordinator_aggregates(
+        self, testrun_def, shard_queue, dto_storage
+    ):
+        testrun = self.make_testrun(testrun_def, shard_queue, dto_storage, shard_count=3)
+        workers = [self.start_worker(shard_queue, dto_storage) for _ in range(2)]
+
+        result = testrun.execute()
+        for worker in workers:
+            worker.join()
+
+        assert result.status == Status.FINISHED
+        assert result.result == Result.NOK
+        assert len(result.results) == 5
+        assert {tc.testrun_id for tc in result.results} == {testrun.id}
+        assert result.summary.completed_testcases == 5
+        stored = dto_storage.read_dto(ObjectType.TESTRUN, str(testrun.id))
+        assert isinstance(stored, TestRunDTO)
+        assert stored.status == Status.FINISHED
+
+    def test_failed_shard_ends_testrun_in_error(
+        self, testrun_def, shard_queue, dto_storage
+    ):
+        testrun = self.make_testrun(testrun_def, shard_queue, dto_storage, shard_count=2)
+
+        def fail_shards():
+            while (shard := shard_queue.claim()) is None:
+                time.sleep(0.01)
+            for claimed in [shard, shard_queue.claim()]:
+                if claimed is not None:
+                    shard_queue.complete(
+                        ShardResultDTO(
+                            shard_id=claimed.id,
+                            testrun_id=claimed.testrun_id,
+                            index=claimed.index,
+                            worker="broken",
+                            error="backend unavailable",
+                        )
+                    )
+
+        thread = threading.Thread(target=fail_shards)
+        thread.start()
+        with pytest.raises(ShardFailedError, match="backend unavailable"):
+            testrun.execute()
+        thread.join()
+
+        assert testrun.status == Status.ERROR
+
+    def test_missing_workers_time_out(self, testrun_def, shard_queue, dto_storage):
+        testrun = self.make_testrun(
+            testrun_def, shard_queue, dto_storage, shard_count=2, shard_timeout_s=0.05
+        )
+
+        with pytest.raises(ShardTimeoutError):
+            testrun.execute()
+
+        assert testrun.status == Status.ERROR
+        # unclaimed shards are withdrawn: no worker executes them later
+        assert shard_queue.claim() is None
+
+    def test_timeout_is_finite_by_default(self, testrun_def, shard_queue, dto_storage):
+        testrun = self.make_testrun(testrun_def, shard_queue, dto_storage)
+
+        assert testrun.shard_timeout_s is not None
+
+    def test_cancelled_testrun_withdraws_shards(
+        self, testrun_def, shard_queue, dto_storage
+    ):
+        testrun = self.make_testrun(testrun_def, shard_queue, dto_storage, shard_count=2)
+        thread = threading.Thread(target=testrun.execute)
+        thread.start()
+        while not shard_queue._pending.exists() or not any(
+            shard_queue._pending.iterdir()
+        ):
+            time.sleep(0.01)
+
+        assert ShardedTestRun.cancel_running(testrun.id)
+        thread.join()
+
+        assert testrun.status == Status.ABORTED
+        assert shard_queue.claim() is None
+
+    def test_worker_with_lost_lease_records_no_result(
+        self, testrun_def, shard_queue, dto_storage, monkeypatch
+    ):
+        shard_queue.lease_s = 0.03
+        shard = self.single_shard(testrun_def, shard_queue, dto_storage)
+        shard_queue.put(shard)
+        claimed = shard_queue.claim()
+        assert claimed is not None
+        shard_queue.withdraw(str(shard.testrun_id))  # e.g. the testrun was cancelled
+        worker = ShardWorker(
+            shard_queue,
+            DummyBackendFactory(),
+            [],
+            dto_storage,
+            max_concurrency_per_platform=1,
+        )
+        executed = self.count_concurrent_testcases(worker, monkeypatch)
+
+        assert worker.execute_shard(claimed) is None
+        assert executed["total"] < 5  # no testcases started after lease was lost
+
+    def test_worker_sleeps_while_slot_is_held_elsewhere(
+        self, testrun_def, shard_queue, dto_storage, monkeypatch
+    ):
+        shard = self.single_shard(testrun_def, shard_queue, dto_storage)
+        worker = ShardWorker(
+            shard_queue,
+            DummyBackendFactory(),
+            [],
+            dto_storage,
+            max_concurrency_per_platform=1,
+        )
+        # another testrun of this process holds the only platform slot for a while
+        other = ConcurrencyLimiter.for_backend(
+            global_limit=1, backend_factory=DummyBackendFactory(), platform_limit=1
+        )
+        assert other.try_acquire(shard.testcase_defs[0])
+        threading.Timer(0.5, other.release, [shard.testcase_defs[0]]).start()
+        attempts = 0
+        try_acquire = ConcurrencyLimiter.try_acquire
+
+        def counting_try_acquire(limiter, definition):
+            nonlocal attempts
+            attempts += 1
+            return try_acquire(limiter, definition)
+
+        monkeypatch.setattr(ConcurrencyLimiter, "try_acquire", counting_try_acquire)
+
+        result = worker.execute_shard(shard)
+
+        assert result is not None and len(result.testcase_ids) == 5
+        # 5 attempts per dispatch iteration: woken up by the release, not spinning
+        assert attempts < 100
+
+    def test_worker_respects_concurrency_limits(
+        self, testrun_def, shard_queue, dto_storage, monkeypatch
+    ):
+        shard = self.single_shard(testrun_def, shard_queue, dto_storage)
+        worker = ShardWorker(
+            shard_queue,
+            DummyBackendFactory(),
+            [],
+            dto_storage,
+            max_concurrency_per_platform=1,
+            retry_max_attempts=1,
+        )
+        executed = self.count_concurrent_testcases(worker, monkeypatch)
+
+        result = worker.execute_shard(shard)
+
+        assert result is not None and len(result.testcase_ids) == 5
+        assert executed["max_running"] == 1
+        assert worker.retry_max_attempts == 1
+
+    def test_worker_spends_shard_share_of_retry_budgets(
+        self, testrun_def, shard_queue, dto_storage, monkeypatch
+    ):
+        shard = self.single_shard(testrun_def, shard_queue, dto_storage)
+        shard = shard.model_copy(update={"shard_count": 4})
+        worker = ShardWorker(
+            shard_queue,
+            DummyBackendFactory(),
+            [],
+            dto_storage,
+            retry_budget_per_testrun=20,
+            retry_budget_global_per_minute=100,
+        )
+        policies = []
+        execute_testcase = worker._execute_testcase
+
+        def recording_execute(
+            definition, testrun_id, backend_pool, retry_policy, checker
+        ):
+            policies.append(retry_policy)
+            return execute_testcase(
+                definition, testrun_id, backend_pool, retry_policy, checker
+            )
+
+        monkeypatch.setattr(worker, "_execute_testcase", recording_execute)
+
+        worker.execute_shard(shard)
+
+        assert len(policies) == 5 and len({id(policy) for policy in policies}) == 1
+        assert policies[0].testrun_budget.retries == 5
+        assert policies[0].global_budget.retries == 25
+
+    def test_worker_processes_share_file_queue_and_storage(self, testrun_def, tmp_path):
+        shard_queue = FileShardQueue(path=str(tmp_path / "queue"))
+        dto_storage = LocalDtoStorage(
+            serializer=JsonSerializer(),
+            storage_location=LocationDTO(f"local://{tmp_path}/storage/"),
+        )
+        testrun = self.make_testrun(testrun_def, shard_queue, dto_storage, shard_count=2)
+        context = multiprocessing.get_context("spawn")
+        workers = [
+            context.Process(
+                target=run_shard_worker,
+                args=(shard_queue, DummyBackendFactory(), dto_storage),
+                kwargs={"idle_timeout_s": 2.0, "poll_interval_s": 0.05},
+            )
+            for _ in range(2)
+        ]
+        for worker in workers:
+            worker.start()
+
+        result = testrun.execute()
+        for worker in workers:
+            worker.join()
+
+        assert result.status == Status.FINISHED
+        assert len(result.results) == 5
+        shard_results = shard_queue.list_results(str(testrun.id))
+        assert len(shard_results) == 2
+        assert all(shard_result.error is None for shard_result in shard_results)
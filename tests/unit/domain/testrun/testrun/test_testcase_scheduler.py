@@ -0,0 +1,104 @@
+from datetime import timedelta
+from uuid import uuid4
+
+import pytest
+from src.domain.testrun.testcase_scheduler import TestCaseScheduler
+from src.dtos import LocationDTO, Status, TestType
+from src.dtos.testrun_dtos import TestCaseDefDTO
+from src.infrastructure.storage.dto_storage_file import JsonSerializer, MemoryDtoStorage
+
+
+class TestTestCaseScheduler:
+    @pytest.fixture
+    def dto_storage(self) -> MemoryDtoStorage:
+        return MemoryDtoStorage(
+            serializer=JsonSerializer(), storage_location=LocationDTO("memory://test/")
+        )
+
+    @pytest.fixture
+    def make_definition(self, testobject, domain_config):
+        def make(testtype: TestType, name: str = testobject.name) -> TestCaseDefDTO:
+            return TestCaseDefDTO(
+                testobject=testobject.model_copy(update={"name": name}),
+                testtype=testtype,
+                specs=[],
+                domain_config=domain_config,
+            )
+
+        return make
+
+    def persist_history(self, dto_storage, testrun, testtype, name, seconds):
+        testcase = testrun.results[0].model_copy(
+            update={
+                "testobject": testrun.results[0].testobject.model_copy(
+                    update={"name": name}
+                ),
+                "testtype": testtype,
+                "status": Status.FINISHED,
+                "end_ts": testrun.results[0].start_ts + timedelta(seconds=seconds),
+            }
+        )
+        dto_storage.write_dto(testrun.model_copy(update={"results": [testcase]}))
+
+    def test_without_history_priors_order_by_testtype(self, dto_storage, make_definition):
+        definitions = [
+            make_definition(TestType.SCHEMA),
+            make_definition(TestType.ROWCOUNT),
+            make_definition(TestType.COMPARE),
+        ]
+
+        scheduled = TestCaseScheduler(dto_storage).schedule(definitions)
+
+        assert [s.definition.testtype for s in scheduled] == [
+            TestType.COMPARE,
+            TestType.ROWCOUNT,
+            TestType.SCHEMA,
+        ]
+        assert all(s.source == "prior" for s in scheduled)
+
+    def test_compare_prior_grows_with_sample_size(self, dto_storage, make_definition):
+        small = make_definition(TestType.COMPARE, name="small")
+        large = make_definition(TestType.COMPARE, name="large")
+        large.domain_config = large.domain_config.model_copy(
+            update={"sample_size_per_object": {"large": 100_000}}
+        )
+
+        scheduled = TestCaseScheduler(dto_storage).schedule([small, large])
+
+        assert [s.definition.testobject.name for s in scheduled] == ["large", "small"]
+
+    def test_history_overrides_priors(self, dto_storage, testrun, make_definition):
+        self.persist_history(dto_storage, testrun, TestType.SCHEMA, "slow", 600)
+        definitions = [
+            make_definition(TestType.COMPARE, name="fast"),
+            make_definition(TestType.SCHEMA, name="slow"),
+        ]
+
+        scheduled = TestCaseScheduler(dto_storage).schedule(definitions)
+
+        assert scheduled[0].definition.testobject.name == "slow"
+        assert scheduled[0].estimate_s == 600
+        assert scheduled[0].source == "history"
+        assert scheduled[1].source == "prior"
+
+    def test_equal_estimates_keep_testset_order(self, dto_storage, make_definition):
+        definitions = [make_definition(TestType.SCHEMA, name=n) for n in "abc"]
+
+        scheduled = TestCaseScheduler(dto_storage).schedule(definitions)
+
+        assert [s.definition.testobject.name for s in scheduled] == ["a", "b", "c"]
+
+    def test_history_reads_only_most_recent_testruns(
+        self, dto_storage, testrun, make_definition
+    ):
+        older = testrun.model_copy(
+            update={"id": uuid4(), "start_ts": testrun.start_ts - timedelta(days=1)}
+        )
+        self.persist_history(dto_storage, older, TestType.SCHEMA, "obj", 600)
+        self.persist_history(dto_storage, testrun, TestType.SCHEMA, "obj", 5)
+        scheduler = TestCaseScheduler(dto_storage)
+        scheduler.history_testruns = 1
+
+        scheduled = scheduler.schedule([make_definition(TestType.SCHEMA, name="obj")])
+
+        assert scheduled[0].estimate_s == 5
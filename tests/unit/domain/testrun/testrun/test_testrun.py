@@ -1,8 +1,19 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import cast
 from uuid import uuid4
 
 import pytest
-from src.domain.testrun.testrun import TestRun
+from src.domain.testrun.concurrency_limiter import ConcurrencyLimiter
+from src.domain.testrun.testcases import DummyOkTestCase
+from src.domain.testrun.testrun import (
+    NoFailedTestCasesError,
+    TestRun,
+    TestRunLoader,
+    TestRunNotResumableError,
+)
 from src.dtos import (
     LocationDTO,
     ObjectType,
@@ -12,6 +23,8 @@ from src.dtos import (
     Status,
     TestObjectDTO,
     TestRunDTO,
+    TestRunExecutor,
+    TestRunStorageMode,
     TestType,
 )
 from src.dtos.testrun_dtos import TestCaseDefDTO, TestRunDefDTO
@@ -161,6 +174,38 @@ class TestTestRun:
         assert persisted_dto.end_ts is not None
         assert len(persisted_dto.results) == 3
 
+    def test_testcases_failing_preconditions_are_not_dispatched(
+        self, domain_config, dto_storage, backend_factory, notifier
+    ):
+        missing = TestObjectDTO(name="missing", domain="dom", stage="s", instance="i")
+        testrun_def = TestRunDefDTO(
+            testcase_defs=[
+                TestCaseDefDTO(
+                    testobject=missing,
+                    testtype=TestType.STAGECOUNT,
+                    specs=[],
+                    domain_config=domain_config,
+                )
+            ],
+            domain=missing.domain,
+            stage=missing.stage,
+            instance=missing.instance,
+            domain_config=domain_config,
+        )
+        testrun = TestRun(testrun_def, backend_factory, [notifier], dto_storage)
+        dispatched = []
+        testrun._execute_single_testcase = dispatched.append  # ty: ignore[invalid-assignment]
+
+        result = testrun.execute()
+
+        assert dispatched == []
+        assert result.results[0].status == Status.ABORTED
+        assert result.results[0].summary == "Testobject missing not found!"
+        assert result.status == Status.FINISHED
+        assert result.result == Result.NA
+        stored = dto_storage.read_dto(ObjectType.TESTCASE, str(result.results[0].id))
+        assert stored.id == result.results[0].id
+
     def test_to_dto_and_persist(
         self,
         testobject,
@@ -193,3 +238,537 @@ class TestTestRun:
         assert persisted_dto.result == dto.result
         assert len(persisted_dto.testdefinitions) == len(dto.testdefinitions)
         assert len(persisted_dto.results) == len(dto.results)
+
+    def test_schedule_is_exposed_in_details(
+        self,
+        testobject,
+        specifications,
+        domain_config,
+        dto_storage,
+        backend_factory,
+        notifier,
+    ):
+        testrun_def = self.make_testrun_def(testobject, specifications, domain_config)
+        testrun = TestRun(testrun_def, backend_factory, [notifier], dto_storage)
+
+        result = testrun.execute()
+
+        assert [detail["position"] for detail in result.details] == [0, 1, 2]
+        estimates = [detail["estimated_duration_s"] for detail in result.details]
+        assert estimates == sorted(estimates, reverse=True)
+        assert {detail["testtype"] for detail in result.details} == {
+            definition.testtype.value for definition in testrun_def.testcase_defs
+        }
+
+    def test_testobject_concurrency_is_limited(
+        self,
+        monkeypatch,
+        testobject,
+        specifications,
+        domain_config,
+        dto_storage,
+        backend_factory,
+        notifier,
+    ):
+        testrun_def = self.make_testrun_def(testobject, specifications, domain_config)
+        testrun = TestRun(
+            testrun_def,
+            backend_factory,
+            [notifier],
+            dto_storage,
+            max_testrun_threads=3,
+            max_concurrency_per_testobject=1,
+        )
+        execute_single_testcase = testrun._execute_single_testcase
+        lock = threading.Lock()
+        running, max_running = 0, 0
+
+        def tracking_execute(definition):
+            nonlocal running, max_running
+            with lock:
+                running += 1
+                max_running = max(max_running, running)
+            time.sleep(0.05)
+            try:
+                return execute_single_testcase(definition)
+            finally:
+                with lock:
+                    running -= 1
+
+        monkeypatch.setattr(testrun, "_execute_single_testcase", tracking_execute)
+
+        result = testrun.execute()
+
+        # all three testcases share one testobject
+        assert max_running == 1
+        assert len(result.results) == 3
+
+    def test_dispatch_sleeps_while_slot_is_held_elsewhere(
+        self,
+        monkeypatch,
+        testobject,
+        specifications,
+        domain_config,
+        dto_storage,
+        backend_factory,
+        notifier,
+    ):
+        testrun_def = self.make_testrun_def(testobject, specifications, domain_config)
+        testrun = TestRun(
+            testrun_def,
+            backend_factory,
+            [notifier],
+            dto_storage,
+            max_concurrency_per_testobject=1,
+        )
+        # another testrun of this process holds the testobject slot for a while
+        other = testrun._concurrency_limiter()
+        assert other.try_acquire(testrun_def.testcase_defs[0])
+        threading.Timer(0.5, other.release, [testrun_def.testcase_defs[0]]).start()
+        attempts = 0
+        try_acquire = ConcurrencyLimiter.try_acquire
+
+        def counting_try_acquire(limiter, definition):
+            nonlocal attempts
+            attempts += 1
+            return try_acquire(limiter, definition)
+
+        monkeypatch.setattr(ConcurrencyLimiter, "try_acquire", counting_try_acquire)
+
+        result = testrun.execute()
+
+        assert len(result.results) == 3
+        # 3 attempts per dispatch iteration: woken up by the release, not spinning
+        assert attempts < 60
+
+    @pytest.mark.asyncio
+    async def test_execute_async_shares_worker_pool(
+        self,
+        monkeypatch,
+        testobject,
+        specifications,
+        domain_config,
+        dto_storage,
+        backend_factory,
+        notifier,
+    ):
+        testrun_def = self.make_testrun_def(testobject, specifications, domain_config)
+        testruns = [
+            TestRun(testrun_def, backend_factory, [notifier], dto_storage)
+            for _ in range(3)
+        ]
+        worker_threads = set()
+        for testrun in testruns:
+            execute_single_testcase = testrun._execute_single_testcase
+
+            def tracking_execute(definition, execute=execute_single_testcase):
+                worker_threads.add(threading.current_thread().name)
+                return execute(definition)
+
+            monkeypatch.setattr(testrun, "_execute_single_testcase", tracking_execute)
+
+        with ThreadPoolExecutor(2, thread_name_prefix="shared") as worker_pool:
+            results = await asyncio.gather(
+                *(testrun.execute_async(worker_pool) for testrun in testruns)
+            )
+
+        assert [result.result for result in results] == [Result.NOK] * 3
+        assert all(len(result.results) == 3 for result in results)
+        assert len(worker_threads) <= 2
+        assert all(name.startswith("shared") for name in worker_threads)
+        persisted = TestRunLoader(dto_storage).load_testrun(str(testruns[0].id))
+        assert persisted.status == Status.FINISHED
+
+    def test_execute_in_processes(
+        self,
+        testobject,
+        specifications,
+        domain_config,
+        dto_storage,
+        backend_factory,
+        notifier,
+    ):
+        testrun_def = self.make_testrun_def(testobject, specifications, domain_config)
+        testrun = TestRun(
+            testrun_def,
+            backend_factory,
+            [notifier],
+            dto_storage,
+            max_testrun_threads=2,
+            executor=TestRunExecutor.PROCESSES,
+        )
+
+        result = testrun.execute()
+
+        results = {tc.testtype: tc for tc in result.results}
+        assert results[TestType.DUMMY_OK].result == Result.OK
+        assert results[TestType.DUMMY_NOK].result == Result.NOK
+        assert result.result == Result.NOK
+        # testcase notifications of worker processes are streamed to the parent
+        testcase_ids = {n.testcase_id for n in notifier.notifications if n.testcase_id}
+        assert testcase_ids == {str(tc.id) for tc in result.results}
+        # final testcase states are persisted by the parent process
+        for tc in result.results:
+            dto = dto_storage.read_dto(object_type=ObjectType.TESTCASE, id=str(tc.id))
+            assert dto == tc
+
+    def test_progress_persistence_is_throttled(
+        self,
+        testobject,
+        specifications,
+        domain_config,
+        dto_storage,
+        backend_factory,
+        notifier,
+    ):
+        testrun_def = self.make_testrun_def(testobject, specifications, domain_config)
+        testrun_def.testcase_defs = testrun_def.testcase_defs * 4  # 12 testcases
+        testrun = TestRun(
+            testrun_def,
+            backend_factory,
+            [notifier],
+            dto_storage,
+            persist_every_n=5,
+            persist_interval_s=3600,
+        )
+        written = []
+        write_dto = dto_storage.write_dto
+
+        def recording_write(dto):
+            if isinstance(dto, TestRunDTO):
+                written.append(dto)
+            write_dto(dto)
+
+        dto_storage.write_dto = recording_write
+
+        testrun.execute()
+
+        # initial + up to 2 progress snapshots (after 5 and 10 completions) + final,
+        # where pending snapshots are coalesced -- instead of one write per testcase
+        assert 2 <= len(written) <= 4
+        assert written[-1].status == Status.FINISHED
+        assert len(written[-1].results) == 12
+
+    def test_final_state_is_persisted_despite_failed_progress_write(
+        self,
+        testobject,
+        specifications,
+        domain_config,
+        dto_storage,
+        backend_factory,
+        notifier,
+    ):
+        testrun_def = self.make_testrun_def(testobject, specifications, domain_config)
+        testrun = TestRun(
+            testrun_def,
+            backend_factory,
+            [notifier],
+            dto_storage,
+            persist_every_n=1,
+        )
+        write_dto = dto_storage.write_dto
+
+        def failing_progress_write(dto):
+            if isinstance(dto, TestRunDTO) and dto.status == Status.EXECUTING:
+                if threading.current_thread().name == "testrun-persister":
+                    raise OSError("storage unavailable")
+            write_dto(dto)
+
+        dto_storage.write_dto = failing_progress_write
+
+        testrun.execute()
+
+        persisted = TestRunLoader(dto_storage).load_testrun(str(testrun.id))
+        assert persisted.status == Status.FINISHED
+        assert len(persisted.results) == 3
+
+    def test_error_state_is_persisted(
+        self,
+        monkeypatch,
+        testobject,
+        specifications,
+        domain_config,
+        dto_storage,
+        backend_factory,
+        notifier,
+    ):
+        testrun_def = self.make_testrun_def(testobject, specifications, domain_config)
+        testrun = TestRun(testrun_def, backend_factory, [notifier], dto_storage)
+
+        def fail(definition):
+            raise RuntimeError("worker crashed")
+
+        monkeypatch.setattr(testrun, "_execute_single_testcase", fail)
+
+        with pytest.raises(RuntimeError):
+            testrun.execute()
+
+        persisted_dto = cast(
+            TestRunDTO,
+            dto_storage.read_dto(object_type=ObjectType.TESTRUN, id=str(testrun.id)),
+        )
+        assert persisted_dto.status == Status.ERROR
+        assert persisted_dto.end_ts is not None
+
+    def test_delta_mode_persists_only_testcase_references(
+        self,
+        testobject,
+        specifications,
+        domain_config,
+        dto_storage,
+        backend_factory,
+        notifier,
+    ):
+        testrun_def = self.make_testrun_def(testobject, specifications, domain_config)
+        testrun = TestRun(
+            testrun_def,
+            backend_factory,
+            [notifier],
+            dto_storage,
+            storage_mode=TestRunStorageMode.DELTA,
+        )
+
+        result = testrun.execute()
+
+        # the returned DTO still contains full results
+        assert len(result.results) == 3
+        loader = TestRunLoader(dto_storage)
+        persisted = loader.load_testrun(str(testrun.id))
+        assert persisted.results == []
+        assert len(persisted.testcase_summaries) == 3
+        assert persisted.summary.completed_testcases == 3
+        assert persisted.summary.nok_testcases == 1
+        listed = loader.list_testruns(domain=testobject.domain)
+        assert [tr.results for tr in listed] == [[]]
+
+    def test_delta_testrun_is_hydrated_on_request(
+        self,
+        testobject,
+        specifications,
+        domain_config,
+        dto_storage,
+        backend_factory,
+        notifier,
+    ):
+        testrun_def = self.make_testrun_def(testobject, specifications, domain_config)
+        testrun = TestRun(
+            testrun_def,
+            backend_factory,
+            [notifier],
+            dto_storage,
+            storage_mode=TestRunStorageMode.DELTA,
+        )
+        testrun.execute()
+        loader = TestRunLoader(dto_storage)
+
+        hydrated = loader.load_testrun(str(testrun.id), hydrate=True)
+        listed = loader.list_testruns(domain=testobject.domain, hydrate=True)
+
+        expected_ids = {s.id for s in hydrated.testcase_summaries}
+        assert {tc.id for tc in hydrated.results} == expected_ids
+        final_statuses = {Status.FINISHED, Status.ERROR}
+        assert all(tc.status in final_statuses for tc in hydrated.results)
+        assert len(listed[0].results) == 3
+
+    def test_resume_executes_only_pending_testcases(
+        self,
+        monkeypatch,
+        testobject,
+        specifications,
+        domain_config,
+        dto_storage,
+        backend_factory,
+        notifier,
+    ):
+        testrun_def = self.make_testrun_def(testobject, specifications, domain_config)
+        testrun_def.testcase_defs = testrun_def.testcase_defs * 2  # duplicates count
+        finished = TestRun(testrun_def, backend_factory, [notifier], dto_storage)
+        finished.execute()
+        # simulate a crash: progress snapshot with 4 of 6 results, still EXECUTING
+        crashed = finished.to_dto().model_copy(
+            update={"status": Status.EXECUTING, "end_ts": None}
+        )
+        crashed.results = crashed.results[:4]
+        crashed.testcase_summaries = crashed.testcase_summaries[:4]
+        dto_storage.write_dto(crashed)
+
+        persisted = TestRunLoader(dto_storage).load_testrun(str(crashed.id), hydrate=True)
+        resumed = TestRun.resume(persisted, backend_factory, [notifier], dto_storage)
+        executed = []
+        execute_single_testcase = resumed._execute_single_testcase
+
+        def tracking_execute(definition):
+            executed.append(definition)
+            return execute_single_testcase(definition)
+
+        monkeypatch.setattr(resumed, "_execute_single_testcase", tracking_execute)
+        result = resumed.execute()
+
+        assert len(executed) == 2
+        assert result.id == crashed.id
+        assert result.start_ts == crashed.start_ts
+        assert result.status == Status.FINISHED
+        assert len(result.results) == 6
+        assert len(result.testcase_summaries) == 6
+        assert {tc.id for tc in crashed.results} < {tc.id for tc in result.results}
+
+    def test_finished_testrun_is_not_resumable(
+        self,
+        testobject,
+        specifications,
+        domain_config,
+        dto_storage,
+        backend_factory,
+        notifier,
+    ):
+        testrun_def = self.make_testrun_def(testobject, specifications, domain_config)
+        finished = TestRun(testrun_def, backend_factory, [notifier], dto_storage)
+        dto = finished.execute()
+
+        with pytest.raises(TestRunNotResumableError):
+            TestRun.resume(dto, backend_factory, [notifier], dto_storage)
+
+    def test_executing_testrun_is_not_resumable(
+        self,
+        testobject,
+        specifications,
+        domain_config,
+        dto_storage,
+        backend_factory,
+        notifier,
+    ):
+        testrun_def = self.make_testrun_def(testobject, specifications, domain_config)
+        running = TestRun(testrun_def, backend_factory, [notifier], dto_storage)
+        running._start()  # executing in this process, e.g. in the HTTP app
+        try:
+            dto = running.to_dto()
+
+            with pytest.raises(TestRunNotResumableError, match="still executing"):
+                TestRun.resume(dto, backend_factory, [notifier], dto_storage)
+            # also if the check passed before the first execution started
+            second = TestRun(
+                testrun_def, backend_factory, [notifier], dto_storage, testrun_id=dto.id
+            )
+            with pytest.raises(TestRunNotResumableError, match="still executing"):
+                second.execute()
+            assert TestRun.is_running(dto.id)
+        finally:
+            running._unregister()
+
+    def test_rerun_failures_reruns_nok_and_na_testcases(
+        self,
+        testobject,
+        specifications,
+        domain_config,
+        dto_storage,
+        backend_factory,
+        notifier,
+    ):
+        testrun_def = self.make_testrun_def(testobject, specifications, domain_config)
+        previous = TestRun(
+            testrun_def, backend_factory, [notifier], dto_storage
+        ).execute()
+
+        rerun = TestRun.rerun_failures(previous, backend_factory, [notifier], dto_storage)
+        result = rerun.execute()
+
+        assert result.rerun_of == previous.id
+        assert result.id != previous.id
+        assert {tc.testtype for tc in result.results} == {
+            TestType.DUMMY_NOK,
+            TestType.DUMMY_EXCEPTION,
+        }
+        assert all(tc.specs == specifications for tc in result.testdefinitions)
+        persisted = TestRunLoader(dto_storage).load_testrun(str(result.id))
+        assert persisted.rerun_of == previous.id
+
+    def test_rerun_failures_requires_failed_testcases(
+        self,
+        testobject,
+        specifications,
+        domain_config,
+        dto_storage,
+        backend_factory,
+        notifier,
+    ):
+        testrun_def = self.make_testrun_def(testobject, specifications, domain_config)
+        testrun_def.testcase_defs = testrun_def.testcase_defs[:1]  # DUMMY_OK only
+        previous = TestRun(
+            testrun_def, backend_factory, [notifier], dto_storage
+        ).execute()
+
+        with pytest.raises(NoFailedTestCasesError):
+            TestRun.rerun_failures(previous, backend_factory, [notifier], dto_storage)
+
+    @staticmethod
+    def hang_until_cancelled(testcase, started: threading.Event | None = None):
+        """Replacement of DummyOkTestCase._execute which only stops when cancelled."""
+        if started is not None:
+            started.set()
+        while not testcase.cancellation.cancelled:
+            time.sleep(0.01)
+        testcase.cancellation.raise_if_cancelled()
+
+    def test_timed_out_testcase_does_not_stop_testrun(
+        self,
+        monkeypatch,
+        testobject,
+        specifications,
+        domain_config,
+        dto_storage,
+        backend_factory,
+        notifier,
+    ):
+        monkeypatch.setattr(DummyOkTestCase, "_execute", self.hang_until_cancelled)
+        domain_config = domain_config.model_copy(
+            update={"testcase_timeout_s_per_testtype": {"DUMMY_OK": 0.1}}
+        )
+        testrun_def = self.make_testrun_def(testobject, specifications, domain_config)
+        testrun = TestRun(
+            testrun_def, backend_factory, [notifier], dto_storage, max_testrun_threads=1
+        )
+
+        result = testrun.execute()
+
+        results = {tc.testtype: tc for tc in result.results}
+        assert results[TestType.DUMMY_OK].status == Status.ERROR
+        assert "timed out after 0.1 s" in results[TestType.DUMMY_OK].summary
+        assert results[TestType.DUMMY_NOK].result == Result.NOK
+        assert result.status == Status.FINISHED
+
+    def test_cancel_running_testrun(
+        self,
+        monkeypatch,
+        testobject,
+        specifications,
+        domain_config,
+        dto_storage,
+        backend_factory,
+        notifier,
+    ):
+        started = threading.Event()
+        monkeypatch.setattr(
+            DummyOkTestCase,
+            "_execute",
+            lambda testcase: self.hang_until_cancelled(testcase, started),
+        )
+        testrun_def = self.make_testrun_def(testobject, specifications, domain_config)
+        testrun = TestRun(
+            testrun_def, backend_factory, [notifier], dto_storage, max_testrun_threads=1
+        )
+
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            future = pool.submit(testrun.execute)
+            assert started.wait(timeout=5)
+            assert TestRun.cancel_running(testrun.id)
+            result = future.result(timeout=5)
+
+        assert result.status == Status.ABORTED
+        assert result.result == Result.NA
+        # the cancelled testcase and those not started stay pending for resume
+        assert result.results == []
+        assert not TestRun.cancel_running(testrun.id)
+        persisted = TestRunLoader(dto_storage).load_testrun(str(testrun.id))
+        assert persisted.status == Status.ABORTED
+        resumed = TestRun.resume(persisted, backend_factory, [notifier], dto_storage)
+        assert len(resumed._pending_testcase_defs()) == 3
@@ -0,0 +1,108 @@
+import threading
+from typing import List
+from uuid import uuid4
+
+import pytest
+from src.domain.testrun.testrun_persister import TestRunPersister
+from src.dtos import LocationDTO, Result, Status, TestRunDTO
+from src.infrastructure.storage.dto_storage_file import JsonSerializer, MemoryDtoStorage
+
+
+class RecordingStorage(MemoryDtoStorage):
+    """Memory storage which records written DTOs and can block writes."""
+
+    def __init__(self):
+        super().__init__(
+            serializer=JsonSerializer(), storage_location=LocationDTO("memory://test/")
+        )
+        self.written: List[TestRunDTO] = []
+        self.gate = threading.Event()
+        self.gate.set()
+        self.fail = False
+
+    def write_dto(self, dto):
+        self.gate.wait()
+        if self.fail:
+            raise IOError("storage unavailable")
+        self.written.append(dto)
+        super().write_dto(dto)
+
+
+class TestTestRunPersister:
+    @pytest.fixture
+    def storage(self) -> RecordingStorage:
+        return RecordingStorage()
+
+    @pytest.fixture
+    def snapshot(self, domain_config):
+        def make(label: str = "") -> TestRunDTO:
+            return TestRunDTO(
+                id=uuid4(),
+                domain="payments",
+                stage="test",
+                instance="alpha",
+                result=Result.NA,
+                status=Status.EXECUTING,
+                start_ts="2024-01-01T00:00:00",
+                labels=[label],
+                domain_config=domain_config,
+            )
+
+        return make
+
+    def test_snapshot_is_taken_every_n_completions(self, storage, snapshot):
+        persister = TestRunPersister(storage, persist_every_n=3, persist_interval_s=60)
+
+        submitted = [persister.on_progress(snapshot) for _ in range(7)]
+        persister.close()
+
+        assert submitted == [False, False, True, False, False, True, False]
+        # the two snapshots may be coalesced if the writer did not pick up the first
+        assert 1 <= len(storage.written) <= 2
+
+    def test_snapshot_is_taken_after_interval(self, storage, snapshot):
+        persister = TestRunPersister(storage, persist_every_n=100, persist_interval_s=0)
+
+        assert persister.on_progress(snapshot) is True
+        persister.close()
+
+        assert len(storage.written) == 1
+
+    def test_pending_snapshots_are_coalesced(self, storage, snapshot):
+        persister = TestRunPersister(storage, persist_every_n=1)
+        storage.gate.clear()  # block the writer on the first snapshot
+
+        persister.submit(snapshot("first"))
+        for label in ["second", "third", "latest"]:
+            persister.submit(snapshot(label))
+        storage.gate.set()
+        persister.close()
+
+        labels = [dto.labels[0] for dto in storage.written]
+        assert labels[-1] == "latest"
+        assert len(labels) <= 2
+
+    def test_persist_now_blocks_until_written(self, storage, snapshot):
+        persister = TestRunPersister(storage)
+        final = snapshot("final")
+
+        persister.persist_now(final)
+
+        assert storage.written == [final]
+        persister.close()
+
+    def test_writer_errors_are_raised_on_flush(self, storage, snapshot):
+        persister = TestRunPersister(storage)
+        storage.fail = True
+
+        persister.submit(snapshot())
+        with pytest.raises(IOError):
+            persister.flush()
+        persister.close()
+
+    def test_submitting_after_close_fails(self, storage, snapshot):
+        persister = TestRunPersister(storage)
+        persister.close()
+
+        with pytest.raises(RuntimeError):
+            persister.submit(snapshot())
@@ -1,10 +1,14 @@
+from concurrent.futures import ThreadPoolExecutor
 from uuid import uuid4
 
 import pytest
+from src.domain.testrun.sharding import ShardTimeoutError
 from src.domain_adapters import TestRunAdapter
 from src.domain_ports import (
     ExecuteTestRunCommand,
     LoadTestRunCommand,
+    ResumeTestRunCommand,
+    RunShardWorkerCommand,
     SaveTestRunCommand,
 )
 from src.dtos import (
@@ -20,6 +24,7 @@ from src.dtos import (
 from src.dtos.testrun_dtos import TestCaseDefDTO, TestRunDefDTO
 from src.infrastructure.backend.dummy import DummyBackendFactory
 from src.infrastructure.notifier import InMemoryNotifier
+from src.infrastructure.shard_queue import FileShardQueue
 from src.infrastructure.storage.dto_storage_file import JsonSerializer, MemoryDtoStorage
 from src.infrastructure_ports import ObjectNotFoundError
 
@@ -161,6 +166,59 @@ class TestTestRunAdapter:
         assert len(result.results) == 1
         assert result.results[0].result == Result.OK
 
+    @pytest.mark.asyncio
+    async def test_run_async_executes_testrun_successfully(
+        self, testrun_command_handler, testrun_def
+    ):
+        """Test that async execution works without a shared worker pool"""
+        command = ExecuteTestRunCommand(testrun_def=testrun_def)
+
+        result = await testrun_command_handler.execute_testrun_async(command)
+
+        assert result.status == Status.FINISHED
+        assert result.result == Result.OK
+
+    def test_resume_executes_pending_testcases(
+        self, testrun_command_handler, testrun_def, testrun
+    ):
+        """Test that an interrupted testrun is resumed and completed"""
+        interrupted = testrun.model_copy(update={"status": Status.EXECUTING})
+        testrun_command_handler.save_testrun(SaveTestRunCommand(testrun=interrupted))
+
+        command = ResumeTestRunCommand(testrun_id=str(interrupted.id))
+        result = testrun_command_handler.resume_testrun(command)
+
+        assert result.id == interrupted.id
+        assert result.status == Status.FINISHED
+        assert len(result.results) == len(testrun_def.testcase_defs)
+
+    def test_sharded_testrun_is_executed_by_shard_worker(
+        self, dummy_platform_factory, dto_storage, notifiers, testrun_def, tmp_path
+    ):
+        """Test that with several shards, a shard worker executes the testcases"""
+        adapter = TestRunAdapter(
+            backend_factory=dummy_platform_factory,
+            notifiers=notifiers,
+            dto_storage=dto_storage,
+            shard_queue=FileShardQueue(path=str(tmp_path)),
+            shard_count=2,
+            shard_timeout_s=0.0,
+        )
+        command = ExecuteTestRunCommand(testrun_def=testrun_def)
+        # without a running worker, the testrun times out and withdraws its shards
+        with pytest.raises(ShardTimeoutError):
+            adapter.execute_testrun(command)
+        assert adapter.run_shard_worker(RunShardWorkerCommand(idle_timeout_s=0.0)) == 0
+
+        adapter.shard_timeout_s = 30.0
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(adapter.execute_testrun, command)
+            executed = adapter.run_shard_worker(RunShardWorkerCommand(idle_timeout_s=1.0))
+            result = future.result()
+
+        assert executed == 1
+        assert result.status == Status.FINISHED
+
     def test_save_load_roundtrip(self, testrun_command_handler, testrun):
         """Test that save and load work together"""
         save_command = SaveTestRunCommand(testrun=testrun)
@@ -1,6 +1,6 @@
 import pytest
 import yaml
-from src.dtos.domain_config_dtos import DomainConfigDTO
+from src.dtos.domain_config_dtos import DomainConfigDTO, SampleStrategy
 from src.dtos.storage_dtos import LocationDTO
 
 
@@ -36,6 +36,25 @@ class TestDomainConfigDTO:
         with pytest.raises(KeyError):
             domain_config.spec_locations_by_stage("unknown_stage")
 
+    def test_testcase_timeout_precedence(self, domain_config: DomainConfigDTO):
+        assert domain_config.testcase_timeout_s("stage_accounts", "COMPARE") is None
+
+        domain_config.testcase_timeout_s_default = 60.0
+        domain_config.testcase_timeout_s_per_testtype = {"COMPARE": 300.0}
+        domain_config.testcase_timeout_s_per_object = {"stage_accounts": 10.0}
+
+        assert domain_config.testcase_timeout_s("stage_accounts", "COMPARE") == 10.0
+        assert domain_config.testcase_timeout_s("stage_customers", "COMPARE") == 300.0
+        assert domain_config.testcase_timeout_s("stage_customers", "SCHEMA") == 60.0
+
+    def test_sample_strategy_per_object(self, domain_config: DomainConfigDTO):
+        domain_config.sample_strategy_per_object = {"stage_accounts": SampleStrategy.HASH}
+
+        assert domain_config.sample_strategy("stage_accounts") == SampleStrategy.HASH
+        assert domain_config.sample_strategy("stage_customers") == (
+            SampleStrategy.RESERVOIR
+        )
+
     def test_to_dict(self, domain_config: DomainConfigDTO):
         result = domain_config.to_dict()
         assert result["spec_locations"] == {
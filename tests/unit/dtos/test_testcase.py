@@ -247,6 +247,40 @@ class TestTestRunDTOAutoSummary:
         assert testrun.summary.ok_testcases == 1
         assert testrun.summary.nok_testcases == 0
 
+    def test_summary_computed_from_testcase_summaries(self, domain_config):
+        from src.dtos.testrun_dtos import TestCaseSummaryDTO, TestObjectDTO
+
+        testobject = TestObjectDTO(
+            name="t", domain="test_domain", stage="dev", instance="instance1"
+        )
+        summaries = [
+            TestCaseSummaryDTO(
+                id=uuid4(),
+                testobject=testobject,
+                testtype=TestType.SCHEMA,
+                result=result,
+                status=Status.FINISHED,
+                start_ts=datetime.now(),
+            )
+            for result in [Result.OK, Result.NOK, Result.NOK]
+        ]
+
+        testrun = TestRunDTO(
+            domain="test_domain",
+            stage="dev",
+            instance="instance1",
+            result=Result.NOK,
+            status=Status.FINISHED,
+            start_ts=datetime.now(),
+            testcase_summaries=summaries,
+            domain_config=domain_config,
+        )
+
+        assert testrun.results == []
+        assert testrun.summary.completed_testcases == 3
+        assert testrun.summary.ok_testcases == 1
+        assert testrun.summary.nok_testcases == 2
+
     def test_id_is_a_field_not_property(self, domain_config):
         testrun_id = uuid4()
         testrun = TestRunDTO(
@@ -1,10 +1,15 @@
-from typing import List
+import pickle
+import threading
+from typing import List, Tuple
+
+import duckdb
 
 import polars as pl
 import pytest
 from src.dtos import (
     DBInstanceDTO,
     LocationDTO,
+    SampleStrategy,
     SchemaSpecDTO,
     SpecType,
     TestObjectDTO,
@@ -13,6 +18,8 @@ from src.infrastructure.backend.demo import (
     DemoBackendError,
     DemoBackendFactory,
 )
+from src.infrastructure.backend.demo.demo_rowcount_cache import RowcountCache
+from src.infrastructure_ports import TransientBackendError
 from tests.conftest import DemoData
 
 
@@ -35,6 +42,43 @@ class TestDemoBackendFactory:
         with backend_factory.create(domain_config=domain_config) as backend:
             assert backend.config == domain_config
 
+    def test_shared_database_backends_are_isolated(self, domain_config, demo_data):
+        factory = DemoBackendFactory(
+            files_path=demo_data.raw_path,
+            db_path=demo_data.db_path,
+            shared_database=True,
+        )
+        first = factory.create(domain_config=domain_config)
+        second = factory.create(domain_config=domain_config)
+        try:
+            first.con.execute("CREATE TEMP TABLE __query__ AS SELECT 1 AS a")
+            second.con.execute("CREATE TEMP TABLE __query__ AS SELECT 2 AS a")
+
+            assert first.con.execute("SELECT a FROM __query__").fetchall() == [(1,)]
+            assert second.con.execute("SELECT a FROM __query__").fetchall() == [(2,)]
+            count = "SELECT COUNT(*) FROM payments_test.alpha.stage_accounts"
+            assert second.con.execute(count).fetchall() == [(410,)]
+
+            first.close()
+            assert second.is_healthy()
+        finally:
+            first.close()
+            second.close()
+
+    def test_factory_with_shared_database_is_picklable(self, domain_config, demo_data):
+        factory = DemoBackendFactory(
+            files_path=demo_data.raw_path,
+            db_path=demo_data.db_path,
+            shared_database=True,
+        )
+        factory.create(domain_config=domain_config).close()
+
+        copy = pickle.loads(pickle.dumps(factory))
+
+        assert copy.shared_database
+        with copy.create(domain_config=domain_config) as backend:
+            assert backend.is_healthy()
+
 
 class TestDemoBackend:
     db = DBInstanceDTO(domain="payments", stage="test", instance="alpha")
@@ -189,8 +233,84 @@ class TestDemoBackend:
             db=self.db,
         )
         assert len(key_sample) == 2
-        for concat_key in key_sample:
-            assert len(concat_key.split("|")) == 2
+        for key in key_sample:
+            assert isinstance(key, tuple)
+            assert len(key) == 2
+
+    @pytest.mark.parametrize("strategy", list(SampleStrategy))
+    def test_key_sampling_strategies_are_reproducible(
+        self, backend, test_query, strategy
+    ):
+        def sample(seed: int) -> List[Tuple]:
+            return backend.get_sample_keys(
+                query=test_query,
+                primary_keys=["id"],
+                sample_size=6,
+                db=self.db,
+                strategy=strategy,
+                seed=seed,
+                stratify_by="account_id",
+            )
+
+        key_sample = sample(seed=1)
+
+        assert 0 < len(key_sample) <= 6
+        assert len(set(key_sample)) == len(key_sample)
+        assert sample(seed=1) == key_sample
+        assert sample(seed=2) != key_sample
+
+    @pytest.mark.parametrize("strategy", list(SampleStrategy))
+    def test_key_sampling_repeats_with_parallel_scans(self, backend, strategy):
+        backend.con.execute("SET threads = 8")
+        backend.con.execute(
+            "CREATE TEMP TABLE many_keys AS "
+            "SELECT range AS id, range % 7 AS stratum FROM range(500000)"
+        )
+
+        def sample() -> List[Tuple]:
+            return backend.get_sample_keys(
+                query="WITH __expected__ AS (SELECT * FROM many_keys)",
+                primary_keys=["id"],
+                sample_size=100,
+                db=self.db,
+                strategy=strategy,
+                seed=42,
+                stratify_by="stratum",
+            )
+
+        key_sample = sample()
+
+        assert len(key_sample) > 0
+        assert sample() == key_sample
+
+    def test_stratified_key_sampling_covers_all_strata(self, backend, test_query):
+        strata = backend.run_query(
+            query=f"{test_query} SELECT DISTINCT account_id FROM __expected__",
+            db=self.db,
+        )
+        key_sample = backend.get_sample_keys(
+            query=test_query,
+            primary_keys=["account_id", "id"],
+            sample_size=2 * len(strata),
+            db=self.db,
+            strategy=SampleStrategy.STRATIFIED,
+            stratify_by="account_id",
+        )
+
+        sampled_strata = [account_id for account_id, _ in key_sample]
+        assert set(sampled_strata) == set(strata["account_id"])
+        assert all(sampled_strata.count(stratum) <= 2 for stratum in sampled_strata)
+
+    def test_stratified_key_sampling_fails_without_column(self, backend, test_query):
+        with pytest.raises(DemoBackendError) as err:
+            backend.get_sample_keys(
+                query=test_query,
+                primary_keys=["id"],
+                sample_size=5,
+                db=self.db,
+                strategy=SampleStrategy.STRATIFIED,
+            )
+        assert "stratify" in str(err)
 
     def test_sampling_from_query(self, backend, test_query):
         primary_keys = ["id", "account_id"]
@@ -234,6 +354,78 @@ class TestDemoBackend:
         )
         assert len(sample) == 3
 
+    def test_sampling_keys_with_quotes(self, backend):
+        query = """
+            WITH __expected__ AS (
+            SELECT * FROM (VALUES ('O''Brien', 1), ('plain', 2)) AS t(name, value)
+            )
+        """
+        sample = backend.get_sample_from_query(
+            query=query,
+            primary_keys=["name"],
+            key_sample=[("O'Brien",)],
+            db=self.db,
+        )
+        assert sample["name"].to_list() == ["O'Brien"]
+
+    def test_composite_keys_with_separators_dont_collide(self, backend):
+        query = """
+            WITH __expected__ AS (
+            SELECT * FROM (VALUES ('a|b', 'c', 1), ('a', 'b|c', 2)) AS t(k1, k2, value)
+            )
+        """
+        sample = backend.get_sample_from_query(
+            query=query,
+            primary_keys=["k1", "k2"],
+            key_sample=[("a|b", "c")],
+            db=self.db,
+        )
+        assert sample["value"].to_list() == [1]
+
+    def test_key_sample_is_registered_once_per_compare(self, backend, test_query):
+        testobject = TestObjectDTO(
+            name="core_account_payments",
+            domain="payments",
+            stage="test",
+            instance="alpha",
+        )
+        primary_keys = ["id", "account_id"]
+        key_sample = backend.get_sample_keys(
+            query=test_query,
+            primary_keys=primary_keys,
+            sample_size=3,
+            db=self.db,
+        )
+        registered = []
+        register = backend.con.register
+
+        class CountingConnection:
+            def __init__(self, con):
+                self.con = con
+
+            def register(self, name, relation):
+                registered.append(name)
+                return register(name, relation)
+
+            def __getattr__(self, name):
+                return getattr(self.con, name)
+
+        backend.con = CountingConnection(backend.con)
+
+        backend.get_sample_from_query(
+            query=test_query,
+            primary_keys=primary_keys,
+            key_sample=key_sample,
+            db=self.db,
+        )
+        backend.get_sample_from_testobject(
+            testobject=testobject,
+            primary_keys=primary_keys,
+            key_sample=key_sample,
+        )
+
+        assert registered == ["__sample_keys__"]
+
     def test_sampling_from_testobject_with_columns(
         self,
         backend,
@@ -263,14 +455,14 @@ class TestDemoBackend:
             key_sample=key_sample,
             columns=columns,
         )
-        assert list(sample.columns) == (columns + ["__concat_key__"])
+        assert list(sample.columns) == columns
 
     def test_sampling_from_query_fails_with_empty_keys(self, backend, test_query):
         with pytest.raises(DemoBackendError) as err:
             backend.get_sample_from_query(
                 query=test_query,
                 primary_keys=[],
-                key_sample=["some_key"],
+                key_sample=[("some_key",)],
                 db=self.db,
             )
         assert "non-empty" in str(err)
@@ -286,10 +478,143 @@ class TestDemoBackend:
             backend.get_sample_from_testobject(
                 testobject=testobject,
                 primary_keys=["id"],
-                key_sample=["1"],
+                key_sample=[(1,)],
             )
         assert "Sampling files not yet supported" in str(err)
 
+    def test_diff_from_query_returns_only_differing_rows(self, backend):
+        testobject = TestObjectDTO(
+            name="stage_accounts", domain="payments", stage="test", instance="alpha"
+        )
+        query = """
+            WITH __expected__ AS (
+                SELECT id, date, CASE WHEN id = 1 THEN 'changed' ELSE name END AS name
+                FROM payments_test.alpha.stage_accounts
+            )
+        """
+        schema = backend.get_schema_from_query(query=query, db=self.db)
+
+        diff, diff_count = backend.get_diff_from_query(
+            query=query,
+            testobject=testobject,
+            primary_keys=["id", "date"],
+            db=self.db,
+            cast_to=schema,
+            max_rows=1,
+        )
+
+        expected_diff_count = (
+            2
+            * backend.con.execute(
+                "SELECT COUNT(*) FROM payments_test.alpha.stage_accounts WHERE id = 1"
+            ).fetchone()[0]
+        )
+        assert diff_count == expected_diff_count
+        assert len(diff) == 1
+        assert set(diff["__source__"]) <= {"testobject", "testquery"}
+        assert "__rowhash__" not in diff.columns
+
+    @pytest.mark.parametrize(
+        "condition, source",
+        [
+            # query misses rows, i.e. testobject has extra rows
+            ("WHERE id > 1", "testquery"),
+            # query has extra rows, i.e. testobject misses rows
+            ("UNION ALL SELECT -1, DATE '2024-01-01', 'missing'", "testobject"),
+        ],
+    )
+    def test_diff_from_query_reports_rows_missing_on_either_side(
+        self, backend, condition, source
+    ):
+        testobject = TestObjectDTO(
+            name="stage_accounts", domain="payments", stage="test", instance="alpha"
+        )
+        query = f"""
+            WITH __expected__ AS (
+                SELECT id, date, name FROM payments_test.alpha.stage_accounts
+                {condition}
+            )
+        """
+        schema = backend.get_schema_from_query(query=query, db=self.db)
+        rows_of_id = backend.con.execute(
+            "SELECT COUNT(*) FROM payments_test.alpha.stage_accounts WHERE id = 1"
+        ).fetchone()[0]
+
+        diff, diff_count = backend.get_diff_from_query(
+            query=query,
+            testobject=testobject,
+            primary_keys=["id", "date"],
+            db=self.db,
+            cast_to=schema,
+            max_rows=500,
+        )
+
+        assert diff_count == (rows_of_id if source == "testquery" else 1)
+        assert set(diff["__source__"]) == {source}
+
+    def test_diff_from_identical_query_is_empty(self, backend):
+        testobject = TestObjectDTO(
+            name="stage_accounts", domain="payments", stage="test", instance="alpha"
+        )
+        query = """
+            WITH __expected__ AS (
+                SELECT id, date, name FROM payments_test.alpha.stage_accounts
+            )
+        """
+        schema = backend.get_schema_from_query(query=query, db=self.db)
+
+        diff, diff_count = backend.get_diff_from_query(
+            query=query,
+            testobject=testobject,
+            primary_keys=["id", "date"],
+            db=self.db,
+            cast_to=schema,
+            max_rows=500,
+        )
+
+        assert diff_count == 0
+        assert diff.is_empty()
+
+    def test_bucket_digests_locate_differing_rows(self, backend):
+        testobject = TestObjectDTO(
+            name="stage_accounts", domain="payments", stage="test", instance="alpha"
+        )
+        query = """
+            WITH __expected__ AS (
+                SELECT id, date, CASE WHEN id = 1 THEN 'changed' ELSE name END AS name
+                FROM payments_test.alpha.stage_accounts
+            )
+        """
+        schema = backend.get_schema_from_query(query=query, db=self.db)
+        args = dict(
+            query=query,
+            testobject=testobject,
+            primary_keys=["id", "date"],
+            db=self.db,
+            cast_to=schema,
+            bucket_count=16,
+        )
+
+        expected, actual = backend.get_bucket_digests(level=0, **args)
+        joined = expected.join(actual, on="__bucket__", suffix="_actual")
+        differing = joined.filter(pl.col("__digest__") != pl.col("__digest___actual"))
+        assert len(joined) == len(expected) == len(actual)
+        assert 0 < len(differing) < len(joined)
+
+        parents = differing["__bucket__"].to_list()
+        expected, actual = backend.get_bucket_digests(
+            level=1, parent_buckets=parents, **args
+        )
+        assert set(expected["__bucket__"].to_list()) == set(actual["__bucket__"])
+        assert all(bucket % 16 in parents for bucket in expected["__bucket__"])
+
+        expected_rows, actual_rows = backend.get_rows_from_buckets(
+            level=0, buckets=parents, **args
+        )
+        assert "changed" in expected_rows["name"].to_list()
+        assert set(actual_rows["id"].to_list()) == set(expected_rows["id"].to_list())
+        assert expected_rows.columns == list(schema.columns)
+
     def test_translate_query_resolves_table_names(self, backend):
         query = "SELECT * FROM stage_accounts"
         result = backend.translate_query(query=query, db=self.db)
@@ -318,6 +643,55 @@ class TestDemoBackend:
         assert raw.name == "raw_accounts"
         assert raw.domain == testobject.domain
 
+    def test_reset_drops_temp_tables(self, backend, test_query):
+        backend.get_schema_from_query(query=test_query, db=self.db)
+        temp_tables = "SELECT COUNT(*) FROM duckdb_tables() WHERE temporary"
+        assert backend.con.execute(temp_tables).fetchone()[0] > 0
+
+        backend.reset()
+
+        assert backend.con.execute(temp_tables).fetchone()[0] == 0
+        assert backend.is_healthy()
+
+    def test_reset_unregisters_key_sample(self, backend, test_query):
+        backend.get_sample_from_query(
+            query=test_query,
+            primary_keys=["id", "account_id"],
+            key_sample=[(1, 1)],
+            db=self.db,
+        )
+        views = "SELECT COUNT(*) FROM duckdb_views() WHERE view_name = '__sample_keys__'"
+        assert backend.con.execute(views).fetchone()[0] == 1
+
+        backend.reset()
+
+        assert backend.con.execute(views).fetchone()[0] == 0
+
+    def test_closed_backend_is_unhealthy(self, backend):
+        backend.close()
+        assert not backend.is_healthy()
+
+    def test_interrupt_aborts_running_query(self, backend):
+        slow_query = "SELECT COUNT(*) FROM range(1000000000) a, range(1000) b"
+        threading.Timer(0.2, backend.interrupt).start()
+
+        with pytest.raises(duckdb.InterruptException):
+            backend.run_query(query=slow_query, db=self.db)
+
+        assert backend.is_healthy()
+
+    def test_io_errors_are_transient(self, backend):
+        query = "SELECT * FROM read_csv('/nonexistent/accounts.csv')"
+
+        with pytest.raises(TransientBackendError):
+            backend.run_query(query=query, db=self.db)
+
+    def test_sql_errors_are_not_transient(self, backend):
+        with pytest.raises(duckdb.Error) as err:
+            backend.run_query(query="SELECT * FROM missing_table", db=self.db)
+
+        assert not isinstance(err.value, TransientBackendError)
+
 
 class TestGetTestobjectRowcount:
     db = DBInstanceDTO(domain="payments", stage="test", instance="alpha")
@@ -359,6 +733,60 @@ class TestGetTestobjectRowcount:
         )
         assert count == 200
 
+    def test_utf16_file_rowcount(self, backend, tmp_path):
+        filepath = tmp_path / "accounts_2024-01-01.csv"
+        filepath.write_text("id,name\n1,Ċ\n2,b\n", encoding="utf-16")
+        testobject = TestObjectDTO(
+            name="raw_accounts", domain="payments", stage="test", instance="alpha"
+        )
+
+        count = backend.get_testobject_rowcount(
+            testobject=testobject,
+            filters=[("filepath", f"={filepath}")],
+        )
+
+        assert count == 2
+
+    def test_file_rowcount_is_cached_until_file_changes(
+        self, backend, tmp_path, monkeypatch
+    ):
+        backend.rowcount_cache = RowcountCache(str(tmp_path / "rowcounts.sqlite"))
+        filepath = tmp_path / "accounts_2024-01-01.csv"
+        filepath.write_text("id,name\n1,a\n2,b\n")
+        testobject = TestObjectDTO(
+            name="raw_accounts", domain="payments", stage="test", instance="alpha"
+        )
+        filters = [("filepath", f"={filepath}")]
+        assert backend.get_testobject_rowcount(testobject, filters=filters) == 2
+
+        # cached rowcount is returned without reading the file
+        with monkeypatch.context() as patch:
+            patch.setattr(backend.line_counter, "read_head", None)
+            assert backend.get_testobject_rowcount(testobject, filters=filters) == 2
+
+        # changed file (size and mtime) is counted again
+        filepath.write_text("id,name\n1,a\n2,b\n3,c\n")
+        assert backend.get_testobject_rowcount(testobject, filters=filters) == 3
+
+    def test_testobjects_have_rows(self, backend):
+        testobjects = [
+            TestObjectDTO(name=name, domain="payments", stage="test", instance="alpha")
+            for name in ["stage_accounts", "raw_accounts", "stage_transactions"]
+        ]
+
+        assert backend.testobjects_have_rows(testobjects) == [True, True, True]
+        assert backend.testobject_has_rows(testobjects[1]) is True
+
+    def test_empty_files_have_no_rows(self, backend, tmp_path):
+        backend.files_path = str(tmp_path)
+        raw_dir = tmp_path / "payments" / "test" / "alpha" / "empty"
+        raw_dir.mkdir(parents=True)
+        (raw_dir / "empty_2024-01-01.csv").write_text("")
+        raw_empty = TestObjectDTO(
+            name="raw_empty", domain="payments", stage="test", instance="alpha"
+        )
+        assert backend.testobject_has_rows(raw_empty) is False
+
     def test_file_rowcount_raises_without_filepath(self, backend):
         testobject = TestObjectDTO(
             name="raw_accounts", domain="payments", stage="test", instance="alpha"
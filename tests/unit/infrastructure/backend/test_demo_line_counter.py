@@ -0,0 +1,51 @@
+import pytest
+from fsspec.implementations.local import LocalFileSystem
+from src.infrastructure.backend.demo.demo_line_counter import LineCounter
+
+TEXT = "id,name\r\n1,Ċ\n2,਍\r3,x\r\n\r\n4,last"
+
+
+@pytest.fixture
+def counter() -> LineCounter:
+    return LineCounter(LocalFileSystem())
+
+
+@pytest.fixture
+def small_chunks(counter: LineCounter) -> LineCounter:
+    # tiny chunks and ranges split line breaks and force parallel counting
+    counter.head_size = 8
+    counter.chunk_size = 8
+    counter.parallel_min_size = 0
+    return counter
+
+
+def expected_lines(filepath: str, encoding: str) -> int:
+    with open(filepath, encoding=encoding) as fh:
+        return len(fh.readlines())
+
+
+@pytest.mark.parametrize("encoding", ["utf-8", "cp1252", "utf-16", "utf-16-be", "utf-32"])
+@pytest.mark.parametrize("text", [TEXT, TEXT + "\n", TEXT + "\r", "", "single"])
+def test_lines_are_counted_as_in_text_mode(
+    counter, small_chunks, tmp_path, encoding, text
+):
+    if encoding == "cp1252":
+        text = text.replace("Ċ", "ä").replace("਍", "ö")
+    filepath = str(tmp_path / "file.csv")
+    with open(filepath, "w", encoding=encoding, newline="") as fh:
+        fh.write(text)
+    head = counter.read_head(filepath)
+
+    count = counter.count_lines(filepath, encoding, head)
+
+    assert count == expected_lines(filepath, encoding)
+
+
+def test_first_chunk_is_counted_without_reading_file(counter, tmp_path):
+    filepath = tmp_path / "file.csv"
+    filepath.write_text("a\nb\nc")
+
+    head = counter.read_head(str(filepath))
+    filepath.unlink()
+
+    assert counter.count_lines_in(head, "utf-8", head) == 3
@@ -0,0 +1,60 @@
+import sqlite3
+
+import pytest
+from src.infrastructure.backend.demo.demo_rowcount_cache import RowcountCache
+
+
+@pytest.fixture
+def cache(tmp_path) -> RowcountCache:
+    return RowcountCache(str(tmp_path / "cache" / "rowcounts.sqlite"), max_entries=2)
+
+
+def key(filepath: str, size: int = 10, version: str = "1.0"):
+    return (filepath, size, version, "", -1)
+
+
+def test_cached_rowcount_is_returned(cache):
+    cache.put(key("a.csv"), 42)
+
+    assert cache.get(key("a.csv")) == 42
+    assert cache.get(key("b.csv")) is None
+
+
+def test_cache_is_shared_by_instances_with_same_path(cache):
+    cache.put(key("a.csv"), 42)
+
+    assert RowcountCache(cache.path).get(key("a.csv")) == 42
+
+
+def test_changed_file_is_not_served_and_replaced(cache):
+    cache.put(key("a.csv"), 42)
+
+    assert cache.get(key("a.csv", size=11)) is None
+    assert cache.get(key("a.csv", version="2.0")) is None
+
+    cache.put(key("a.csv", version="2.0"), 43)
+    with sqlite3.connect(cache.path) as con:
+        rows = con.execute("SELECT rowcount FROM rowcounts").fetchall()
+    assert rows == [(43,)]
+
+
+def test_least_recently_used_rowcount_is_evicted(cache):
+    cache.put(key("a.csv"), 1)
+    cache.put(key("b.csv"), 2)
+    cache.get(key("a.csv"))
+
+    cache.put(key("c.csv"), 3)
+
+    assert cache.get(key("a.csv")) == 1
+    assert cache.get(key("b.csv")) is None
+    assert cache.get(key("c.csv")) == 3
+
+
+def test_unreadable_cache_misses(tmp_path):
+    path = tmp_path / "rowcounts.sqlite"
+    path.write_text("not a database")
+    cache = RowcountCache(str(path))
+
+    cache.put(key("a.csv"), 42)
+
+    assert cache.get(key("a.csv")) is None
@@ -0,0 +1,113 @@
+import time
+from uuid import uuid4
+
+from src.dtos import ShardResultDTO, TestRunShardDTO
+from src.infrastructure.shard_queue import FileShardQueue
+
+
+def make_shard(testrun_id, index: int) -> TestRunShardDTO:
+    return TestRunShardDTO(
+        testrun_id=testrun_id, index=index, shard_count=2, testcase_defs=[]
+    )
+
+
+class TestFileShardQueue:
+    def test_claim_returns_none_if_queue_is_empty(self, tmp_path):
+        queue = FileShardQueue(path=str(tmp_path))
+
+        assert queue.claim() is None
+
+    def test_shards_are_claimed_once_in_fifo_order(self, tmp_path):
+        queue = FileShardQueue(path=str(tmp_path))
+        testrun_id = uuid4()
+        first, second = make_shard(testrun_id, 1), make_shard(testrun_id, 0)
+        queue.put(first)
+        queue.put(second)
+
+        # a second queue instance on the same path sees the same shards
+        other = FileShardQueue(path=str(tmp_path))
+        claimed = [queue.claim(), other.claim(), queue.claim()]
+
+        assert [shard.id if shard else None for shard in claimed] == [
+            first.id,
+            second.id,
+            None,
+        ]
+
+    def test_complete_records_results_per_testrun(self, tmp_path):
+        queue = FileShardQueue(path=str(tmp_path))
+        shard = make_shard(uuid4(), 0)
+        queue.put(shard)
+        claimed = queue.claim()
+        assert claimed is not None
+
+        result = ShardResultDTO(
+            shard_id=claimed.id,
+            testrun_id=claimed.testrun_id,
+            index=claimed.index,
+            worker="worker-1",
+            testcase_ids=[uuid4()],
+        )
+        queue.complete(result)
+
+        assert queue.list_results(str(shard.testrun_id)) == [result]
+        assert queue.list_results(str(uuid4())) == []
+        assert list((tmp_path / "claimed").iterdir()) == []
+
+    def test_expired_claims_are_handed_out_again(self, tmp_path):
+        queue = FileShardQueue(path=str(tmp_path), lease_s=0.05)
+        shard = make_shard(uuid4(), 0)
+        queue.put(shard)
+        assert queue.claim() is not None
+        assert queue.claim() is None
+
+        time.sleep(0.1)  # worker died without renewing its lease
+
+        claimed = queue.claim()
+        assert claimed is not None and claimed.id == shard.id
+
+    def test_renewed_claims_are_kept(self, tmp_path):
+        queue = FileShardQueue(path=str(tmp_path), lease_s=0.1)
+        queue.put(make_shard(uuid4(), 0))
+        claimed = queue.claim()
+        assert claimed is not None
+
+        for _ in range(3):
+            time.sleep(0.05)
+            assert queue.renew(claimed)
+            assert queue.claim() is None
+
+    def test_completed_shards_are_not_handed_out_again(self, tmp_path):
+        queue = FileShardQueue(path=str(tmp_path), lease_s=0.05)
+        queue.put(make_shard(uuid4(), 0))
+        claimed = queue.claim()
+        assert claimed is not None
+        time.sleep(0.1)
+        queue._requeue_expired()  # lease expired just before completion
+
+        queue.complete(
+            ShardResultDTO(
+                shard_id=claimed.id,
+                testrun_id=claimed.testrun_id,
+                index=claimed.index,
+                worker="worker-1",
+            )
+        )
+
+        assert queue.claim() is None
+
+    def test_withdraw_removes_pending_and_claimed_shards_of_testrun(self, tmp_path):
+        queue = FileShardQueue(path=str(tmp_path))
+        testrun_id, other_id = uuid4(), uuid4()
+        for index in range(2):
+            queue.put(make_shard(testrun_id, index))
+        queue.put(make_shard(other_id, 0))
+        claimed = queue.claim()
+        assert claimed is not None and claimed.testrun_id == testrun_id
+
+        assert queue.withdraw(str(testrun_id)) == 2
+
+        assert not queue.renew(claimed)
+        remaining = queue.claim()
+        assert remaining is not None and remaining.testrun_id == other_id
+        assert queue.claim() is None
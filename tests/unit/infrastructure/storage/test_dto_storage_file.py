@@ -1,4 +1,5 @@
-from typing import cast
+from datetime import timedelta
+from typing import List, cast
 from uuid import uuid4
 
 import pytest
@@ -10,6 +11,7 @@ from src.dtos import (
     ObjectType,
     TestCaseDTO,
     TestCaseEntryDTO,
+    TestRunDTO,
     TestSetDTO,
     TestType,
 )
@@ -160,6 +162,41 @@ class TestMemoryDtoStorage:
         with pytest.raises(ValueError, match="Unsupported order_by"):
             storage.list_dtos(ObjectType.TESTSET, order_by="name")
 
+    def test_list_dtos_limit_requires_order_by(self, storage: MemoryDtoStorage):
+        with pytest.raises(ValueError, match="requires order_by"):
+            storage.list_dtos(ObjectType.TESTRUN, limit=1)
+
+    def test_list_dtos_limit_reads_only_recent_date_folders(
+        self, storage: MemoryDtoStorage, testrun: TestRunDTO, monkeypatch
+    ):
+        for days_ago in (0, 0, 1, 2, 3):
+            start_ts = testrun.start_ts - timedelta(days=days_ago)
+            storage.write_dto(
+                testrun.model_copy(update={"id": uuid4(), "start_ts": start_ts})
+            )
+        deserialize = storage.serializer.deserialize
+        read: List[DTO] = []
+
+        def spy(content: bytes, object_type: ObjectType) -> DTO:
+            read.append(deserialize(content, object_type))
+            return read[-1]
+
+        monkeypatch.setattr(storage.serializer, "deserialize", spy)
+
+        result = storage.list_dtos(
+            ObjectType.TESTRUN,
+            filters={"domain": testrun.domain},
+            order_by="date",
+            limit=3,
+        )
+
+        assert [cast(TestRunDTO, dto).start_ts for dto in result] == [
+            testrun.start_ts - timedelta(days=1),
+            testrun.start_ts,
+            testrun.start_ts,
+        ]
+        assert len(read) == 3  # older date folders were not read
+
     # --- write_dto infers object_type ---
 
     def test_write_dto_unknown_type_raises(self, storage: MemoryDtoStorage):
@@ -20,7 +20,7 @@ from src.dtos import (
 )
 from src.dtos import Status as RunStatus
 from src.dtos.storage_dtos import LocationDTO
-from src.ui.client import DataTesterClient
+from src.ui.client import BackendError, DataTesterClient
 from src.ui.config import UIConfig
 from src.ui.controller import Controller
 
@@ -260,3 +260,34 @@ async def test_load_testsets_reloads_when_stale() -> None:
     await controller.load_testsets("sales")
 
     client.get_testsets.assert_called_once_with("sales")
+
+
+# ---------------------------------------------------------------------------
+# load_testrun — only opened testruns are hydrated
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_load_testrun_returns_hydrated_testrun() -> None:
+    run = _make_testrun()
+    client = AsyncMock(spec=DataTesterClient)
+    client.get_testrun = AsyncMock(return_value=run)
+
+    controller = _make_controller(client=client)
+    testrun, err = await controller.load_testrun("sales", str(run.id))
+
+    assert err is None
+    assert testrun == run
+    client.get_testrun.assert_called_once_with("sales", str(run.id))
+
+
+@pytest.mark.asyncio
+async def test_load_testrun_reports_backend_error() -> None:
+    client = AsyncMock(spec=DataTesterClient)
+    client.get_testrun = AsyncMock(side_effect=BackendError(404, "not found"))
+
+    controller = _make_controller(client=client)
+    testrun, err = await controller.load_testrun("sales", str(uuid4()))
+
+    assert testrun is None
+    assert err == "Backend error 404: not found"